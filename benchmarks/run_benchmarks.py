@@ -0,0 +1,176 @@
+"""
+benchmarks/run_benchmarks.py
+Time every PagingSimulation algorithm and the single-pass engines over the
+synthetic traces, and write machine-readable JSON so runs can be compared.
+
+Usage:
+    python -m benchmarks.run_benchmarks --out bench.json
+    python -m benchmarks.run_benchmarks --quick --out new.json --compare bench.json
+    python -m benchmarks.run_benchmarks --sampling-rates 0.1 0.01 --sample-pages 256
+        (adds a "sampling" section: SHARDS error vs exact LRU)
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.traces import TRACES, make_trace
+from core.paging_core import PagingSimulation
+from core.policies import available_policies
+from core.shards import ShardsMRC, mrc_error
+from core.stack_distance import lru_fault_curve, opt_fault_curve
+
+ALGORITHMS = [spec.name for spec in available_policies()]
+
+# single-pass engines: fault count for every frame size up to `frames`
+ENGINES: Dict[str, Callable] = {
+    "lru_curve": lru_fault_curve,
+    "opt_curve": opt_fault_curve,
+}
+
+
+def _best_of(repeat: int, fn: Callable):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def _simulate(refs, frames: int, algorithm: str, history: str) -> int:
+    sim = PagingSimulation(reference_string=refs, n_frames=frames, algorithm=algorithm, history=history)
+    return sim.run_all()[0]
+
+
+def run_suite(traces: List[str], lengths: List[int], frames_list: List[int], algorithms: List[str],
+              history: str = "none", repeat: int = 3, seed: int = 0, engines: bool = True) -> List[Dict]:
+    results = []
+    for kind in traces:
+        for n in lengths:
+            refs = make_trace(kind, n, seed=seed)
+            for frames in frames_list:
+                for alg in algorithms:
+                    secs, faults = _best_of(repeat, lambda: _simulate(refs, frames, alg, history))
+                    results.append({"trace": kind, "length": n, "frames": frames, "engine": "simulate",
+                                    "algorithm": alg, "history": history, "seconds": secs,
+                                    "refs_per_sec": n / secs if secs else 0.0, "faults": faults})
+            if engines:
+                top = max(frames_list)
+                for name, engine in ENGINES.items():
+                    secs, curve = _best_of(repeat, lambda: engine(refs, top))
+                    results.append({"trace": kind, "length": n, "frames": top, "engine": name,
+                                    "algorithm": name, "history": None, "seconds": secs,
+                                    "refs_per_sec": n / secs if secs else 0.0, "faults": curve[top]})
+    return results
+
+
+def sampling_error(traces: List[str], lengths: List[int], frames_list: List[int], rates: List[float],
+                   max_pages: List[int] = (), seed: int = 0) -> List[Dict]:
+    """
+    Approximate SHARDS curves against exact LRU: simulate_LRU at each size in
+    frames_list, plus the miss-ratio error over the whole curve (from
+    lru_fault_curve, which matches simulate_LRU exactly).
+    """
+    results = []
+    top = max(frames_list)
+    settings = [(rate, None) for rate in rates] + [(None, pages) for pages in max_pages]
+    for kind in traces:
+        for n in lengths:
+            refs = make_trace(kind, n, seed=seed)
+            exact = {k: _simulate(refs, k, "LRU", "none") for k in frames_list}
+            exact_secs, exact_curve = _best_of(1, lambda: lru_fault_curve(refs, top))
+            for rate, pages in settings:
+                secs, mrc = _best_of(1, lambda: ShardsMRC(top, rate, pages).feed(refs))
+                curve = mrc.curve()
+                results.append(dict(mrc_error(exact_curve, curve), trace=kind, length=n, rate=mrc.rate,
+                                    max_pages=pages, sampled_pages=mrc.stats()["sampled_pages"],
+                                    seconds=secs, exact_seconds=exact_secs,
+                                    faults={k: [exact[k], curve[k]] for k in frames_list}))
+    return results
+
+
+def _metadata() -> Dict:
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        rev = None
+    return {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0],
+            "platform": platform.platform(), "git_rev": rev}
+
+
+def _key(r: Dict):
+    return (r["trace"], r["length"], r["frames"], r["engine"], r["algorithm"], r["history"])
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.10) -> List[Dict]:
+    """Cells that got slower than baseline by more than threshold (fractional), or changed faults."""
+    base = {_key(r): r for r in baseline["results"]}
+    flagged = []
+    for r in current["results"]:
+        old = base.get(_key(r))
+        if old is None:
+            continue
+        ratio = r["seconds"] / old["seconds"] if old["seconds"] else float("inf")
+        if ratio > 1 + threshold or r["faults"] != old["faults"]:
+            flagged.append({"cell": _key(r), "old_seconds": old["seconds"], "new_seconds": r["seconds"],
+                            "ratio": ratio, "faults_changed": r["faults"] != old["faults"]})
+    return flagged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Paging algorithm benchmark suite")
+    parser.add_argument("--traces", nargs="+", default=sorted(TRACES), choices=sorted(TRACES))
+    parser.add_argument("--lengths", nargs="+", type=int, default=[10000, 100000])
+    parser.add_argument("--frames", nargs="+", type=int, default=[4, 64, 1024])
+    parser.add_argument("--algorithms", nargs="+", default=ALGORITHMS)
+    parser.add_argument("--history", default="none", choices=["full", "events", "none"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-engines", action="store_true", help="skip the single-pass engines")
+    parser.add_argument("--sampling-rates", nargs="*", type=float, default=[],
+                        help="also report SHARDS miss-ratio error vs exact LRU at these rates")
+    parser.add_argument("--sample-pages", nargs="*", type=int, default=[],
+                        help="same, for fixed-size SHARDS with these sampled-page budgets")
+    parser.add_argument("--quick", action="store_true", help="small sizes for a smoke run")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.lengths, args.frames, args.repeat = [5000], [4, 64], 1
+    report = {"meta": _metadata(),
+              "results": run_suite(args.traces, args.lengths, args.frames, args.algorithms,
+                                   args.history, args.repeat, args.seed, not args.no_engines)}
+    if args.sampling_rates or args.sample_pages:
+        report["sampling"] = sampling_error(args.traces, args.lengths, args.frames, args.sampling_rates,
+                                            args.sample_pages, args.seed)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    for r in report["results"]:
+        print(f"{r['trace']:>8} n={r['length']:<8} k={r['frames']:<6} {r['algorithm']:<14} "
+              f"{r['seconds'] * 1e3:10.2f} ms  {r['refs_per_sec']:>12,.0f} refs/s")
+    for r in report.get("sampling", []):
+        print(f"{r['trace']:>8} n={r['length']:<8} SHARDS R={r['rate']:<8.4f} mean err {r['mean_abs_error']:.4f}"
+              f"  max err {r['max_abs_error']:.4f}  {r['seconds'] * 1e3:10.2f} ms"
+              f" (exact {r['exact_seconds'] * 1e3:.2f} ms)")
+    print("Saved benchmark results to:", args.out)
+
+    if args.compare:
+        with open(args.compare) as f:
+            flagged = compare(json.load(f), report, args.threshold)
+        for c in flagged:
+            print("REGRESSION" if not c["faults_changed"] else "FAULTS CHANGED", c["cell"],
+                  f"{c['old_seconds'] * 1e3:.2f} ms -> {c['new_seconds'] * 1e3:.2f} ms")
+        if flagged:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+benchmarks/traces.py
+Seeded synthetic page-reference generators.  Each returns an int64 array of
+length n, identical for the same arguments and seed.
+"""
+
+import random
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+
+
+def uniform(n: int, n_pages: int = 1024, seed: int = 0) -> array:
+    rng = random.Random(seed)
+    return array('q', (rng.randrange(n_pages) for _ in range(n)))
+
+
+def zipf(n: int, n_pages: int = 1024, alpha: float = 1.0, seed: int = 0) -> array:
+    """Page i is referenced with probability proportional to 1 / (i + 1) ** alpha."""
+    rng = random.Random(seed)
+    cdf = list(accumulate(1.0 / (i + 1) ** alpha for i in range(n_pages)))
+    total = cdf[-1]
+    top = n_pages - 1
+    return array('q', (min(top, bisect_left(cdf, rng.random() * total)) for _ in range(n)))
+
+
+def looping_scan(n: int, loop_len: int = 1024, seed: int = 0) -> array:
+    """0, 1, ..., loop_len-1 repeated: the classic LRU-hostile pattern."""
+    return array('q', (i % loop_len for i in range(n)))
+
+
+def phased_working_set(n: int, n_pages: int = 16384, ws_size: int = 256, phase_len: int = 10000,
+                       seed: int = 0) -> array:
+    """Uniform references inside a working set that jumps to new pages every phase_len refs."""
+    rng = random.Random(seed)
+    refs = array('q')
+    while len(refs) < n:
+        base = rng.randrange(max(1, n_pages - ws_size))
+        for _ in range(min(phase_len, n - len(refs))):
+            refs.append(base + rng.randrange(ws_size))
+    return refs
+
+
+def sequential_random_mix(n: int, n_pages: int = 65536, seq_fraction: float = 0.5, hot_pages: int = 512,
+                          seed: int = 0) -> array:
+    """A sequential scan over n_pages interleaved with random references to a hot set."""
+    rng = random.Random(seed)
+    refs = array('q')
+    cursor = 0
+    for _ in range(n):
+        if rng.random() < seq_fraction:
+            refs.append(hot_pages + cursor)
+            cursor = (cursor + 1) % (n_pages - hot_pages)
+        else:
+            refs.append(rng.randrange(hot_pages))
+    return refs
+
+
+TRACES = {
+    "uniform": uniform,
+    "zipf": zipf,
+    "loop": looping_scan,
+    "phased": phased_working_set,
+    "seqmix": sequential_random_mix,
+}
+
+
+def make_trace(kind: str, n: int, seed: int = 0, **kwargs) -> array:
+    if kind not in TRACES:
+        raise ValueError(f"Unknown trace kind: {kind} (expected one of {sorted(TRACES)})")
+    return TRACES[kind](n, seed=seed, **kwargs)
@@ -0,0 +1,206 @@
+"""
+core/address_translation.py
+Virtual-address front end: raw addresses -> page numbers -> TLB -> page
+table walk -> PagingSimulation.
+
+  - AddressSpace: page size and multi-level page table geometry.  The
+    address -> VPN step and the per-level table indices are NumPy
+    vectorized (one shift / mask over the whole array).
+  - TLB: set-associative, LRU within each set.
+  - translate(): runs the paging policy over the VPN stream and the TLB
+    over the same stream.  When the policy evicts a page, its TLB entry is
+    invalidated (shootdown), so a TLB hit always means a resident page.
+    Consecutive references to the same page always hit both, so only the
+    first reference of each run goes through the Python TLB loop.
+  - The report has TLB hit rate, page walks, walk memory accesses, page
+    table pages touched, page faults and the effective access time (EAT).
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from core.paging_core import PagingSimulation
+
+# x86-64 style: 4 KiB pages, four 9-bit levels (PML4, PDPT, PD, PT)
+DEFAULT_LEVELS = (9, 9, 9, 9)
+
+# EAT model defaults, in nanoseconds
+DEFAULT_TIMINGS = {"tlb_ns": 1.0, "memory_ns": 100.0, "fault_ns": 8_000_000.0}
+
+
+class AddressSpace:
+    """Page size (a power of two) and page-table index bits per level, root first."""
+
+    def __init__(self, page_size: int = 4096, levels: Sequence[int] = DEFAULT_LEVELS):
+        page_size = int(page_size)
+        if page_size <= 0 or page_size & (page_size - 1):
+            raise ValueError(f"Page size must be a power of two, got {page_size}")
+        if not levels or any(int(b) <= 0 for b in levels):
+            raise ValueError("Every page-table level needs at least one index bit")
+        self.page_size = page_size
+        self.offset_bits = page_size.bit_length() - 1
+        self.levels = tuple(int(b) for b in levels)
+
+    @property
+    def n_levels(self) -> int:
+        return len(self.levels)
+
+    def page_numbers(self, addresses: Any) -> np.ndarray:
+        """Virtual addresses -> virtual page numbers (int64), vectorized."""
+        addresses = np.asarray(addresses)
+        if addresses.dtype.kind not in "iu":
+            raise TypeError(f"Addresses must be integers, got dtype {addresses.dtype}")
+        return (addresses >> self.offset_bits).astype(np.int64, copy=False)
+
+    def level_indices(self, vpns: Any) -> np.ndarray:
+        """(n_levels, n) table indices of each VPN; the root level takes any excess high bits."""
+        vpns = np.asarray(vpns, dtype=np.int64)
+        out = np.empty((self.n_levels, len(vpns)), dtype=np.int64)
+        shift = 0
+        for level in range(self.n_levels - 1, -1, -1):
+            bits = self.levels[level]
+            part = vpns >> shift
+            out[level] = part if level == 0 else part & ((1 << bits) - 1)
+            shift += bits
+        return out
+
+    def table_counts(self, vpns: Any) -> List[int]:
+        """Page-table pages needed per level (root first) to map every VPN in vpns."""
+        vpns = np.unique(np.asarray(vpns, dtype=np.int64))
+        counts = []
+        shift = sum(self.levels)
+        for bits in self.levels:
+            shift -= bits
+            # a table at this level is identified by the VPN bits above its index
+            counts.append(int(len(np.unique(vpns >> (shift + bits)))))
+        return counts
+
+
+class TLB:
+    """Set-associative TLB: VPN -> set (vpn % n_sets), LRU replacement within a set."""
+
+    def __init__(self, entries: int = 64, ways: int = 4):
+        entries, ways = int(entries), int(ways)
+        if entries <= 0 or ways <= 0 or entries % ways:
+            raise ValueError(f"TLB entries ({entries}) must be a positive multiple of ways ({ways})")
+        self.entries = entries
+        self.ways = ways
+        self.n_sets = entries // ways
+        self.sets: List[OrderedDict] = [OrderedDict() for _ in range(self.n_sets)]
+        self.hits = self.misses = self.invalidations = 0
+
+    def access(self, vpn: int) -> bool:
+        """Look vpn up, filling it on a miss; True on a hit."""
+        s = self.sets[vpn % self.n_sets]
+        if vpn in s:
+            s.move_to_end(vpn)
+            self.hits += 1
+            return True
+        self.misses += 1
+        if len(s) >= self.ways:
+            s.popitem(last=False)
+        s[vpn] = None
+        return False
+
+    def invalidate(self, vpn: int):
+        s = self.sets[vpn % self.n_sets]
+        if vpn in s:
+            del s[vpn]
+            self.invalidations += 1
+
+
+def effective_access_time(tlb_hit_rate: float, walk_levels: int, fault_rate: float = 0.0,
+                          tlb_ns: float = DEFAULT_TIMINGS["tlb_ns"], memory_ns: float = DEFAULT_TIMINGS["memory_ns"],
+                          fault_ns: float = DEFAULT_TIMINGS["fault_ns"]) -> float:
+    """
+    EAT = TLB lookup + the memory access itself + a walk (one memory access
+    per level) on every TLB miss + fault service time on every page fault.
+    """
+    return tlb_ns + memory_ns + (1.0 - tlb_hit_rate) * walk_levels * memory_ns + fault_rate * fault_ns
+
+
+def translate(addresses: Any, n_frames: Optional[int] = None, algorithm: str = "LRU",
+              space: Optional[AddressSpace] = None, tlb: Optional[TLB] = None,
+              timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Push a virtual-address trace through TLB, page table and (when n_frames
+    is given) a PagingSimulation of `algorithm`.  Returns a report dict.
+    """
+    space = space or AddressSpace()
+    tlb = tlb or TLB()
+    timings = dict(DEFAULT_TIMINGS, **(timings or {}))
+    vpns = space.page_numbers(addresses)
+    n = len(vpns)
+
+    evict_steps: Sequence[int] = ()
+    evicted: Any = ()
+    faults = None
+    if n_frames is not None:
+        sim = PagingSimulation(reference_string=vpns, n_frames=n_frames, algorithm=algorithm, history="events")
+        faults, history = sim.run_all()
+        evict_steps, evicted = history.steps, history.evicted
+
+    # only the first reference of each run of equal VPNs can miss
+    heads = np.flatnonzero(np.concatenate(([True], vpns[1:] != vpns[:-1]))) if n else np.empty(0, np.int64)
+    access, invalidate = tlb.access, tlb.invalidate
+    hits_before = tlb.hits
+    e, n_ev = 0, len(evict_steps)
+    for step, vpn in zip(heads.tolist(), vpns[heads].tolist()):
+        while e < n_ev and evict_steps[e] <= step:
+            victim = evicted[e]
+            if victim is not None:
+                invalidate(victim)
+            e += 1
+        access(vpn)
+    tlb.hits += n - len(heads)
+
+    hits = tlb.hits - hits_before
+    hit_rate = hits / n if n else 0.0
+    walks = n - hits
+    fault_rate = faults / n if faults is not None and n else 0.0
+    distinct = np.unique(vpns)
+    return {
+        "accesses": n,
+        "distinct_pages": len(distinct),
+        "page_size": space.page_size,
+        "levels": list(space.levels),
+        "tlb_entries": tlb.entries,
+        "tlb_ways": tlb.ways,
+        "tlb_hits": hits,
+        "tlb_misses": walks,
+        "tlb_hit_rate": hit_rate,
+        "tlb_shootdowns": tlb.invalidations,
+        "page_walks": walks,
+        "walk_memory_accesses": walks * space.n_levels,
+        "page_table_pages": space.table_counts(distinct) if n else [0] * space.n_levels,
+        "algorithm": algorithm if faults is not None else None,
+        "n_frames": n_frames,
+        "page_faults": faults,
+        "fault_rate": fault_rate,
+        "eat_ns": effective_access_time(hit_rate, space.n_levels, fault_rate, **timings),
+    }
+
+
+def load_addresses(path: str) -> np.ndarray:
+    """
+    Address trace as an int64 array: a binary trace (see core/trace_io.py,
+    written with itemsize=8) or text with one decimal or 0x-hex address per
+    line ('#' comments allowed).
+    """
+    from core.trace_io import BinaryTrace, MAGIC
+
+    with open(path, "rb") as f:
+        magic = f.read(len(MAGIC))
+    if magic == MAGIC:
+        with BinaryTrace.open(path) as trace:
+            return np.array(trace.refs, dtype=np.int64)
+    with open(path) as f:
+        return np.fromiter(_parse_addresses(f), dtype=np.int64)
+
+
+def _parse_addresses(lines: Iterable[str]):
+    for line in lines:
+        for token in line.split("#", 1)[0].replace(",", " ").split():
+            yield int(token, 0)
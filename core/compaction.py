@@ -0,0 +1,211 @@
+"""
+core/compaction.py
+Compaction planning for SegmentationMemory: which segments to move, and
+where, to get a free hole of a given size while moving as few bytes as
+possible.
+
+Strategies (each returns a plan, or None if it cannot produce the hole):
+  - full  : merge every hole into one.  Segments left of a split point slide
+            down, the rest slide up; the split minimizing bytes moved is
+            chosen, so already packed prefixes / suffixes stay put.
+  - slide : merge only a run of neighbouring holes whose total is at least
+            `need`, sliding the segments between them together (the
+            cheapest such run is found with two pointers).
+  - fill  : clear a `need`-byte window by moving the segments overlapping
+            it into holes elsewhere (best fit, largest first); the cheapest
+            windows starting or ending at a hole are tried in order.
+  - auto  : the cheapest of the above ("full" when no size is asked for).
+
+A plan is a dict:
+    strategy, need, bytes_moved,
+    moves      : [{'name', 'size', 'from', 'to'}] in a safe copy order
+                 (segments moving down before those moving up)
+    relocation : name -> (old start, new start)
+    hole       : {'start', 'size'} of the hole the plan is meant to create
+                 (None for full compaction of memory without free space)
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Sequence
+
+STRATEGIES = ("auto", "full", "slide", "fill")
+
+# fill: how many of the cheapest candidate windows to try placing
+FILL_CANDIDATES = 32
+
+
+def _layout(segments: Sequence[Dict], total_size: int):
+    """Address-ordered segments and gaps[i] = free bytes before segment i (gaps[-1] = tail)."""
+    segs = sorted(segments, key=lambda s: s['start'])
+    gaps, cursor = [], 0
+    for s in segs:
+        gaps.append(s['start'] - cursor)
+        cursor = s['end'] + 1
+    gaps.append(total_size - cursor)
+    return segs, gaps
+
+
+def _plan(strategy: str, need: Optional[int], moves: List[Dict], hole: Optional[Dict]) -> Dict:
+    down = sorted((m for m in moves if m['to'] < m['from']), key=lambda m: m['from'])
+    up = sorted((m for m in moves if m['to'] > m['from']), key=lambda m: -m['from'])
+    moves = down + up
+    return {
+        'strategy': strategy,
+        'need': need,
+        'moves': moves,
+        'bytes_moved': sum(m['size'] for m in moves),
+        'relocation': {m['name']: (m['from'], m['to']) for m in moves},
+        'hole': hole,
+    }
+
+
+def _move(seg: Dict, to: int) -> Dict:
+    return {'name': seg['name'], 'size': seg['size'], 'from': seg['start'], 'to': to}
+
+
+def plan_full(segments: Sequence[Dict], total_size: int, need: Optional[int] = None) -> Optional[Dict]:
+    return _plan_full(*_layout(segments, total_size), total_size, need)
+
+
+def _plan_full(segs: List[Dict], gaps: List[int], total_size: int, need: Optional[int] = None) -> Optional[Dict]:
+    free = sum(gaps)
+    if need is not None and need > free:
+        return None
+    m = len(segs)
+    sizes = [s['size'] for s in segs]
+    # left[k]: bytes moved packing segments 0..k-1 at address 0
+    left, moved, packed = [0] * (m + 1), 0, True
+    for i in range(m):
+        packed = packed and gaps[i] == 0
+        moved += 0 if packed else sizes[i]
+        left[i + 1] = moved
+    # right[k]: bytes moved packing segments k..m-1 against the end
+    right, moved, packed = [0] * (m + 1), 0, True
+    for i in range(m - 1, -1, -1):
+        packed = packed and gaps[i + 1] == 0
+        moved += 0 if packed else sizes[i]
+        right[i] = moved
+    k = min(range(m + 1), key=lambda j: left[j] + right[j])
+    moves, cursor = [], 0
+    for s in segs[:k]:
+        if s['start'] != cursor:
+            moves.append(_move(s, cursor))
+        cursor += s['size']
+    hole_start = cursor
+    cursor = total_size
+    for s in reversed(segs[k:]):
+        cursor -= s['size']
+        if s['start'] != cursor:
+            moves.append(_move(s, cursor))
+    hole = {'start': hole_start, 'size': free} if free else None
+    return _plan("full", need, moves, hole)
+
+
+def plan_slide(segments: Sequence[Dict], total_size: int, need: int) -> Optional[Dict]:
+    return _plan_slide(*_layout(segments, total_size), total_size, need)
+
+
+def _plan_slide(segs: List[Dict], gaps: List[int], total_size: int, need: int) -> Optional[Dict]:
+    sizes = [s['size'] for s in segs]
+    best = None          # (cost, p, q): merge gaps p..q, moving segments p..q-1
+    p, free, cost = 0, 0, 0
+    for q in range(len(gaps)):
+        free += gaps[q]
+        if q > 0:
+            cost += sizes[q - 1]
+        # drop gaps from the left while the run still holds `need`
+        while p < q and free - gaps[p] >= need:
+            free -= gaps[p]
+            cost -= sizes[p]
+            p += 1
+        if free >= need and (best is None or cost < best[0]):
+            best = (cost, p, q)
+    if best is None:
+        return None
+    _, p, q = best
+    cursor = segs[p - 1]['end'] + 1 if p > 0 else 0
+    moves = []
+    for s in segs[p:q]:
+        moves.append(_move(s, cursor))
+        cursor += s['size']
+    return _plan("slide", need, moves, {'start': cursor, 'size': sum(gaps[p:q + 1])})
+
+
+def _place(evicted: List[Dict], pool: List[tuple]) -> Optional[List[Dict]]:
+    """Best fit, largest first, into the sorted (size, start) hole pool (consumed); moves or None."""
+    moves = []
+    for seg in sorted(evicted, key=lambda s: -s['size']):
+        i = bisect_left(pool, (seg['size'], -1))
+        if i == len(pool):
+            return None
+        size, start = pool.pop(i)
+        moves.append(_move(seg, start))
+        if size > seg['size']:
+            insort(pool, (size - seg['size'], start + seg['size']))
+    return moves
+
+
+def plan_fill(segments: Sequence[Dict], total_size: int, need: int) -> Optional[Dict]:
+    return _plan_fill(*_layout(segments, total_size), total_size, need)
+
+
+def _plan_fill(segs: List[Dict], gaps: List[int], total_size: int, need: int) -> Optional[Dict]:
+    if need > sum(gaps) or need > total_size:
+        return None
+    starts = [s['start'] for s in segs]
+    ends = [s['end'] for s in segs]
+    prefix = [0]
+    for s in segs:
+        prefix.append(prefix[-1] + s['size'])
+    holes = []                                      # (start, size), address order
+    for i, g in enumerate(gaps):
+        if g:
+            holes.append((segs[i - 1]['end'] + 1 if i > 0 else 0, g))
+    hole_starts = [h[0] for h in holes]
+    pool = sorted((g, h) for h, g in holes)
+    # windows starting at a hole's start or ending at a hole's end
+    windows = set()
+    for h, g in holes:
+        windows.add(min(h, total_size - need))
+        windows.add(max(0, h + g - need))
+    candidates = []
+    for a in windows:
+        lo = bisect_right(ends, a - 1)              # first segment ending at or after a
+        hi = bisect_left(starts, a + need)          # first segment starting past the window
+        candidates.append((prefix[hi] - prefix[lo], a, lo, hi))
+    candidates.sort()
+    for cost, a, lo, hi in candidates[:FILL_CANDIDATES]:
+        if cost == 0:
+            return _plan("fill", need, [], {'start': a, 'size': need})
+        # holes outside the window: drop the ones overlapping it, keep the parts outside
+        candidate_pool = list(pool)
+        first = max(0, bisect_right(hole_starts, a) - 1)
+        for h, g in holes[first:bisect_left(hole_starts, a + need)]:
+            if h + g <= a:
+                continue
+            candidate_pool.pop(bisect_left(candidate_pool, (g, h)))
+            if h < a:
+                insort(candidate_pool, (a - h, h))
+            if h + g > a + need:
+                insort(candidate_pool, (h + g - a - need, a + need))
+        moves = _place(segs[lo:hi], candidate_pool)
+        if moves is not None:
+            return _plan("fill", need, moves, {'start': a, 'size': need})
+    return None
+
+
+def plan_compaction(segments: Sequence[Dict], total_size: int, need: Optional[int] = None,
+                    strategy: str = "auto") -> Optional[Dict]:
+    """Plan for a hole of `need` bytes (any size: merge all holes) with the given strategy."""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown compaction strategy: {strategy} (expected one of {STRATEGIES})")
+    segs, gaps = _layout(segments, total_size)
+    if need is None or strategy == "full":
+        return _plan_full(segs, gaps, total_size, need)
+    if strategy == "slide":
+        return _plan_slide(segs, gaps, total_size, need)
+    if strategy == "fill":
+        return _plan_fill(segs, gaps, total_size, need)
+    plans = [plan(segs, gaps, total_size, need) for plan in (_plan_slide, _plan_fill, _plan_full)]
+    plans = [p for p in plans if p is not None]
+    return min(plans, key=lambda p: p['bytes_moved']) if plans else None
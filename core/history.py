@@ -0,0 +1,235 @@
+"""
+core/history.py
+Compact frame history for PagingSimulation(history="events").
+
+Instead of one padded copy of the frame list per reference, only faults are
+logged as (step, slot, evicted, loaded) in array-backed columns.  Snapshots
+are rebuilt on demand, so the log behaves like the list of snapshots that
+history="full" produces (len, indexing, slicing, iteration).
+"""
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import Any, Dict, List, Optional
+
+HISTORY_MODES = ("full", "events", "none")
+
+# stands in for None (empty slot / nothing evicted) inside integer columns
+_NONE = -(2 ** 63)
+
+# empty slot in the NumPy views (frame_matrix, page_array)
+EMPTY = -1
+
+
+def page_array(values) -> "np.ndarray":
+    """Pages -> int64 NumPy array, EMPTY for None.  Non-integer pages get dense codes."""
+    import numpy as np
+
+    if isinstance(values, array):
+        arr = np.frombuffer(values, dtype=np.int64) if len(values) else np.empty(0, np.int64)
+        return np.where(arr == _NONE, EMPTY, arr)
+    codes: Dict[Any, int] = {}
+    out = np.empty(len(values), dtype=np.int64)
+    for i, v in enumerate(values):
+        if v is None or v == _NONE:
+            out[i] = EMPTY
+        elif isinstance(v, (int, np.integer)):
+            out[i] = v
+        else:
+            out[i] = codes.setdefault(v, len(codes))
+    return out
+
+
+def frame_matrix(history: Sequence, steps, initial: Optional[Sequence] = None) -> "np.ndarray":
+    """
+    Frames after each of the given steps as an int64 matrix (n_frames x
+    len(steps), EMPTY for empty slots).  Negative steps mean "before the
+    first reference" (initial, or EventHistory.initial).  Works for
+    EventHistory and for a list of snapshots (history="full").
+    """
+    import numpy as np
+
+    steps = np.asarray(steps, dtype=np.int64)
+    if isinstance(history, EventHistory):
+        return history.frame_matrix(steps)
+    n_frames = len(history[0]) if len(history) else len(initial or ())
+    empty = list(initial) if initial else [None] * n_frames
+    rows = [history[s] if s >= 0 else empty for s in steps.tolist()]
+    matrix = page_array([v for row in rows for v in row]).reshape(len(rows), n_frames).T
+    return np.ascontiguousarray(matrix)
+
+
+class _Column:
+    """int64 array that falls back to a plain list for non-integer pages."""
+
+    def __init__(self):
+        self.data = array('q')
+
+    def append(self, value: Any):
+        if value is None:
+            value = _NONE
+        try:
+            self.data.append(value)
+        except (TypeError, OverflowError):
+            self.data = list(self.data)
+            self.data.append(value)
+
+    def __getitem__(self, i: int) -> Any:
+        value = self.data[i]
+        return None if value == _NONE else value
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+class EventHistory(Sequence):
+    """
+    Fault log of one run.  history[i] is the frame snapshot after reference i
+    (a list of length n_frames, None for empty slots), rebuilt from the
+    nearest checkpoint; checkpoints are built lazily on first random access.
+    """
+
+    def __init__(self, n_frames: int, initial: Optional[Sequence] = None):
+        self.n_frames = int(n_frames)
+        # frames before the first step (a resumed simulation starts non-empty)
+        self.initial: List[Any] = list(initial) if initial is not None else [None] * self.n_frames
+        self.n_steps = 0
+        self.steps = array('q')
+        self.slots = array('q')
+        self.evicted = _Column()
+        self.loaded = _Column()
+        self._interval = max(1024, 4 * self.n_frames)
+        self._checkpoints: Optional[List[List[Any]]] = None
+        self._slot_index = None
+
+    def record(self, step: int, slot: int, evicted: Any, loaded: Any):
+        self.steps.append(step)
+        self.slots.append(slot)
+        self.evicted.append(evicted)
+        self.loaded.append(loaded)
+        self._checkpoints = None
+        self._slot_index = None
+
+    def finish(self, n_steps: int):
+        self.n_steps = int(n_steps)
+
+    def __getstate__(self):
+        # checkpoints are rebuilt on demand; keep pickles (result cache) small
+        state = self.__dict__.copy()
+        state["_checkpoints"] = None
+        state["_slot_index"] = None
+        return state
+
+    def __setstate__(self, state):
+        state.setdefault("initial", [None] * state["n_frames"])
+        state.setdefault("_slot_index", None)
+        self.__dict__.update(state)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly columns (e.g. for service/); from_dict() rebuilds the log."""
+        return {
+            "n_frames": self.n_frames,
+            "n_steps": self.n_steps,
+            "initial": list(self.initial),
+            "steps": self.steps.tolist(),
+            "slots": self.slots.tolist(),
+            "evicted": [self.evicted[i] for i in range(len(self.evicted))],
+            "loaded": [self.loaded[i] for i in range(len(self.loaded))],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EventHistory":
+        history = cls(data["n_frames"], initial=data["initial"])
+        for event in zip(data["steps"], data["slots"], data["evicted"], data["loaded"]):
+            history.record(*event)
+        history.finish(data["n_steps"])
+        return history
+
+    def __len__(self) -> int:
+        return self.n_steps
+
+    def n_events(self) -> int:
+        return len(self.steps)
+
+    def _apply(self, frames: List[Any], start: int, stop: int):
+        slots, loaded = self.slots, self.loaded
+        for e in range(start, stop):
+            frames[slots[e]] = loaded[e]
+
+    def _build_checkpoints(self):
+        # checkpoint c = frames after the first c * interval events
+        frames: List[Any] = list(self.initial)
+        checkpoints = [list(frames)]
+        n_ev = len(self.steps)
+        for start in range(self._interval, n_ev + 1, self._interval):
+            self._apply(frames, start - self._interval, start)
+            checkpoints.append(list(frames))
+        self._checkpoints = checkpoints
+
+    def _snapshot(self, i: int) -> List[Any]:
+        n_ev = bisect_right(self.steps, i)
+        if self._checkpoints is None:
+            self._build_checkpoints()
+        c = n_ev // self._interval
+        frames = list(self._checkpoints[c])
+        self._apply(frames, c * self._interval, n_ev)
+        return frames
+
+    def frame_matrix(self, steps) -> "np.ndarray":
+        """
+        Vectorized snapshots (see frame_matrix()): for every slot, one binary
+        search over that slot's events finds the page loaded last.
+        """
+        import numpy as np
+
+        steps = np.asarray(steps, dtype=np.int64)
+        matrix = np.repeat(page_array(self.initial)[:, None], len(steps), axis=1)
+        if not self.n_events() or not len(steps):
+            return matrix
+        ev_steps = np.frombuffer(self.steps, dtype=np.int64)
+        if self._slot_index is None:
+            ev_slots = np.frombuffer(self.slots, dtype=np.int64)
+            order = np.argsort(ev_slots, kind="stable")
+            bounds = np.searchsorted(ev_slots[order], np.arange(self.n_frames + 1))
+            self._slot_index = (order, bounds, page_array(self.loaded.data))
+        order, bounds, loaded = self._slot_index
+        for slot in range(self.n_frames):
+            idx = order[bounds[slot]:bounds[slot + 1]]
+            if not len(idx):
+                continue
+            last = np.searchsorted(ev_steps[idx], steps, side="right") - 1
+            seen = last >= 0
+            matrix[slot, seen] = loaded[idx[last[seen]]]
+        return matrix
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, stride = i.indices(self.n_steps)
+            if stride != 1:
+                return [self._snapshot(j) for j in range(start, stop, stride)]
+            return list(self.iter_range(start, stop))
+        if i < 0:
+            i += self.n_steps
+        if not 0 <= i < self.n_steps:
+            raise IndexError("history index out of range")
+        return self._snapshot(i)
+
+    def iter_range(self, start: int = 0, stop: Optional[int] = None):
+        """Yield snapshots start..stop-1 by replaying events forward."""
+        stop = self.n_steps if stop is None else min(stop, self.n_steps)
+        if start >= stop:
+            return
+        frames = self._snapshot(start)
+        e = bisect_right(self.steps, start)
+        steps, slots, loaded = self.steps, self.slots, self.loaded
+        n_ev = len(steps)
+        yield list(frames)
+        for step in range(start + 1, stop):
+            while e < n_ev and steps[e] == step:
+                frames[slots[e]] = loaded[e]
+                e += 1
+            yield list(frames)
+
+    def __iter__(self):
+        return self.iter_range(0, self.n_steps)
@@ -0,0 +1,104 @@
+"""
+core/metrics.py
+Opt-in instrumentation for PagingSimulation(metrics=...).
+
+Hooks only run on faults (the hit path is untouched), and a simulation
+without metrics runs the exact same loops as before:
+  - on_fault(step, slot, evicted, loaded): fault steps, eviction victims
+    and eviction ages (steps a victim stayed resident)
+  - on_scan(length): pages the Second Chance hand skipped on this fault
+  - the simulation adds wall time per run / feed
+Fault rates per window of `window` steps are derived from the fault steps.
+"""
+
+from array import array
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+
+class PagingMetrics:
+    def __init__(self, window: int = 1000):
+        self.window = max(1, int(window))
+        self.fault_steps = array('q')
+        self.evictions = 0
+        self.eviction_ages: Counter = Counter()      # age.bit_length() (log2 bucket) -> count
+        self.scan_lengths: Counter = Counter()       # pages skipped -> count
+        self.victims: Counter = Counter()            # page -> times evicted
+        self.elapsed = 0.0
+        self.n_steps = 0
+        self._age_total = 0
+        self._loaded_at: Dict[Any, int] = {}
+
+    # ---------------- Hooks ----------------
+    def on_fault(self, step: int, slot: int, evicted: Any, loaded: Any):
+        loaded_at = self._loaded_at
+        if evicted is not None:
+            self.evictions += 1
+            since = loaded_at.pop(evicted, None)
+            if since is not None:
+                age = step - since
+                self._age_total += age
+                self.eviction_ages[age.bit_length()] += 1
+            self.victims[evicted] += 1
+        if loaded is not None:
+            self.fault_steps.append(step)
+            loaded_at[loaded] = step
+
+    def on_scan(self, length: int):
+        self.scan_lengths[length] += 1
+
+    def add_time(self, seconds: float, n_steps: int):
+        self.elapsed += seconds
+        self.n_steps += n_steps
+
+    # ---------------- Results ----------------
+    def window_fault_rates(self) -> List[float]:
+        """Fault rate of each window of `window` steps (the last may be partial)."""
+        w = self.window
+        n_windows = -(-self.n_steps // w)
+        counts = [0] * n_windows
+        for step in self.fault_steps:
+            if 0 <= step < self.n_steps:
+                counts[step // w] += 1
+        rates = [c / w for c in counts]
+        if n_windows and self.n_steps % w:
+            rates[-1] = counts[-1] / (self.n_steps % w)
+        return rates
+
+    def mean_eviction_age(self) -> Optional[float]:
+        aged = sum(self.eviction_ages.values())
+        return self._age_total / aged if aged else None
+
+    def mean_scan_length(self) -> Optional[float]:
+        scans = sum(self.scan_lengths.values())
+        return sum(k * v for k, v in self.scan_lengths.items()) / scans if scans else None
+
+    def summary(self) -> Dict[str, Any]:
+        """Scalar metrics, merged into PagingSimulation.summary()."""
+        rates = self.window_fault_rates()
+        return {
+            "evictions": self.evictions,
+            "mean_eviction_age": self.mean_eviction_age(),
+            "mean_scan_length": self.mean_scan_length(),
+            "min_window_fault_rate": min(rates) if rates else None,
+            "max_window_fault_rate": max(rates) if rates else None,
+            "seconds": self.elapsed,
+            "ns_per_access": self.elapsed * 1e9 / self.n_steps if self.n_steps else None,
+        }
+
+    def to_dict(self, top_victims: int = 10) -> Dict[str, Any]:
+        """Everything, JSON-friendly: summary plus window rates and histograms."""
+        return dict(
+            self.summary(),
+            window=self.window,
+            window_fault_rates=self.window_fault_rates(),
+            eviction_age_histogram={f"<{2 ** b}" if b else "0": n for b, n in sorted(self.eviction_ages.items())},
+            scan_length_histogram=dict(sorted(self.scan_lengths.items())),
+            top_victims=[[page, n] for page, n in self.victims.most_common(top_victims)],
+        )
+
+    def __getstate__(self):
+        # residency times only matter while the run is live
+        state = self.__dict__.copy()
+        state["_loaded_at"] = {}
+        return state
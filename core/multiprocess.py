@@ -0,0 +1,237 @@
+"""
+core/multiprocess.py
+Many processes sharing one pool of physical frames.
+
+Per-process traces are interleaved by a round-robin scheduler (a quantum
+of references per turn; optionally a fault ends the turn, as if the
+process blocked on I/O).  Replacement is Clock or FIFO, either
+  - global: one hand over all frames, any process's page can be evicted
+  - local : each process owns a fixed quota of frames (a contiguous range)
+            and its own hand, so it only ever evicts its own pages
+
+State is flat: frame tables are array('q') / bytearray indexed by frame,
+per-process counters are arrays indexed by pid, and residency is one dict
+from (pid, page) packed into an int to the frame index (plus a set of the
+packed keys ever loaded).  10k processes and 1M frames cost tens of MB
+beyond the traces themselves.
+
+Thrashing looks at re-faults (faults on pages that were resident before
+and got evicted), so compulsory first-touch misses do not count.  Windows
+close on the first turn boundary after `window` references; then the
+system re-fault rate is checked against thrash_threshold, and each process
+that made at least min_window_refs references in the window is checked
+against pff_upper (page-fault-frequency style).  Both are reported.
+"""
+
+from array import array
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+
+SCOPES = ("global", "local")
+POLICIES = ("clock", "fifo")
+
+# (pid, page) -> pid << PAGE_BITS | page; pages must lie in [0, 2**PAGE_BITS)
+PAGE_BITS = 40
+
+
+class MultiProcessSimulation:
+    def __init__(self, traces: Sequence[Sequence[int]], n_frames: int, scope: str = "global",
+                 policy: str = "clock", quotas: Optional[Sequence[int]] = None, quantum: int = 100,
+                 switch_on_fault: bool = False, window: int = 10000, thrash_threshold: float = 0.5,
+                 pff_upper: float = 0.5, min_window_refs: int = 50):
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown replacement scope: {scope} (expected one of {SCOPES})")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown multi-process policy: {policy} (expected one of {POLICIES})")
+        if len(traces) > 1 << (63 - PAGE_BITS):
+            raise ValueError(f"At most {1 << (63 - PAGE_BITS)} processes, got {len(traces)}")
+        for pid, trace in enumerate(traces):
+            # pages are packed next to the pid (and -1 marks a free frame)
+            if not len(trace):
+                continue
+            lo, hi = min(trace), max(trace)
+            if lo < 0 or hi >> PAGE_BITS:
+                raise ValueError(f"Process {pid}: page {lo if lo < 0 else hi} outside [0, 2**{PAGE_BITS})")
+        self.traces = traces
+        self.n_procs = len(traces)
+        self.n_frames = int(n_frames)
+        self.scope = scope
+        self.policy = policy
+        self.quantum = max(1, int(quantum))
+        self.switch_on_fault = switch_on_fault
+        self.window = max(1, int(window))
+        self.thrash_threshold = thrash_threshold
+        self.pff_upper = pff_upper
+        self.min_window_refs = min_window_refs
+        self.quotas = array('q', self._quotas(quotas)) if scope == "local" else None
+
+    def _quotas(self, quotas: Optional[Sequence[int]]) -> List[int]:
+        if quotas is not None:
+            quotas = [int(q) for q in quotas]
+            if len(quotas) != self.n_procs or min(quotas, default=1) < 1 or sum(quotas) > self.n_frames:
+                raise ValueError("quotas need one positive entry per process and must fit in n_frames")
+            return quotas
+        if self.n_procs > self.n_frames:
+            raise ValueError(f"local replacement needs at least one frame per process "
+                             f"({self.n_procs} processes, {self.n_frames} frames)")
+        share, extra = divmod(self.n_frames, self.n_procs)
+        return [share + (pid < extra) for pid in range(self.n_procs)]
+
+    def run(self) -> Dict[str, Any]:
+        n_procs, n_frames = self.n_procs, self.n_frames
+        use_bits = self.policy == "clock"
+        local = self.scope == "local"
+        switch_on_fault = self.switch_on_fault
+
+        frame_key = array('q', [-1]) * n_frames          # packed (pid, page) or -1
+        ref_bits = bytearray(n_frames)
+        where: Dict[int, int] = {}                        # packed (pid, page) -> frame
+        lookup = where.get
+        seen = set()                                      # packed keys ever loaded (re-fault detection)
+        # per process
+        refs = array('q', [0]) * n_procs
+        faults = array('q', [0]) * n_procs
+        refaults = array('q', [0]) * n_procs
+        pos = array('q', [0]) * n_procs
+        win_refs = array('q', [0]) * n_procs
+        win_refaults = array('q', [0]) * n_procs
+        thrash_windows = array('q', [0]) * n_procs
+        if local:
+            quotas = self.quotas
+            base = array('q', [0]) * n_procs
+            for pid in range(1, n_procs):
+                base[pid] = base[pid - 1] + quotas[pid - 1]
+            used = array('q', [0]) * n_procs              # frames of its quota filled so far
+            hands = array('q', base)
+        next_free = 0
+        hand = 0
+
+        window = self.window
+        w_count = w_faults = w_refaults = 0
+        window_rates: List[float] = []
+        window_refault_rates: List[float] = []
+        thrashing_windows: List[int] = []
+        touched: List[int] = []
+
+        ready = deque(pid for pid in range(n_procs) if len(self.traces[pid]))
+        while ready:
+            pid = ready.popleft()
+            trace = self.traces[pid]
+            start = i = pos[pid]
+            stop = min(len(trace), start + self.quantum)
+            tag = pid << PAGE_BITS
+            n_faults = n_refaults = 0
+            while i < stop:
+                key = tag | trace[i]
+                i += 1
+                f = lookup(key)
+                if f is not None:
+                    if use_bits:
+                        ref_bits[f] = 1
+                    continue
+                n_faults += 1
+                if key in seen:
+                    n_refaults += 1
+                else:
+                    seen.add(key)
+                # ---- choose a frame ----
+                if local:
+                    if used[pid] < quotas[pid]:
+                        f = base[pid] + used[pid]
+                        used[pid] += 1
+                    else:
+                        lo, hi = base[pid], base[pid] + quotas[pid]
+                        f = hands[pid]
+                        while use_bits and ref_bits[f]:
+                            ref_bits[f] = 0
+                            f = f + 1 if f + 1 < hi else lo
+                        hands[pid] = f + 1 if f + 1 < hi else lo
+                        del where[frame_key[f]]
+                elif next_free < n_frames:
+                    f = next_free
+                    next_free += 1
+                else:
+                    f = hand
+                    while use_bits and ref_bits[f]:
+                        ref_bits[f] = 0
+                        f = f + 1 if f + 1 < n_frames else 0
+                    hand = f + 1 if f + 1 < n_frames else 0
+                    del where[frame_key[f]]
+                frame_key[f] = key
+                where[key] = f
+                ref_bits[f] = use_bits
+                if switch_on_fault:
+                    break
+            # ---- accounting, once per turn ----
+            n = i - start
+            refs[pid] += n
+            faults[pid] += n_faults
+            refaults[pid] += n_refaults
+            pos[pid] = i
+            if not win_refs[pid]:
+                touched.append(pid)
+            win_refs[pid] += n
+            win_refaults[pid] += n_refaults
+            w_count += n
+            w_faults += n_faults
+            w_refaults += n_refaults
+            if w_count >= window:
+                self._close_window(w_count, w_faults, w_refaults, window_rates, window_refault_rates,
+                                   thrashing_windows, touched, win_refs, win_refaults, thrash_windows)
+                w_count = w_faults = w_refaults = 0
+            if i < len(trace):
+                ready.append(pid)
+        if w_count:
+            self._close_window(w_count, w_faults, w_refaults, window_rates, window_refault_rates,
+                               thrashing_windows, touched, win_refs, win_refaults, thrash_windows)
+
+        self.refs, self.faults, self.refaults = refs, faults, refaults
+        self.thrash_windows = thrash_windows
+        self.frame_key = frame_key
+        total_refs, total_faults = sum(refs), sum(faults)
+        return {
+            "processes": n_procs,
+            "n_frames": n_frames,
+            "scope": self.scope,
+            "policy": self.policy,
+            "total_accesses": total_refs,
+            "total_faults": total_faults,
+            "total_refaults": sum(refaults),
+            "fault_rate": total_faults / total_refs if total_refs else 0.0,
+            "window": window,
+            "window_fault_rates": window_rates,
+            "window_refault_rates": window_refault_rates,
+            "thrashing_windows": thrashing_windows,
+            "thrashing": bool(thrashing_windows),
+            "thrashing_processes": sum(1 for n in thrash_windows if n),
+        }
+
+    def _close_window(self, w_count, w_faults, w_refaults, window_rates, window_refault_rates,
+                      thrashing_windows, touched, win_refs, win_refaults, thrash_windows):
+        refault_rate = w_refaults / w_count
+        if refault_rate > self.thrash_threshold:
+            thrashing_windows.append(len(window_rates))
+        window_rates.append(w_faults / w_count)
+        window_refault_rates.append(refault_rate)
+        for pid in touched:
+            if win_refs[pid] >= self.min_window_refs and win_refaults[pid] / win_refs[pid] > self.pff_upper:
+                thrash_windows[pid] += 1
+            win_refs[pid] = win_refaults[pid] = 0
+        touched.clear()
+
+    def per_process(self) -> List[Dict[str, Any]]:
+        """One row per process after run(): references, faults, fault rate, frames, thrashing windows."""
+        resident = array('q', [0]) * self.n_procs
+        for key in self.frame_key:
+            if key >= 0:
+                resident[key >> PAGE_BITS] += 1
+        return [{
+            "pid": pid,
+            "accesses": self.refs[pid],
+            "faults": self.faults[pid],
+            "refaults": self.refaults[pid],
+            "fault_rate": self.faults[pid] / self.refs[pid] if self.refs[pid] else 0.0,
+            "quota": self.quotas[pid] if self.quotas is not None else None,
+            "resident_frames": resident[pid],
+            "thrashing_windows": self.thrash_windows[pid],
+        } for pid in range(self.n_procs)]
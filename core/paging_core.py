@@ -1,175 +1,610 @@
 # core/paging_core.py
 
-from typing import List, Tuple, Any
+import collections.abc
+import copy
+import heapq
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import List, Tuple, Any, Dict, Iterable, Iterator, Optional, Sequence
+
+from core.history import EMPTY, EventHistory, HISTORY_MODES, frame_matrix
+from core.metrics import PagingMetrics
+from core.policies import ReplacementPolicy, get_policy
+from core.stack_distance import next_use_indices
+
+
+CHECKPOINT_VERSION = 1
+
+
+def make_summary(total_accesses: int, total_faults: int) -> Dict[str, Any]:
+    """Summary row shared by PagingSimulation.summary() and the batch runner."""
+    return {
+        "total_accesses": total_accesses,
+        "total_faults": total_faults,
+        "total_hits": total_accesses - total_faults,
+        "fault_rate": total_faults / total_accesses if total_accesses else 0.0,
+    }
+
+
+def _as_references(reference_string: Any) -> Any:
+    """
+    Keep sequences and re-iterable traces as given (no copy); wrap 1-D buffers
+    such as NumPy arrays in a memoryview so iteration yields plain ints.
+    """
+    if isinstance(reference_string, collections.abc.Sequence):
+        return reference_string
+    try:
+        view = memoryview(reference_string)
+    except TypeError:
+        return reference_string
+    return view if view.ndim == 1 else reference_string
+
 
 class PagingSimulation:
     """
-    PagingSimulation supports LRU, Optimal, FIFO and Second Chance (Clock).
+    PagingSimulation supports LRU, Optimal, FIFO and Second Chance (Clock),
+    plus the pluggable policies registered in core/policies.py.
     Methods provided:
       - simulate_LRU()
       - simulate_Optimal()
       - simulate_FIFO()
       - simulate_SecondChance()    <-- matches GUI call
+      - simulate_policy(policy)    <-- any ReplacementPolicy (ARC, LFU, 2Q, CLOCK-Pro)
       - run_all()                 <-- runs based on self.algorithm
+      - feed(refs) / step(page)   <-- continue the current run with more references
+      - checkpoint() / restore()  <-- save and resume the state of a run
+      - summary() / get_log()     <-- results of the last run
+
+    history selects what is kept per reference:
+      - "full"   : padded copy of the frames after every reference (list)
+      - "events" : EventHistory, a fault log that rebuilds snapshots lazily
+      - "none"   : counters only (history stays empty)
+
+    metrics=True collects PagingMetrics (core/metrics.py) through fault-only
+    hooks: windowed fault rates, eviction ages, clock scan lengths, timing.
+    They are added to summary(); self.metrics has the full detail.
+
+    reference_string may be any sequence, buffer or re-iterable trace (see
+    core/trace_io.py); it is streamed, not copied.  A ReducedTrace (or
+    preprocess=True, which builds one) lets run-invariant policies skip
+    repeated references: they run once per run of equal pages, and counters,
+    history and metrics are expanded back to every reference (see
+    core/preprocess.py).  A one-shot iterator can only be simulated once,
+    and Optimal materializes non-sequences because it needs the whole future.
+
+    Every algorithm except Optimal keeps its state (frames, recency order,
+    clock hand, ...) between calls, so feed() costs O(new references) and
+    checkpoint() captures the state as a small picklable dict.
     """
 
-    def __init__(self, reference_string: List[int], n_frames: int = 3, algorithm: str = "LRU"):
-        self.reference_string = list(reference_string)
+    def __init__(self, reference_string: Iterable[int], n_frames: int = 3, algorithm: str = "LRU",
+                 history: str = "full", metrics: bool = False, metrics_window: int = 1000,
+                 preprocess: bool = False):
+        if history not in HISTORY_MODES:
+            raise ValueError(f"Unknown history mode: {history} (expected one of {HISTORY_MODES})")
+        if preprocess:
+            # core.preprocess (and NumPy with it) loads only for preprocessed runs
+            from core.preprocess import reduce_trace
+
+            self.reference_string = reduce_trace(reference_string)
+        else:
+            self.reference_string = _as_references(reference_string)
         self.n_frames = int(n_frames)
         self.algorithm = algorithm.upper()
+        self.history_mode = history
         self.frames: List[Any] = []
         self.page_faults: int = 0
-        self.history: List[List[Any]] = []
+        self.total_accesses: int = 0
+        self.history: Sequence = []
+        self.collect_metrics = metrics
+        self.metrics_window = int(metrics_window)
+        self.metrics: Optional[PagingMetrics] = None
+        self._started = 0.0
+        self._engine: Optional[Dict[str, Any]] = None      # algorithm state kept between feeds
+        self._history_base = 0
+        self._history_initial: List[Any] = []
+        self._runs: Optional["ReducedTrace"] = None        # set while a run works on collapsed runs
 
-    def _init_state(self):
+    def _init_state(self, engine: Optional[Dict[str, Any]] = None):
+        """Empty frames and counters; engine holds the algorithm's state between feeds."""
         self.frames = []
         self.page_faults = 0
-        self.history = []
+        self.total_accesses = 0
+        self._engine = engine
+        self._history_base = 0
+        self._history_initial = []
+        self._runs = None
+        self.history = EventHistory(self.n_frames) if self.history_mode == "events" else []
+        self.metrics = PagingMetrics(self.metrics_window) if self.collect_metrics else None
+
+    def _source(self) -> Iterable[Any]:
+        """
+        References for a run from the start: the run heads of a ReducedTrace
+        when the algorithm is run-invariant (_recorders / _finish then map
+        steps and counts back to the original references), else the trace.
+        """
+        from core.preprocess import ReducedTrace
+
+        refs = self.reference_string
+        if isinstance(refs, ReducedTrace) and get_policy(self.algorithm).run_invariant:
+            self._runs = refs
+            return refs.pages
+        return refs
+
+    def _recorders(self):
+        """
+        (snapshots, record): list to append padded snapshots to, fault-log
+        callback (events history and/or metrics; None when neither is on).
+        """
+        snapshots = self.history if self.history_mode == "full" else None
+        record = self.history.record if self.history_mode == "events" else None
+        if self.metrics is not None:
+            self._started = time.perf_counter()
+            on_fault = self.metrics.on_fault
+            if record is None:
+                record = on_fault
+            else:
+                log = record
+
+                def record(step, slot, evicted, loaded):
+                    log(step, slot, evicted, loaded)
+                    on_fault(step, slot, evicted, loaded)
+        if self._runs is not None and record is not None:
+            starts, on_run = self._runs.starts.tolist(), record
+
+            def record(step, slot, evicted, loaded):
+                on_run(starts[step], slot, evicted, loaded)
+        return snapshots, record
+
+    def _first_step(self) -> int:
+        """History index of the next reference (history restarts on restore())."""
+        return self.total_accesses - self._history_base
+
+    def _finish(self, n_refs: int) -> Tuple[int, Sequence]:
+        if self._runs is not None:
+            runs, self._runs = self._runs, None
+            n_refs = runs.n_refs
+            if self.history_mode == "full":
+                # one snapshot per run, shared by all of the run's references
+                self.history[:] = [snap for snap, w in zip(self.history, runs.weights.tolist())
+                                   for _ in range(w)]
+        if self.metrics is not None:
+            self.metrics.add_time(time.perf_counter() - self._started, n_refs)
+        self.total_accesses += n_refs
+        if self.history_mode == "events":
+            self.history.finish(self._first_step())
+        return self.page_faults, self.history
 
     # ---------------- LRU ----------------
-    def simulate_LRU(self) -> Tuple[int, List[List[Any]]]:
-        self._init_state()
-        last_used = {}
-        for idx, page in enumerate(self.reference_string):
-            if page in self.frames:
-                last_used[page] = idx
+    def simulate_LRU(self) -> Tuple[int, Sequence]:
+        """
+        LRU with an OrderedDict (hash map + doubly linked list) of
+        resident page -> frame slot, least recently used first.
+        Hits and evictions are O(1).
+        """
+        self._init_state({"feed": "_feed_LRU", "lru": OrderedDict()})
+        return self._feed_LRU(self._source())
+
+    def _feed_LRU(self, refs: Iterable[Any]) -> Tuple[int, Sequence]:
+        frames = self.frames
+        n_frames = self.n_frames
+        snapshots, record = self._recorders()
+        lru = self._engine["lru"]
+        first = self._first_step()
+        idx = first - 1
+        for idx, page in enumerate(refs, first):
+            if page in lru:
+                lru.move_to_end(page)
             else:
                 self.page_faults += 1
-                if len(self.frames) < self.n_frames:
-                    self.frames.append(page)
-                    last_used[page] = idx
+                if len(frames) < n_frames:
+                    slot, evicted = len(frames), None
+                    frames.append(page)
                 else:
                     # evict least recently used
-                    lru_page = min(self.frames, key=lambda p: last_used.get(p, -1))
-                    ev_idx = self.frames.index(lru_page)
-                    self.frames[ev_idx] = page
-                    if lru_page in last_used:
-                        del last_used[lru_page]
-                    last_used[page] = idx
-            snapshot = list(self.frames)
-            while len(snapshot) < self.n_frames:
-                snapshot.append(None)
-            self.history.append(snapshot.copy())
-        return self.page_faults, self.history
+                    evicted, slot = lru.popitem(last=False)
+                    frames[slot] = page
+                lru[page] = slot
+                if record is not None:
+                    record(idx, slot, evicted, page)
+            if snapshots is not None:
+                snapshots.append(frames + [None] * (n_frames - len(frames)))
+        return self._finish(idx + 1 - first)
 
     # ---------------- OPTIMAL ----------------
-    def simulate_Optimal(self) -> Tuple[int, List[List[Any]]]:
-        self._init_state()
-        refs = self.reference_string
+    def simulate_Optimal(self) -> Tuple[int, Sequence]:
+        """
+        Belady's optimal replacement.
+        Next uses come from a next-occurrence array built in one backward
+        pass; resident pages sit in a max-heap keyed by next use, so a fault
+        costs O(log k).  Heap entries are (-next_use, slot) and are dropped
+        lazily once the page in that slot has moved on; ties (pages never
+        used again) go to the lowest slot.
+        """
+        self._init_state({"feed": None})    # needs the whole future: cannot be fed
+        frames = self.frames
+        n_frames = self.n_frames
+        refs = self._source()
+        snapshots, record = self._recorders()
+        if not isinstance(refs, collections.abc.Sequence):
+            refs = list(refs)
+        nxt = next_use_indices(refs)
+        next_of = {}           # resident page -> index of its next reference
+        slot_of = {}           # resident page -> index into frames
+        heap = []
+        heap_limit = 2 * n_frames + 64
+        idx = -1
         for idx, page in enumerate(refs):
-            if page in self.frames:
-                pass
+            if page in slot_of:
+                next_of[page] = nxt[idx]
+                heapq.heappush(heap, (-nxt[idx], slot_of[page]))
             else:
                 self.page_faults += 1
-                if len(self.frames) < self.n_frames:
-                    self.frames.append(page)
+                if len(frames) < n_frames:
+                    slot, victim = len(frames), None
+                    frames.append(page)
                 else:
-                    next_uses = {}
-                    for p in self.frames:
-                        try:
-                            next_idx = refs.index(p, idx + 1)
-                        except ValueError:
-                            next_idx = float('inf')
-                        next_uses[p] = next_idx
-                    victim = max(self.frames, key=lambda p: next_uses[p])
-                    ev_idx = self.frames.index(victim)
-                    self.frames[ev_idx] = page
-            snapshot = list(self.frames)
-            while len(snapshot) < self.n_frames:
-                snapshot.append(None)
-            self.history.append(snapshot.copy())
-        return self.page_faults, self.history
+                    while True:
+                        neg_next, slot = heapq.heappop(heap)
+                        victim = frames[slot]
+                        if next_of[victim] == -neg_next:
+                            break
+                    del next_of[victim]
+                    del slot_of[victim]
+                    frames[slot] = page
+                next_of[page] = nxt[idx]
+                slot_of[page] = slot
+                heapq.heappush(heap, (-nxt[idx], slot))
+                if record is not None:
+                    record(idx, slot, victim, page)
+            if len(heap) > heap_limit:
+                # too many stale entries: rebuild from the resident set
+                heap = [(-next_of[p], s) for p, s in slot_of.items()]
+                heapq.heapify(heap)
+            if snapshots is not None:
+                snapshots.append(frames + [None] * (n_frames - len(frames)))
+        return self._finish(idx + 1)
 
     # ---------------- FIFO ----------------
-    def simulate_FIFO(self) -> Tuple[int, List[List[Any]]]:
-        self._init_state()
-        from collections import deque
-        queue = deque()
-        in_frames = set()
+    def simulate_FIFO(self) -> Tuple[int, Sequence]:
+        """
+        Frames fill slots 0..n-1 in order and are replaced in the same
+        order, so the oldest page always sits under a rotating pointer.
+        """
+        self._init_state({"feed": "_feed_FIFO", "oldest": 0})
+        return self._feed_FIFO(self._source())
+
+    def _feed_FIFO(self, refs: Iterable[Any]) -> Tuple[int, Sequence]:
+        frames = self.frames
+        n_frames = self.n_frames
+        in_frames = set(frames)
+        oldest = self._engine["oldest"]    # slot holding the oldest page once frames are full
+        snapshots, record = self._recorders()
 
-        for page in self.reference_string:
+        first = self._first_step()
+        idx = first - 1
+        for idx, page in enumerate(refs, first):
             if page in in_frames:
                 # hit
                 pass
             else:
                 self.page_faults += 1
-                if len(queue) < self.n_frames:
-                    queue.append(page)
-                    in_frames.add(page)
-                    self.frames.append(page)
+                if len(frames) < n_frames:
+                    slot, evicted = len(frames), None
+                    frames.append(page)
                 else:
-                    oldest = queue.popleft()
-                    in_frames.remove(oldest)
-                    queue.append(page)
-                    in_frames.add(page)
-                    # replace oldest in frames list
-                    try:
-                        idx = self.frames.index(oldest)
-                        self.frames[idx] = page
-                    except ValueError:
-                        # safety fallback
-                        self.frames[0] = page
-            snapshot = list(self.frames)
-            while len(snapshot) < self.n_frames:
-                snapshot.append(None)
-            self.history.append(snapshot.copy())
-        return self.page_faults, self.history
+                    slot, evicted = oldest, frames[oldest]
+                    in_frames.remove(evicted)
+                    frames[slot] = page
+                    oldest += 1
+                    if oldest == n_frames:
+                        oldest = 0
+                in_frames.add(page)
+                if record is not None:
+                    record(idx, slot, evicted, page)
+            if snapshots is not None:
+                snapshots.append(frames + [None] * (n_frames - len(frames)))
+        self._engine["oldest"] = oldest
+        return self._finish(idx + 1 - first)
 
     # ---------------- Second Chance (Clock) ----------------
-    def simulate_SecondChance(self) -> Tuple[int, List[List[Any]]]:
+    def simulate_SecondChance(self) -> Tuple[int, Sequence]:
         """
         Implements second-chance (clock) algorithm.
-        Uses frames[], ref_bits dict and a pointer 'hand'.
+        frames[] is the ring; slot_of maps page -> slot and ref_bits holds one
+        reference bit per slot, so hits are O(1) and the hand's sweeps are
+        amortized O(1) per fault (each sweep step clears a bit set by a hit).
         Method name intentionally 'simulate_SecondChance' to match GUI.
         """
-        self._init_state()
-        ref_bits = {}          # page -> bit (0/1)
-        clock_hand = 0         # index into frames list
+        self._init_state({"feed": "_feed_SecondChance", "slot_of": {},
+                          "ref_bits": bytearray(self.n_frames), "hand": 0})
+        return self._feed_SecondChance(self._source())
+
+    def _feed_SecondChance(self, refs: Iterable[Any]) -> Tuple[int, Sequence]:
+        frames = self.frames
+        n_frames = self.n_frames
+        engine = self._engine
+        slot_of = engine["slot_of"]      # page -> slot
+        ref_bits = engine["ref_bits"]    # slot -> bit (0/1)
+        clock_hand = engine["hand"]      # index into frames list
+        snapshots, record = self._recorders()
+        scan = self.metrics.on_scan if self.metrics is not None else None
 
-        for page in self.reference_string:
-            if page in self.frames:
-                ref_bits[page] = 1
+        first = self._first_step()
+        idx = first - 1
+        for idx, page in enumerate(refs, first):
+            slot = slot_of.get(page)
+            if slot is not None:
+                ref_bits[slot] = 1
             else:
                 self.page_faults += 1
-                if len(self.frames) < self.n_frames:
-                    self.frames.append(page)
-                    ref_bits[page] = 1
+                if len(frames) < n_frames:
+                    slot, evicted = len(frames), None
+                    frames.append(page)
                 else:
-                    # find victim
-                    while True:
-                        clock_hand %= self.n_frames
-                        current_page = self.frames[clock_hand]
-                        bit = ref_bits.get(current_page, 0)
-                        if bit == 0:
-                            # evict current_page
-                            evicted = current_page
-                            self.frames[clock_hand] = page
-                            if evicted in ref_bits:
-                                del ref_bits[evicted]
-                            ref_bits[page] = 1
-                            clock_hand = (clock_hand + 1) % self.n_frames
-                            break
-                        else:
-                            # give second chance
-                            ref_bits[current_page] = 0
-                            clock_hand = (clock_hand + 1) % self.n_frames
-            snapshot = list(self.frames)
-            while len(snapshot) < self.n_frames:
-                snapshot.append(None)
-            self.history.append(snapshot.copy())
+                    # give second chances until an unreferenced slot comes up
+                    if scan is not None:
+                        swept_from, swept_first = clock_hand, ref_bits[clock_hand]
+                    while ref_bits[clock_hand]:
+                        ref_bits[clock_hand] = 0
+                        clock_hand += 1
+                        if clock_hand == n_frames:
+                            clock_hand = 0
+                    slot, evicted = clock_hand, frames[clock_hand]
+                    if scan is not None:
+                        scan((slot - swept_from) % n_frames or (n_frames if swept_first else 0))
+                    del slot_of[evicted]
+                    frames[slot] = page
+                    clock_hand += 1
+                    if clock_hand == n_frames:
+                        clock_hand = 0
+                slot_of[page] = slot
+                ref_bits[slot] = 1
+                if record is not None:
+                    record(idx, slot, evicted, page)
+            if snapshots is not None:
+                snapshots.append(frames + [None] * (n_frames - len(frames)))
 
-        return self.page_faults, self.history
+        engine["hand"] = clock_hand
+        return self._finish(idx + 1 - first)
+
+    # ---------------- Pluggable policies ----------------
+    def simulate_policy(self, policy: ReplacementPolicy) -> Tuple[int, Sequence]:
+        """
+        Run a ReplacementPolicy (see core/policies.py).  The policy decides
+        hits and victims; here resident pages are mapped to frame slots, a
+        loaded page reusing its victim's slot.  Extra victims (CLOCK-Pro can
+        evict more than one page per fault) leave their slots empty.
+        """
+        self._init_state({"feed": "_feed_policy", "policy": policy, "slot_of": {}, "free_slots": []})
+        return self._feed_policy(self._source())
+
+    def _feed_policy(self, refs: Iterable[Any]) -> Tuple[int, Sequence]:
+        frames = self.frames
+        snapshots, record = self._recorders()
+        access = self._engine["policy"].access
+        slot_of = self._engine["slot_of"]      # resident page -> slot
+        free_slots = self._engine["free_slots"]
+        first = self._first_step()
+        idx = first - 1
+        for idx, page in enumerate(refs, first):
+            evicted = access(page)
+            if evicted is not None:
+                self.page_faults += 1
+                victim = None
+                for v in evicted:
+                    s = slot_of.pop(v)
+                    frames[s] = None
+                    if victim is not None:
+                        free_slots.append(slot)
+                        if record is not None:
+                            record(idx, slot, victim, None)
+                    victim, slot = v, s
+                if victim is None:
+                    if free_slots:
+                        slot = free_slots.pop()
+                    else:
+                        slot = len(frames)
+                        frames.append(None)
+                frames[slot] = page
+                slot_of[page] = slot
+                if record is not None:
+                    record(idx, slot, victim, page)
+            if snapshots is not None:
+                snapshots.append(frames + [None] * (self.n_frames - len(frames)))
+        return self._finish(idx + 1 - first)
 
     # ---------------- Generic runner ----------------
-    def run_all(self) -> Tuple[int, List[List[Any]]]:
-        algo = self.algorithm.upper()
-        if algo == "LRU":
-            return self.simulate_LRU()
-        elif algo in ("OPTIMAL", "OPT"):
-            return self.simulate_Optimal()
-        elif algo == "FIFO":
-            return self.simulate_FIFO()
-        elif algo in ("SECOND CHANCE", "SECOND_CHANCE", "SECOND-CHANCE", "SC", "CLOCK", "SECONDCHANCE"):
-            return self.simulate_SecondChance()
-        else:
-            raise ValueError(f"Unknown algorithm: {self.algorithm}")
+    def run_all(self) -> Tuple[int, Sequence]:
+        """Run self.algorithm through the policy registry (core/policies.py)."""
+        return get_policy(self.algorithm).run(self)
+
+    # ---------------- Incremental runs ----------------
+    def _ensure_engine(self):
+        if self._engine is not None:
+            return
+        if not self.total_accesses:
+            # nothing simulated yet: start from empty frames
+            self.reference_string = []
+        # else results came without engine state (e.g. core/result_cache.py): replay once
+        self.run_all()
+
+    def feed(self, references: Iterable[Any]) -> Tuple[int, Sequence]:
+        """
+        Simulate more references, continuing from the current state; the
+        cost is proportional to the new references only.  A simulation that
+        has not run yet starts from empty frames.  Unless history is "none",
+        the references are appended to reference_string (then a list) so
+        get_log() stays aligned with the history.
+        Optimal cannot be fed: it needs the whole future.
+        """
+        self._ensure_engine()
+        feeder = self._engine["feed"]
+        if feeder is None:
+            raise ValueError(f"{self.algorithm} needs the whole reference string and cannot be fed incrementally")
+        refs = _as_references(references)
+        if self.history_mode != "none":
+            refs = list(refs)
+            if not isinstance(self.reference_string, list):
+                self.reference_string = list(self.reference_string)
+            self.reference_string.extend(refs)
+        return getattr(self, feeder)(refs)
+
+    def step(self, page: Any) -> bool:
+        """Feed one reference; True if it faulted."""
+        faults = self.page_faults
+        self.feed((page,))
+        return self.page_faults > faults
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """
+        Picklable snapshot of the run: frames, counters and the algorithm's
+        own state (recency order, clock hand and reference bits, policy
+        object).  The history is not included; see restore().
+        """
+        self._ensure_engine()
+        engine = self._engine
+        if engine["feed"] is None:
+            raise ValueError(f"{self.algorithm} cannot be checkpointed: it needs the whole reference string")
+        state: Dict[str, Any] = {"feed": engine["feed"]}
+        if "lru" in engine:
+            state["lru"] = list(engine["lru"])           # resident pages, least recent first
+        if "oldest" in engine:
+            state["oldest"] = engine["oldest"]
+        if "ref_bits" in engine:
+            state["ref_bits"] = bytes(engine["ref_bits"])
+            state["hand"] = engine["hand"]
+        if "policy" in engine:
+            state["policy"] = copy.deepcopy(engine["policy"])
+            state["free_slots"] = list(engine["free_slots"])
+        return {
+            "version": CHECKPOINT_VERSION,
+            "algorithm": self.algorithm,
+            "n_frames": self.n_frames,
+            "page_faults": self.page_faults,
+            "total_accesses": self.total_accesses,
+            "frames": list(self.frames),
+            "engine": state,
+        }
+
+    def restore(self, checkpoint: Dict[str, Any]):
+        """
+        Resume from checkpoint().  Counters continue from the checkpoint; the
+        history (in this simulation's own history mode) and reference_string
+        restart empty and cover only references fed afterwards.
+        """
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {checkpoint.get('version')}")
+        self.algorithm = checkpoint["algorithm"]
+        self.n_frames = int(checkpoint["n_frames"])
+        state = checkpoint["engine"]
+        frames = list(checkpoint["frames"])
+        slots = {p: s for s, p in enumerate(frames) if p is not None}
+        engine: Dict[str, Any] = {"feed": state["feed"]}
+        if "lru" in state:
+            engine["lru"] = OrderedDict((p, slots[p]) for p in state["lru"])
+        if "oldest" in state:
+            engine["oldest"] = state["oldest"]
+        if "ref_bits" in state:
+            engine.update(slot_of=slots, ref_bits=bytearray(state["ref_bits"]), hand=state["hand"])
+        if "policy" in state:
+            engine.update(policy=copy.deepcopy(state["policy"]), slot_of=slots,
+                          free_slots=list(state["free_slots"]))
+        self._init_state(engine)
+        self.frames = frames
+        self.page_faults = int(checkpoint["page_faults"])
+        self.total_accesses = self._history_base = int(checkpoint["total_accesses"])
+        self._history_initial = frames + [None] * (self.n_frames - len(frames))
+        if self.history_mode == "events":
+            self.history = EventHistory(self.n_frames, initial=self._history_initial)
+        self.reference_string = []
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: Dict[str, Any], history: str = "full") -> "PagingSimulation":
+        sim = cls([], n_frames=checkpoint["n_frames"], algorithm=checkpoint["algorithm"], history=history)
+        sim.restore(checkpoint)
+        return sim
+
+    # ---------------- Results ----------------
+    @property
+    def total_faults(self) -> int:
+        return self.page_faults
+
+    def summary(self) -> Dict[str, Any]:
+        summary = make_summary(self.total_accesses, self.page_faults)
+        if self.metrics is not None:
+            summary.update(self.metrics.summary())
+        return summary
+
+    def iter_log_columns(self, batch_rows: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+        """
+        Per-step log of the last run as typed NumPy columns, batch_rows steps
+        at a time: step, page (int64), fault (bool) and F0..Fn (int64, -1 for
+        an empty frame).  Pages must be integers.  EventHistory batches are
+        rebuilt straight from the fault log, without per-step snapshots.
+        """
+        import numpy as np
+
+        if self.history_mode == "none":
+            raise ValueError("the per-step log needs a history; this simulation used history='none'")
+        n_steps = len(self.history)
+        pages = iter(self.reference_string)
+        for start in range(0, n_steps, batch_rows):
+            stop = min(n_steps, start + batch_rows)
+            page = np.fromiter(islice(pages, stop - start), dtype=np.int64, count=stop - start)
+            # one extra column: the frames before this batch's first step
+            matrix = frame_matrix(self.history, np.arange(start - 1, stop), self._history_initial)
+            columns: Dict[str, Any] = {
+                "step": np.arange(self._history_base + start, self._history_base + stop, dtype=np.int64),
+                "page": page,
+                "fault": ~(matrix[:, :-1] == page).any(axis=0),
+            }
+            for i in range(self.n_frames):
+                columns[f"F{i}"] = matrix[i, 1:]
+            yield columns
+
+    def log_columns(self) -> Dict[str, Any]:
+        """iter_log_columns() concatenated into one dict of arrays."""
+        import numpy as np
+
+        batches = list(self.iter_log_columns())
+        names = ["step", "page", "fault"] + [f"F{i}" for i in range(self.n_frames)]
+        if not batches:
+            return {name: np.empty(0, dtype=bool if name == "fault" else np.int64) for name in names}
+        return {name: np.concatenate([b[name] for b in batches]) for name in names}
+
+    def get_log(self):
+        """
+        Per-step log of the last run as a pandas DataFrame with columns
+        step, page, fault and one column per frame (F0..Fn).  Built from
+        log_columns() (frame columns are nullable Int64, <NA> when empty);
+        non-integer pages fall back to plain object columns.
+        """
+        import pandas as pd
+
+        if self.history_mode == "none":
+            raise ValueError("get_log() needs a history; this simulation used history='none'")
+
+        try:
+            columns = self.log_columns()
+        except (TypeError, ValueError, OverflowError):
+            return self._get_log_rows()
+        df = pd.DataFrame(columns)
+        for i in range(self.n_frames):
+            name = f"F{i}"
+            df[name] = df[name].astype("Int64").mask(df[name] == EMPTY)
+        return df
+
+    def _get_log_rows(self):
+        import pandas as pd
+
+        rows = []
+        prev: List[Any] = self._history_initial
+        for step, (page, snapshot) in enumerate(zip(self.reference_string, self.history), self._history_base):
+            row = {"step": step, "page": page, "fault": page not in prev}
+            for i, v in enumerate(snapshot):
+                row[f"F{i}"] = v
+            rows.append(row)
+            prev = snapshot
+        return pd.DataFrame(rows)
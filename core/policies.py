@@ -0,0 +1,456 @@
+"""
+core/policies.py
+Replacement-policy registry shared by PagingSimulation.run_all() and the GUI.
+
+The four textbook policies are methods on PagingSimulation and are
+registered by method name.  The others are ReplacementPolicy classes run
+through PagingSimulation.simulate_policy():
+  - ARC       : adaptive replacement cache (recency/frequency lists + ghosts)
+  - LFU       : least frequently used, O(1) frequency buckets, LRU on ties
+  - 2Q        : FIFO probation queue, ghost queue and LRU main queue
+  - CLOCK-Pro : hot/cold/test pages on one clock with three hands
+All of them cost O(1) (amortized for CLOCK-Pro) per access.
+
+run_invariant marks policies whose state does not change when the page just
+referenced is referenced again; they can run on run-collapsed traces (see
+core/preprocess.py).
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+def _normalize(name: str) -> str:
+    return "".join(ch for ch in name.upper() if ch not in " _-")
+
+
+class ReplacementPolicy:
+    """
+    Interface for pluggable policies.  access(page) returns None on a hit,
+    otherwise the (possibly empty) list of resident pages evicted to make
+    room for page.  PagingSimulation maps resident pages to frame slots.
+    """
+
+    def __init__(self, n_frames: int):
+        self.n_frames = int(n_frames)
+
+    def access(self, page: Any) -> Optional[List[Any]]:
+        raise NotImplementedError
+
+
+class PolicySpec:
+    """Registry entry: display label, aliases and how to run the policy."""
+
+    def __init__(self, name: str, label: str, aliases=(), method: Optional[str] = None,
+                 factory=None, stack_property: bool = False, description: str = "",
+                 run_invariant: bool = False):
+        self.name = name
+        self.label = label
+        self.aliases = tuple(aliases)
+        self.method = method
+        self.factory = factory
+        self.stack_property = stack_property
+        self.description = description
+        self.run_invariant = run_invariant
+
+    def run(self, sim):
+        if self.method is not None:
+            return getattr(sim, self.method)()
+        return sim.simulate_policy(self.factory(sim.n_frames))
+
+    def __repr__(self) -> str:
+        return f"PolicySpec({self.name!r})"
+
+
+_REGISTRY: Dict[str, PolicySpec] = {}
+_ALIASES: Dict[str, str] = {}
+
+
+def register_policy(name: str, label: Optional[str] = None, aliases=(), method: Optional[str] = None,
+                    stack_property: bool = False, description: str = "", run_invariant: bool = False):
+    """
+    Register a policy.  With method= it registers a PagingSimulation method;
+    otherwise it returns a class decorator for a ReplacementPolicy.
+    """
+    def add(factory=None):
+        spec = PolicySpec(name, label or name, aliases, method, factory, stack_property, description,
+                          run_invariant)
+        _REGISTRY[name] = spec
+        for alias in (name, spec.label) + spec.aliases:
+            _ALIASES[_normalize(alias)] = name
+        return factory
+
+    if method is not None:
+        add()
+        return None
+    return add
+
+
+def get_policy(name: str) -> PolicySpec:
+    key = _ALIASES.get(_normalize(name))
+    if key is None:
+        raise ValueError(f"Unknown algorithm: {name}")
+    return _REGISTRY[key]
+
+
+def available_policies() -> List[PolicySpec]:
+    return list(_REGISTRY.values())
+
+
+register_policy("LRU", method="simulate_LRU", stack_property=True, run_invariant=True,
+                description="Evict the least recently used page.")
+register_policy("OPTIMAL", "Optimal", aliases=("OPT",), method="simulate_Optimal", stack_property=True,
+                run_invariant=True,
+                description="Evict the page used furthest in the future (offline lower bound).")
+register_policy("FIFO", method="simulate_FIFO", run_invariant=True,
+                description="Evict the page loaded earliest.")
+register_policy("SECOND CHANCE", "Second Chance", aliases=("SC", "CLOCK"), method="simulate_SecondChance",
+                run_invariant=True,
+                description="Clock: skip (and clear) pages whose reference bit is set.")
+
+
+# ---------------- ARC ----------------
+@register_policy("ARC", description="Adaptive Replacement Cache (Megiddo & Modha).")
+class ARCPolicy(ReplacementPolicy):
+    """
+    T1/T2 hold resident pages seen once / more than once, B1/B2 their ghost
+    (evicted) keys; p is the adaptive target size of T1.
+    """
+
+    def __init__(self, n_frames: int):
+        super().__init__(n_frames)
+        self.p = 0
+        self.t1: OrderedDict = OrderedDict()
+        self.t2: OrderedDict = OrderedDict()
+        self.b1: OrderedDict = OrderedDict()
+        self.b2: OrderedDict = OrderedDict()
+
+    def _replace(self, in_b2: bool, evicted: List[Any]):
+        t1 = self.t1
+        if t1 and (len(t1) > self.p or (in_b2 and len(t1) == self.p)):
+            victim = t1.popitem(last=False)[0]
+            self.b1[victim] = None
+        else:
+            victim = self.t2.popitem(last=False)[0]
+            self.b2[victim] = None
+        evicted.append(victim)
+
+    def access(self, page: Any) -> Optional[List[Any]]:
+        c = self.n_frames
+        t1, t2, b1, b2 = self.t1, self.t2, self.b1, self.b2
+        if page in t1:
+            del t1[page]
+            t2[page] = None
+            return None
+        if page in t2:
+            t2.move_to_end(page)
+            return None
+        evicted: List[Any] = []
+        if page in b1:
+            self.p = min(c, self.p + max(len(b2) // len(b1), 1))
+            self._replace(False, evicted)
+            del b1[page]
+            t2[page] = None
+            return evicted
+        if page in b2:
+            self.p = max(0, self.p - max(len(b1) // len(b2), 1))
+            self._replace(True, evicted)
+            del b2[page]
+            t2[page] = None
+            return evicted
+        l1 = len(t1) + len(b1)
+        if l1 == c:
+            if len(t1) < c:
+                b1.popitem(last=False)
+                self._replace(False, evicted)
+            else:
+                evicted.append(t1.popitem(last=False)[0])
+        else:
+            total = l1 + len(t2) + len(b2)
+            if total >= c:
+                if total == 2 * c:
+                    b2.popitem(last=False)
+                self._replace(False, evicted)
+        t1[page] = None
+        return evicted
+
+
+# ---------------- LFU ----------------
+@register_policy("LFU", description="Least Frequently Used with O(1) frequency buckets (LRU among ties).")
+class LFUPolicy(ReplacementPolicy):
+    def __init__(self, n_frames: int):
+        super().__init__(n_frames)
+        self.freq: Dict[Any, int] = {}
+        self.buckets: Dict[int, OrderedDict] = {}
+        self.min_freq = 0
+
+    def access(self, page: Any) -> Optional[List[Any]]:
+        freq, buckets = self.freq, self.buckets
+        f = freq.get(page)
+        if f is not None:
+            bucket = buckets[f]
+            del bucket[page]
+            if not bucket:
+                del buckets[f]
+                if self.min_freq == f:
+                    self.min_freq = f + 1
+            freq[page] = f + 1
+            buckets.setdefault(f + 1, OrderedDict())[page] = None
+            return None
+        evicted: List[Any] = []
+        if len(freq) >= self.n_frames:
+            bucket = buckets[self.min_freq]
+            victim = bucket.popitem(last=False)[0]
+            if not bucket:
+                del buckets[self.min_freq]
+            del freq[victim]
+            evicted.append(victim)
+        freq[page] = 1
+        buckets.setdefault(1, OrderedDict())[page] = None
+        self.min_freq = 1
+        return evicted
+
+
+# ---------------- 2Q ----------------
+@register_policy("2Q", aliases=("TWOQ",), run_invariant=True, description="2Q (Johnson & Shasha): probation FIFO, ghost FIFO, main LRU.")
+class TwoQPolicy(ReplacementPolicy):
+    """A1in: resident FIFO for first touches; A1out: ghosts of A1in; Am: resident LRU."""
+
+    def __init__(self, n_frames: int, kin: float = 0.25, kout: float = 0.5):
+        super().__init__(n_frames)
+        self.kin = max(1, int(n_frames * kin))
+        self.kout = max(1, int(n_frames * kout))
+        self.a1in: OrderedDict = OrderedDict()
+        self.a1out: OrderedDict = OrderedDict()
+        self.am: OrderedDict = OrderedDict()
+
+    def _reclaim(self, evicted: List[Any]):
+        if len(self.a1in) + len(self.am) < self.n_frames:
+            return
+        if len(self.a1in) > self.kin or not self.am:
+            victim = self.a1in.popitem(last=False)[0]
+            self.a1out[victim] = None
+            if len(self.a1out) > self.kout:
+                self.a1out.popitem(last=False)
+        else:
+            victim = self.am.popitem(last=False)[0]
+        evicted.append(victim)
+
+    def access(self, page: Any) -> Optional[List[Any]]:
+        if page in self.am:
+            self.am.move_to_end(page)
+            return None
+        if page in self.a1in:
+            return None
+        evicted: List[Any] = []
+        self._reclaim(evicted)
+        if page in self.a1out:
+            del self.a1out[page]
+            self.am[page] = None
+        else:
+            self.a1in[page] = None
+        return evicted
+
+
+# ---------------- CLOCK-Pro ----------------
+_HOT, _COLD, _TEST = 0, 1, 2
+
+
+class _ClockNode:
+    __slots__ = ("key", "kind", "ref", "test", "prev", "next")
+
+    def __init__(self, key: Any, kind: int):
+        self.key = key
+        self.kind = kind
+        self.ref = False
+        self.test = kind == _COLD
+        self.prev = self
+        self.next = self
+
+
+@register_policy("CLOCK-PRO", "CLOCK-Pro", aliases=("CLOCKPRO",),
+                 description="CLOCK-Pro (Jiang, Chen & Zhang): hot/cold pages plus non-resident test pages.")
+class ClockProPolicy(ReplacementPolicy):
+    """
+    Resident hot and cold pages and non-resident cold pages still in their
+    test period (_TEST) share one circular list; new pages go to the list
+    head, just behind hand_hot.
+      - hand_cold evicts an unreferenced cold page (kept as _TEST while its
+        test period lasts) or promotes a cold page re-referenced in its test
+        period to hot
+      - hand_hot demotes unreferenced hot pages and ends test periods
+      - hand_test ends test periods when there are too many _TEST pages
+    cold_target adapts: re-referencing a _TEST page grows it, a test period
+    expiring shrinks it.  Hot pages may take n_frames - cold_target frames.
+    """
+
+    def __init__(self, n_frames: int):
+        super().__init__(n_frames)
+        self.cold_target = self.n_frames
+        self.nodes: Dict[Any, _ClockNode] = {}
+        self.hand_hot: Optional[_ClockNode] = None
+        self.hand_cold: Optional[_ClockNode] = None
+        self.hand_test: Optional[_ClockNode] = None
+        self.count_hot = self.count_cold = self.count_test = 0
+
+    def access(self, page: Any) -> Optional[List[Any]]:
+        node = self.nodes.get(page)
+        if node is not None and node.kind != _TEST:
+            node.ref = True
+            return None
+        evicted: List[Any] = []
+        if node is not None:
+            # re-referenced during its test period: cold pages deserve more room
+            self.cold_target = min(self.n_frames, self.cold_target + 1)
+            self._remove(node)
+            self.count_test -= 1
+        if self.count_hot + self.count_cold >= self.n_frames:
+            self._run_hand_cold(evicted)
+        if node is not None:
+            self._insert(_ClockNode(page, _HOT))
+            self.count_hot += 1
+            self._balance_hot()
+        else:
+            self._insert(_ClockNode(page, _COLD))
+            self.count_cold += 1
+        return evicted
+
+    # ----- circular list -----
+    def _insert(self, node: _ClockNode):
+        self.nodes[node.key] = node
+        head = self.hand_hot
+        if head is None:
+            self.hand_hot = self.hand_cold = self.hand_test = node
+            return
+        node.prev, node.next = head.prev, head
+        head.prev.next = node
+        head.prev = node
+
+    def _unlink(self, node: _ClockNode):
+        nxt = None if node.next is node else node.next
+        if self.hand_hot is node:
+            self.hand_hot = nxt
+        if self.hand_cold is node:
+            self.hand_cold = nxt
+        if self.hand_test is node:
+            self.hand_test = nxt
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        node.prev = node.next = node
+
+    def _remove(self, node: _ClockNode):
+        self._unlink(node)
+        del self.nodes[node.key]
+
+    def _move_to_head(self, node: _ClockNode):
+        self._unlink(node)
+        self._insert(node)
+
+    def _expire_test(self):
+        if self.cold_target > 1:
+            self.cold_target -= 1
+
+    # ----- hands -----
+    def _balance_hot(self):
+        while self.count_hot > self.n_frames - self.cold_target:
+            self._run_hand_hot()
+
+    def _run_hand_cold(self, evicted: List[Any]):
+        """Advance until one resident cold page has been evicted."""
+        while True:
+            node = self.hand_cold
+            if node.kind != _COLD:
+                self.hand_cold = node.next
+                continue
+            if node.ref:
+                node.ref = False
+                if node.test:
+                    node.kind = _HOT
+                    node.test = False
+                    self.count_cold -= 1
+                    self.count_hot += 1
+                    self._move_to_head(node)
+                    self._balance_hot()
+                else:
+                    node.test = True
+                    self._move_to_head(node)
+                continue
+            self.hand_cold = node.next
+            self.count_cold -= 1
+            evicted.append(node.key)
+            if node.test:
+                node.kind = _TEST
+                self.count_test += 1
+                if self.count_test > self.n_frames:
+                    self._run_hand_test()
+            else:
+                self._remove(node)
+            return
+
+    def _run_hand_hot(self):
+        """Advance until one hot page has been demoted to cold."""
+        while True:
+            node = self.hand_hot
+            self.hand_hot = node.next
+            if node.kind == _HOT:
+                if node.ref:
+                    node.ref = False
+                else:
+                    node.kind = _COLD
+                    self.count_hot -= 1
+                    self.count_cold += 1
+                    return
+            elif node.kind == _COLD:
+                if node.test:
+                    node.test = False
+                    self._expire_test()
+            else:
+                self._remove(node)
+                self.count_test -= 1
+                self._expire_test()
+
+    def _run_hand_test(self):
+        """Advance until one non-resident test page has been dropped."""
+        while True:
+            node = self.hand_test
+            self.hand_test = node.next
+            if node.kind == _COLD and node.test:
+                node.test = False
+                self._expire_test()
+            elif node.kind == _TEST:
+                self._remove(node)
+                self.count_test -= 1
+                self._expire_test()
+                return
+
+    # ----- pickling (checkpoints): the ring as a flat list, not linked nodes -----
+    def __getstate__(self):
+        ring, pos = [], {}
+        node = self.hand_hot
+        for i in range(len(self.nodes)):
+            ring.append((node.key, node.kind, node.ref, node.test))
+            pos[id(node)] = i
+            node = node.next
+        state = {k: v for k, v in self.__dict__.items()
+                 if k not in ("nodes", "hand_hot", "hand_cold", "hand_test")}
+        state["ring"] = ring
+        state["hands"] = (pos.get(id(self.hand_cold)), pos.get(id(self.hand_test)))
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        ring = state.pop("ring")
+        cold, test = state.pop("hands")
+        self.__dict__.update(state)
+        self.nodes = {}
+        self.hand_hot = self.hand_cold = self.hand_test = None
+        placed = []
+        for key, kind, ref, in_test in ring:
+            node = _ClockNode(key, kind)
+            node.ref, node.test = ref, in_test
+            self._insert(node)
+            placed.append(node)
+        if placed:
+            # _insert puts each node just behind hand_hot, i.e. in ring order
+            self.hand_cold = placed[cold]
+            self.hand_test = placed[test]
@@ -0,0 +1,173 @@
+"""
+core/preprocess.py
+Trace preprocessing, done once per trace: run-length collapse, dense page
+ids, and reuse-distance / working-set statistics.
+
+A reference to the page referenced just before is a hit under every policy
+and, for the policies registered with run_invariant (LRU, Optimal, FIFO,
+Second Chance, 2Q), leaves their state unchanged.  ReducedTrace keeps one
+entry per run plus the run lengths, so PagingSimulation runs those policies
+over the runs only while counters, history and metrics stay exact per
+reference.  Everything else iterates the expanded trace.
+
+  - reduce_trace(refs)           -> ReducedTrace
+  - ReducedTrace.pages / weights / starts : run heads (original page ids),
+    run lengths, original step of each run
+  - ReducedTrace.dense / page_ids : run heads as 0..n_distinct-1 and back
+  - stack_distances(), lru_fault_curve(k) : LRU reuse (stack) distances
+  - reuse_times()                 : steps until a page is referenced again
+  - working_set_sizes(windows)    : Denning's mean working-set size s(tau)
+"""
+
+from array import array
+from itertools import chain, repeat
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from core.stack_distance import _RecencyCounter, _curve_from_depths, next_use_indices
+
+
+class ReducedTrace:
+    """
+    Run-length collapsed trace.  Iterating (or len()) gives the original
+    references, so it can stand in for the trace anywhere; simulations of
+    run-invariant policies use pages / weights directly.
+    """
+
+    def __init__(self, pages: Sequence[Any], weights, page_ids, dense):
+        self.pages = pages                      # run heads, original page ids
+        self.weights = weights                  # int64 run lengths
+        self.starts = np.concatenate(([0], np.cumsum(weights)[:-1])).astype(np.int64) \
+            if len(weights) else np.empty(0, np.int64)
+        self.page_ids = page_ids                # dense id -> original page
+        self.dense = dense                      # run heads as dense ids (int64)
+        self.n_refs = int(weights.sum())
+        self._depths = None
+        self._reuse = None
+
+    @property
+    def n_runs(self) -> int:
+        return len(self.pages)
+
+    @property
+    def n_distinct(self) -> int:
+        return len(self.page_ids)
+
+    def __len__(self) -> int:
+        return self.n_refs
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(map(repeat, self.pages, self.weights.tolist()))
+
+    def expand(self) -> List[Any]:
+        return list(self)
+
+    # ---------------- Statistics ----------------
+    def stack_distances(self):
+        """LRU stack depth of each run head (1 = most recent page, 0 = first reference), int64."""
+        if self._depths is None:
+            access = _RecencyCounter().access
+            self._depths = np.fromiter((access(p) for p in self.dense.tolist()), dtype=np.int64,
+                                       count=self.n_runs)
+        return self._depths
+
+    def reuse_distance_histogram(self):
+        """counts[d] = references at LRU stack depth d (counts[0] = first references)."""
+        counts = np.bincount(self.stack_distances(), minlength=2)
+        counts[1] += self.n_refs - self.n_runs      # run tails sit at depth 1
+        return counts
+
+    def lru_fault_curve(self, max_frames: int) -> List[int]:
+        """Same as core.stack_distance.lru_fault_curve over the original trace."""
+        max_frames = int(max_frames)
+        counts = self.reuse_distance_histogram()
+        hist = [0] * (max_frames + 2)
+        head = counts[1:max_frames + 1].tolist()
+        hist[1:1 + len(head)] = head
+        hist[max_frames + 1] = int(counts[max_frames + 1:].sum())
+        return _curve_from_depths(hist, int(counts[0]), max_frames)
+
+    def reuse_times(self):
+        """
+        For the last reference of each run: steps until its page is referenced
+        again, -1 if never.  (Every other reference is reused after 1 step.)
+        """
+        if self._reuse is None:
+            nxt = np.frombuffer(next_use_indices(self.dense.tolist()), dtype=np.int64) \
+                if self.n_runs else np.empty(0, np.int64)
+            last = self.starts + self.weights - 1
+            found = nxt < self.n_runs
+            self._reuse = np.full(self.n_runs, -1, dtype=np.int64)
+            self._reuse[found] = self.starts[nxt[found]] - last[found]
+        return self._reuse
+
+    def working_set_sizes(self, windows: Iterable[int]):
+        """
+        Mean working-set size s(tau) over all steps, for each window tau:
+        the average number of distinct pages among the last tau references.
+        A reference at step t counts at the steps t .. t+min(gap, tau)-1, with
+        gap = steps to the page's next reference (or to the end of the trace).
+        """
+        windows = np.asarray(list(windows), dtype=np.int64)
+        n = self.n_refs
+        if not n:
+            return np.zeros(len(windows))
+        reuse = self.reuse_times()
+        last = self.starts + self.weights - 1
+        gaps = np.sort(np.where(reuse >= 0, reuse, n - last))
+        prefix = np.concatenate(([0], np.cumsum(gaps)))
+        # run tails: gap 1 each; last references: sum(min(gap, tau))
+        below = np.searchsorted(gaps, windows, side="left")
+        totals = (n - self.n_runs) * (windows >= 1) + prefix[below] + windows * (len(gaps) - below)
+        return totals / n
+
+    def profile(self) -> Dict[str, Any]:
+        depths = self.stack_distances()
+        reused = depths[depths > 0]
+        return {
+            "total_refs": self.n_refs,
+            "runs": self.n_runs,
+            "distinct_pages": self.n_distinct,
+            "collapse_ratio": self.n_runs / self.n_refs if self.n_refs else 1.0,
+            "mean_reuse_distance": float(reused.mean()) if len(reused) else None,
+            "max_reuse_distance": int(reused.max()) if len(reused) else None,
+        }
+
+
+def reduce_trace(reference_string: Iterable[Any]) -> ReducedTrace:
+    """Collapse runs of equal consecutive references and number the distinct pages."""
+    if isinstance(reference_string, ReducedTrace):
+        return reference_string
+    arr: Optional[np.ndarray] = None
+    if isinstance(reference_string, (np.ndarray, memoryview, array)):
+        arr = np.asarray(reference_string)
+    else:
+        if not isinstance(reference_string, Sequence):
+            reference_string = list(reference_string)
+        if reference_string and all(type(p) is int for p in reference_string):
+            arr = np.asarray(reference_string, dtype=np.int64)
+    if arr is not None and arr.ndim == 1 and arr.dtype.kind in "iu":
+        arr = arr.astype(np.int64, copy=False)
+        heads = np.flatnonzero(np.concatenate(([True], arr[1:] != arr[:-1]))) if len(arr) \
+            else np.empty(0, np.int64)
+        weights = np.diff(np.append(heads, len(arr)))
+        run_pages = arr[heads]
+        page_ids, dense = np.unique(run_pages, return_inverse=True)
+        pages = array('q', run_pages.tobytes())
+        return ReducedTrace(pages, weights.astype(np.int64), page_ids, dense.astype(np.int64))
+
+    pages: List[Any] = []
+    weights: List[int] = []
+    prev = object()
+    for page in reference_string:
+        if page == prev and weights:
+            weights[-1] += 1
+        else:
+            pages.append(page)
+            weights.append(1)
+            prev = page
+    ids: Dict[Any, int] = {}
+    dense = [ids.setdefault(p, len(ids)) for p in pages]
+    return ReducedTrace(pages, np.array(weights, dtype=np.int64), list(ids),
+                        np.array(dense, dtype=np.int64))
@@ -0,0 +1,212 @@
+"""
+core/result_cache.py
+Content-addressed memoization of simulation results.
+
+A result is keyed by a SHA-256 of the trace contents (as int64 values, so a
+list, array, NumPy array or BinaryTrace with the same references share a
+key), the canonical policy name, the frame count and the history mode.
+
+ResultCache has two tiers:
+  - memory : OrderedDict LRU of the most recent entries (per process)
+  - disk   : one pickle per key in a directory, oldest-used files evicted
+             once the directory grows past max_disk_bytes
+
+Environment (read by default_cache()):
+  VMSIM_CACHE_DIR     disk tier directory (default: none, memory tier only)
+  VMSIM_CACHE_MAX_MB  disk tier size cap in MiB (default 512)
+
+Nothing is written to disk unless VMSIM_CACHE_DIR is set or a ResultCache
+with a disk_dir is passed in explicitly.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from array import array
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Iterable, Optional, Tuple
+
+from core.policies import get_policy
+
+CACHE_VERSION = 2
+
+_CHUNK = 1 << 16
+_MISSING = object()
+
+
+def _int64_view(refs: Any) -> Optional[memoryview]:
+    """refs (or its .refs, e.g. BinaryTrace) as a flat buffer of signed int64, if it is one."""
+    for obj in (refs, getattr(refs, "refs", None)):
+        if obj is None or isinstance(obj, (bytes, bytearray)):
+            continue
+        try:
+            view = memoryview(obj)
+        except TypeError:
+            continue
+        if view.ndim == 1 and view.itemsize == 8 and view.format in ("q", "l", "<q", "=q", "<l", "=l"):
+            return view
+        return None
+    return None
+
+
+def trace_digest(refs: Iterable[Any]) -> str:
+    """
+    SHA-256 of the references as int64 values.  int64 buffers are hashed
+    in place; anything else is converted in chunks.  Non-integer pages fall
+    back to hashing their repr.  One-shot iterators are consumed.
+    """
+    h = hashlib.sha256()
+    view = _int64_view(refs)
+    if view is not None:
+        h.update(view.cast("B"))
+        return h.hexdigest()
+    it = iter(refs)
+    while True:
+        chunk = list(islice(it, _CHUNK))
+        if not chunk:
+            break
+        try:
+            h.update(array("q", chunk))
+        except (TypeError, OverflowError):
+            h.update(b"\0" + repr(chunk).encode())
+    return h.hexdigest()
+
+
+def cache_key(digest: str, algorithm: str, n_frames: int, history: str = "none") -> str:
+    name = get_policy(algorithm).name
+    text = f"v{CACHE_VERSION}|{digest}|{name}|{int(n_frames)}|{history}"
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier key -> value store.  get() checks memory, then disk (promoting
+    disk hits into memory); put() writes both tiers.  Values must pickle.
+    """
+
+    def __init__(self, max_entries: int = 16, disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = 512 << 20):
+        self.max_entries = int(max_entries)
+        self.disk_dir = disk_dir or None
+        self.max_disk_bytes = int(max_disk_bytes)
+        self._memory: OrderedDict = OrderedDict()
+        self.hits = self.misses = 0
+        if self.disk_dir is not None:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key + ".pkl")
+
+    def _remember(self, key: str, value: Any):
+        memory = self._memory
+        memory[key] = value
+        memory.move_to_end(key)
+        while len(memory) > self.max_entries:
+            memory.popitem(last=False)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._memory.get(key, _MISSING)
+        if value is not _MISSING:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return value
+        if self.disk_dir is not None:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    value = pickle.load(f)
+                os.utime(path)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                value = _MISSING
+            if value is not _MISSING:
+                self._remember(key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return default
+
+    def put(self, key: str, value: Any):
+        self._remember(key, value)
+        if self.disk_dir is None:
+            return
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_disk_bytes:
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        self._evict_disk()
+
+    def _evict_disk(self):
+        """Drop least recently used files until the directory fits max_disk_bytes."""
+        entries, total = [], 0
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(".pkl"):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        self._memory.clear()
+        if self.disk_dir is not None:
+            for entry in os.scandir(self.disk_dir):
+                if entry.name.endswith(".pkl"):
+                    os.remove(entry.path)
+
+
+_default_cache: Optional[ResultCache] = None
+
+
+def default_cache() -> ResultCache:
+    """Process-wide cache: memory only, plus a disk tier if VMSIM_CACHE_DIR is set."""
+    global _default_cache
+    if _default_cache is None:
+        disk_dir = os.environ.get("VMSIM_CACHE_DIR", "")
+        max_mb = int(os.environ.get("VMSIM_CACHE_MAX_MB", "512"))
+        _default_cache = ResultCache(disk_dir=disk_dir or None, max_disk_bytes=max_mb << 20)
+    return _default_cache
+
+
+def cached_run(sim, cache: Optional[ResultCache] = None, digest: Optional[str] = None) -> Tuple[int, Any]:
+    """
+    sim.run_all() through the cache.  On a hit the simulation's results
+    (page_faults, total_accesses, frames, history, metrics) are restored without
+    replaying, so summary() and get_log() work as after a real run
+    (feed() replays once before continuing).  A one-shot iterator trace is
+    materialized first (hashing consumes it).
+    """
+    cache = default_cache() if cache is None else cache
+    if iter(sim.reference_string) is sim.reference_string:
+        sim.reference_string = list(sim.reference_string)
+    if digest is None:
+        digest = trace_digest(sim.reference_string)
+    mode = sim.history_mode
+    if sim.collect_metrics:
+        mode += f"+metrics/{sim.metrics_window}"
+    key = cache_key(digest, sim.algorithm, sim.n_frames, mode)
+    state = cache.get(key)
+    if state is not None:
+        sim.page_faults, sim.total_accesses, sim.frames, sim.history, sim.metrics = state
+    else:
+        sim.run_all()
+        cache.put(key, (sim.page_faults, sim.total_accesses, sim.frames, sim.history, sim.metrics))
+    # the cache now shares frames and history: a later feed() replays into fresh ones
+    sim._engine = None
+    return sim.page_faults, sim.history
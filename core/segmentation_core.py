@@ -1,44 +1,397 @@
 # core/segmentation_core.py
 
-from typing import List, Dict, Optional
+import random
+from typing import List, Dict, Optional, Iterator
+
+from core.compaction import STRATEGIES, plan_compaction
+
+# treap priorities; a private generator leaves the global random state to callers
+_rng = random.Random()
+
+
+class _Node:
+    __slots__ = ("key", "size", "prio", "left", "right", "max_size")
+
+    def __init__(self, key, size: int):
+        self.key = key
+        self.size = size
+        self.prio = _rng.random()
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+        self.max_size = size
+
+
+def _update(t: _Node):
+    m = t.size
+    if t.left is not None and t.left.max_size > m:
+        m = t.left.max_size
+    if t.right is not None and t.right.max_size > m:
+        m = t.right.max_size
+    t.max_size = m
+
+
+def _split(t: Optional[_Node], key):
+    """Split into (keys < key, keys >= key)."""
+    if t is None:
+        return None, None
+    if t.key < key:
+        t.right, right = _split(t.right, key)
+        _update(t)
+        return t, right
+    left, t.left = _split(t.left, key)
+    _update(t)
+    return left, t
+
+
+def _merge(a: Optional[_Node], b: Optional[_Node]) -> Optional[_Node]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prio > b.prio:
+        a.right = _merge(a.right, b)
+        _update(a)
+        return a
+    b.left = _merge(a, b.left)
+    _update(b)
+    return b
+
+
+def _insert(t: Optional[_Node], node: _Node) -> _Node:
+    if t is None:
+        return node
+    if node.prio > t.prio:
+        node.left, node.right = _split(t, node.key)
+        _update(node)
+        return node
+    if node.key < t.key:
+        t.left = _insert(t.left, node)
+    else:
+        t.right = _insert(t.right, node)
+    _update(t)
+    return t
+
+
+def _remove(t: Optional[_Node], key) -> Optional[_Node]:
+    if t is None:
+        raise KeyError(key)
+    if t.key == key:
+        return _merge(t.left, t.right)
+    if key < t.key:
+        t.left = _remove(t.left, key)
+    else:
+        t.right = _remove(t.right, key)
+    _update(t)
+    return t
+
+
+class _Treap:
+    """
+    Randomized balanced search tree of (key, size) entries.  Every subtree
+    tracks its largest size, so "leftmost entry with size >= n" is O(log n).
+    """
+
+    def __init__(self):
+        self.root: Optional[_Node] = None
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def insert(self, key, size: int):
+        self.root = _insert(self.root, _Node(key, size))
+        self.count += 1
+
+    def remove(self, key):
+        self.root = _remove(self.root, key)
+        self.count -= 1
+
+    def get(self, key) -> Optional[int]:
+        t = self.root
+        while t is not None:
+            if key == t.key:
+                return t.size
+            t = t.left if key < t.key else t.right
+        return None
+
+    def first_fit(self, size: int) -> Optional[_Node]:
+        """Leftmost entry whose size is at least `size`."""
+        t = self.root
+        if t is None or t.max_size < size:
+            return None
+        while True:
+            if t.left is not None and t.left.max_size >= size:
+                t = t.left
+            elif t.size >= size:
+                return t
+            else:
+                t = t.right
+
+    def ceiling(self, key) -> Optional[_Node]:
+        """Entry with the smallest key >= key."""
+        t, best = self.root, None
+        while t is not None:
+            if t.key < key:
+                t = t.right
+            else:
+                best, t = t, t.left
+        return best
+
+    def lower(self, key) -> Optional[_Node]:
+        """Entry with the largest key < key."""
+        t, best = self.root, None
+        while t is not None:
+            if t.key < key:
+                best, t = t, t.right
+            else:
+                t = t.left
+        return best
+
+    def last(self) -> Optional[_Node]:
+        t = self.root
+        while t is not None and t.right is not None:
+            t = t.right
+        return t
+
+    def __iter__(self) -> Iterator[_Node]:
+        stack, t = [], self.root
+        while stack or t is not None:
+            while t is not None:
+                stack.append(t)
+                t = t.left
+            t = stack.pop()
+            yield t
+            t = t.right
+
+
+class SegmentationMemory:
+    """
+    Variable-partition allocator with first/best/worst-fit placement.
+    - holes are indexed by address (first fit, coalescing with neighbours)
+      and by (size, address) (best/worst fit)
+    - segments: dict name -> {'name', 'size', 'start', 'end'}
+    - allocate(name, size, policy) -> segment dict, or None if it does not fit
+    - free(name) -> freed segment dict, or None if unknown
+    - compact(strategy, need) -> applied plan (see core/compaction.py)
+    allocate and free are O(log n) in the number of segments and holes.
+
+    compaction ("auto", "full", "slide" or "fill") compacts when an
+    allocation finds no hole although free_memory would hold it;
+    compact_threshold also runs a full compaction after a free leaves the
+    external fragmentation above it.  Plans applied are counted in
+    compactions / bytes_moved, and last_plan keeps the latest one.
+    """
+
+    POLICIES = ("first", "best", "worst")
+
+    def __init__(self, total_size: int, policy: str = "first", compaction: Optional[str] = None,
+                 compact_threshold: Optional[float] = None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown placement policy: {policy}")
+        if compaction is not None and compaction not in STRATEGIES:
+            raise ValueError(f"Unknown compaction strategy: {compaction}")
+        self.total_size = int(total_size)
+        self.policy = policy
+        self.compaction = compaction
+        self.compact_threshold = compact_threshold
+        self.compactions = 0
+        self.bytes_moved = 0
+        self.last_plan: Optional[Dict] = None
+        self.segments: Dict[str, Dict] = {}
+        self.free_memory = self.total_size
+        self._by_addr = _Treap()     # start -> hole size
+        self._by_size = _Treap()     # (size, start) -> hole size
+        if self.total_size > 0:
+            self._add_hole(0, self.total_size)
+
+    def _add_hole(self, start: int, size: int):
+        self._by_addr.insert(start, size)
+        self._by_size.insert((size, start), size)
+
+    def _remove_hole(self, start: int, size: int):
+        self._by_addr.remove(start)
+        self._by_size.remove((size, start))
+
+    def _find_hole(self, size: int, policy: str) -> Optional[tuple]:
+        if policy == "first":
+            node = self._by_addr.first_fit(size)
+            return None if node is None else (node.key, node.size)
+        if policy == "best":
+            node = self._by_size.ceiling((size, -1))
+        elif policy == "worst":
+            node = self._by_size.last()
+            if node is not None and node.size < size:
+                node = None
+        else:
+            raise ValueError(f"Unknown placement policy: {policy}")
+        return None if node is None else (node.key[1], node.size)
+
+    def _release(self, start: int, size: int):
+        """Turn [start, start+size) into a hole, coalescing with the holes directly before and after."""
+        end = start + size
+        prev = self._by_addr.lower(start)
+        if prev is not None and prev.key + prev.size == start:
+            prev_start, prev_size = prev.key, prev.size
+            self._remove_hole(prev_start, prev_size)
+            start, size = prev_start, size + prev_size
+        next_size = self._by_addr.get(end)
+        if next_size is not None:
+            self._remove_hole(end, next_size)
+            size += next_size
+        self._add_hole(start, size)
+
+    def _claim(self, start: int, size: int):
+        """Carve [start, start+size) out of the hole containing it."""
+        hole = self._by_addr.lower(start + 1)
+        if hole is None or hole.key + hole.size < start + size:
+            raise ValueError(f"[{start}..{start + size - 1}] is not free")
+        h_start, h_size = hole.key, hole.size
+        self._remove_hole(h_start, h_size)
+        if start > h_start:
+            self._add_hole(h_start, start - h_start)
+        if h_start + h_size > start + size:
+            self._add_hole(start + size, h_start + h_size - start - size)
+
+    def allocate(self, name: str, size: int, policy: Optional[str] = None) -> Optional[Dict]:
+        size = int(size)
+        if size <= 0 or name in self.segments:
+            return None
+        hole = self._find_hole(size, policy or self.policy)
+        if hole is None:
+            if self.compaction is None or size > self.free_memory \
+                    or self.compact(self.compaction, size) is None:
+                return None
+            hole = self._find_hole(size, policy or self.policy)
+        start, hole_size = hole
+        self._remove_hole(start, hole_size)
+        if hole_size > size:
+            self._add_hole(start + size, hole_size - size)
+        seg = {'name': name, 'size': size, 'start': start, 'end': start + size - 1}
+        self.segments[name] = seg
+        self.free_memory -= size
+        return seg
+
+    def free(self, name: str) -> Optional[Dict]:
+        seg = self.segments.pop(name, None)
+        if seg is None:
+            return None
+        self._release(seg['start'], seg['size'])
+        self.free_memory += seg['size']
+        if self.compact_threshold is not None and \
+                self.fragmentation()['external_fragmentation'] > self.compact_threshold:
+            self.compact("full")
+        return seg
+
+    # ---------------- Compaction ----------------
+    def plan_compaction(self, strategy: str = "auto", need: Optional[int] = None) -> Optional[Dict]:
+        """Plan (without applying) a compaction; None if no plan yields `need` bytes."""
+        return plan_compaction(self.segments.values(), self.total_size, need, strategy)
+
+    def compact(self, strategy: str = "auto", need: Optional[int] = None) -> Optional[Dict]:
+        """
+        Plan and apply a compaction.  Moves are applied in the plan's order,
+        each releasing the old range and claiming the new one (O(log n)), so
+        the hole indexes stay consistent throughout.
+        Returns the plan (its relocation map says who moved where), or None.
+        """
+        plan = self.plan_compaction(strategy, need)
+        if plan is None:
+            return None
+        for move in plan['moves']:
+            seg = self.segments[move['name']]
+            self._release(seg['start'], seg['size'])
+            self._claim(move['to'], seg['size'])
+            seg['start'] = move['to']
+            seg['end'] = move['to'] + seg['size'] - 1
+        self.compactions += 1
+        self.bytes_moved += plan['bytes_moved']
+        self.last_plan = plan
+        return plan
+
+    def holes(self) -> List[Dict]:
+        return [{'start': h.key, 'size': h.size, 'end': h.key + h.size - 1} for h in self._by_addr]
+
+    def largest_hole(self) -> int:
+        node = self._by_size.last()
+        return 0 if node is None else node.size
+
+    def get_segments(self) -> List[Dict]:
+        return sorted(self.segments.values(), key=lambda s: s['start'])
+
+    def dump(self) -> List[Dict]:
+        """Address-ordered memory map: segments and holes (name None)."""
+        blocks = self.get_segments()
+        blocks += [dict(h, name=None) for h in self.holes()]
+        blocks.sort(key=lambda b: b['start'])
+        return blocks
+
+    def fragmentation(self) -> Dict:
+        total_free = self.free_memory
+        largest = self.largest_hole()
+        return {
+            'total_free': total_free,
+            'largest_free': largest,
+            'holes': len(self._by_addr),
+            'external_fragmentation': 1 - largest / total_free if total_free else 0.0,
+        }
 
 
 class SegmentationSimulation:
     """
-    Simple segmentation manager:
+    Simple segmentation manager used by the GUI, backed by SegmentationMemory:
     - segments: list of dicts with keys {'name', 'size', 'start', 'end'}
-    - allocate(name, size) -> message string
+    - allocate(name, size, policy) -> message string
     - deallocate(name) -> message string
+    - compact(strategy) -> message string
+    Freed holes are reused and coalesced.  Segments only move when compacted,
+    explicitly or automatically (compaction / compact_threshold, see
+    SegmentationMemory); the latest plan is in memory.last_plan.
     """
 
-    def __init__(self, total_memory: int):
+    def __init__(self, total_memory: int, policy: str = "first", compaction: Optional[str] = None,
+                 compact_threshold: Optional[float] = None):
         self.total_memory = int(total_memory)
-        self.segments: List[Dict] = []
-        self.free_memory = int(total_memory)
+        self.memory = SegmentationMemory(self.total_memory, policy=policy, compaction=compaction,
+                                         compact_threshold=compact_threshold)
+
+    @property
+    def segments(self) -> List[Dict]:
+        return self.memory.get_segments()
 
-    def allocate(self, name: str, size: int) -> str:
+    @property
+    def free_memory(self) -> int:
+        return self.memory.free_memory
+
+    def allocate(self, name: str, size: int, policy: Optional[str] = None) -> str:
         size = int(size)
         if size <= 0:
             return f"❌ Invalid size for segment {name}."
+        if name in self.memory.segments:
+            return f"❌ Segment '{name}' already exists."
         if size > self.free_memory:
             return f"❌ Not enough memory to allocate segment {name} (requested {size}, free {self.free_memory})."
-        # compute start as next available address (simple contiguous allocation)
-        start = 0
-        for seg in self.segments:
-            start = max(start, seg['end'] + 1)
-        end = start + size - 1
-        self.segments.append({'name': name, 'size': size, 'start': start, 'end': end})
-        self.free_memory -= size
-        return f"✅ Segment '{name}' allocated [{start}..{end}] size={size}."
+        compactions = self.memory.compactions
+        seg = self.memory.allocate(name, size, policy)
+        if seg is None:
+            return (f"❌ No hole large enough for segment {name} "
+                    f"(requested {size}, largest hole {self.memory.largest_hole()}).")
+        msg = f"✅ Segment '{name}' allocated [{seg['start']}..{seg['end']}] size={size}."
+        if self.memory.compactions > compactions:
+            plan = self.memory.last_plan
+            msg += f" Compacted first ({plan['strategy']}, moved {plan['bytes_moved']} bytes)."
+        return msg
+
+    def compact(self, strategy: str = "auto") -> str:
+        plan = self.memory.compact(strategy)
+        if plan is None:
+            return "❌ Nothing to compact."
+        return (f"🧹 Compacted ({plan['strategy']}): moved {len(plan['moves'])} segments, "
+                f"{plan['bytes_moved']} bytes.")
 
     def deallocate(self, name: str) -> str:
-        for seg in list(self.segments):
-            if seg['name'] == name:
-                self.free_memory += seg['size']
-                self.segments.remove(seg)
-                # Optionally: we do not compact other segments (simple model)
-                return f"🗑️ Segment '{name}' deallocated."
-        return f"❌ Segment '{name}' not found."
+        if self.memory.free(name) is None:
+            return f"❌ Segment '{name}' not found."
+        return f"🗑️ Segment '{name}' deallocated."
 
     # helper accessors used by GUI
     def get_segments(self) -> List[Dict]:
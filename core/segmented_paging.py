@@ -0,0 +1,170 @@
+"""
+core/segmented_paging.py
+Segmented paging: logical (segment, offset) references -> segment table ->
+per-segment page numbers -> any replacement policy in PagingSimulation.
+
+  - SegmentTable: one row per segment (name, linear base, limit) plus the
+    global number of its first page.  Page p of segment s becomes the page
+    id page_base[s] + p, so every segment has its own pages and the ids are
+    plain ints that any policy (and the run-collapse fast path) can take.
+  - Translation is done on whole NumPy arrays: segment names are looked
+    up by binary search in the sorted names, offsets are limit-checked and shifted into page
+    numbers; linear addresses go through an interval index (searchsorted
+    over the sorted segment bases), O(log n) per reference.
+  - References outside their segment (or to unknown segments) are
+    segmentation violations: counted and dropped, or raised with strict=True.
+  - simulate() runs the translated page stream through PagingSimulation
+    and reports faults overall and per segment.
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from core.paging_core import PagingSimulation
+
+
+class SegmentationViolation(ValueError):
+    """A reference outside its segment's limit, or to an unknown segment."""
+
+
+class SegmentTable:
+    """Segment table for segments given as {'name', 'start', 'size'} dicts (see SegmentationMemory)."""
+
+    def __init__(self, segments: Iterable[Dict], page_size: int = 4096):
+        page_size = int(page_size)
+        if page_size <= 0 or page_size & (page_size - 1):
+            raise ValueError(f"Page size must be a power of two, got {page_size}")
+        segs = sorted(segments, key=lambda s: s['start'])
+        self.page_size = page_size
+        self.offset_bits = page_size.bit_length() - 1
+        self.names: List[Any] = [s['name'] for s in segs]
+        self.index: Dict[Any, int] = {name: i for i, name in enumerate(self.names)}
+        self.bases = np.array([s['start'] for s in segs], dtype=np.int64)
+        self.limits = np.array([s['size'] for s in segs], dtype=np.int64)
+        self.n_pages = (self.limits + page_size - 1) >> self.offset_bits
+        self.page_base = np.concatenate(([0], np.cumsum(self.n_pages)[:-1])).astype(np.int64) \
+            if len(segs) else np.empty(0, np.int64)
+        ends = self.bases + self.limits
+        if len(segs) > 1 and np.any(ends[:-1] > self.bases[1:]):
+            raise ValueError("Segments overlap")
+
+    @classmethod
+    def from_memory(cls, memory, page_size: int = 4096) -> "SegmentTable":
+        """Table of the segments currently allocated in a SegmentationMemory."""
+        return cls(memory.segments.values(), page_size)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def total_pages(self) -> int:
+        return int(self.n_pages.sum())
+
+    # ---------------- Translation ----------------
+    def segment_ids(self, segments: Any) -> np.ndarray:
+        """Segment names (or row numbers, for integer input) -> row numbers, -1 if unknown."""
+        arr = np.asarray(segments)
+        if arr.dtype.kind in "iu":
+            ids = arr.astype(np.int64, copy=True)
+            ids[(ids < 0) | (ids >= len(self))] = -1
+            return ids
+        if not len(arr) or not len(self):
+            return np.full(arr.shape, -1, dtype=np.int64)
+        if arr.dtype.kind in "US" and all(isinstance(name, str) for name in self.names):
+            # binary search in the sorted names: no sort of the references themselves
+            order = np.argsort(np.array(self.names))
+            ordered = np.array(self.names)[order]
+            pos = np.minimum(np.searchsorted(ordered, arr), len(ordered) - 1)
+            return np.where(ordered[pos] == arr, order[pos], -1).astype(np.int64)
+        uniques, inverse = np.unique(arr, return_inverse=True)
+        lookup = np.array([self.index.get(u, -1) for u in uniques.tolist()], dtype=np.int64)
+        return lookup[inverse.reshape(-1)]
+
+    def locate(self, addresses: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """Linear addresses -> (segment row, offset) via the interval index; row -1 outside every segment."""
+        addresses = np.asarray(addresses, dtype=np.int64)
+        if not len(self):
+            return np.full(addresses.shape, -1, dtype=np.int64), addresses.copy()
+        ids = np.searchsorted(self.bases, addresses, side="right") - 1
+        rows = np.maximum(ids, 0)
+        offsets = addresses - self.bases[rows]
+        ids[(ids < 0) | (offsets >= self.limits[rows])] = -1
+        return ids, offsets
+
+    def translate(self, segments: Any, offsets: Any, strict: bool = False) -> Dict[str, np.ndarray]:
+        """
+        (segment, offset) arrays -> {'pages', 'segments', 'valid'}: page ids and
+        segment rows of the valid references, and the validity mask over the
+        input.  strict=True raises SegmentationViolation instead of dropping.
+        """
+        ids = self.segment_ids(segments)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if ids.shape != offsets.shape:
+            raise ValueError(f"{len(ids)} segments but {len(offsets)} offsets")
+        valid = (ids >= 0) & (offsets >= 0)
+        if len(self):
+            valid &= offsets < self.limits[np.maximum(ids, 0)]
+        if strict and not valid.all():
+            bad = int(np.flatnonzero(~valid)[0])
+            raise SegmentationViolation(
+                f"Reference {bad}: offset {int(offsets[bad])} in segment "
+                f"{np.asarray(segments)[bad]!r} is outside the segment")
+        if not valid.all():
+            ids, offsets = ids[valid], offsets[valid]
+        pages = self.page_base[ids] + (offsets >> self.offset_bits)
+        return {"pages": pages, "segments": ids, "valid": valid}
+
+    def translate_addresses(self, addresses: Any, strict: bool = False) -> Dict[str, np.ndarray]:
+        """Linear addresses (as laid out by SegmentationMemory) -> same dict as translate()."""
+        ids, offsets = self.locate(addresses)
+        return self.translate(ids, offsets, strict)
+
+    def page_owner(self, pages: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """Inverse of the page numbering: page ids -> (segment row, page within the segment)."""
+        pages = np.asarray(pages, dtype=np.int64)
+        ids = np.searchsorted(self.page_base, pages, side="right") - 1
+        return ids, pages - self.page_base[ids]
+
+
+def simulate(table: SegmentTable, segments: Any, offsets: Any = None, n_frames: int = 16,
+             algorithm: str = "LRU", strict: bool = False) -> Dict[str, Any]:
+    """
+    Translate logical references and run the page stream through
+    PagingSimulation.  With offsets, segments holds one segment per
+    reference; without, it holds linear addresses.  Returns a report dict
+    with per-segment rows (references, distinct pages, faults).
+    """
+    if offsets is None:
+        translated = table.translate_addresses(segments, strict)
+    else:
+        translated = table.translate(segments, offsets, strict)
+    pages, ids = translated["pages"], translated["segments"]
+    sim = PagingSimulation(reference_string=pages, n_frames=n_frames, algorithm=algorithm,
+                           history="events", preprocess=True)
+    faults, history = sim.run_all()
+    fault_steps = np.frombuffer(history.steps, dtype=np.int64) if history.n_events() else np.empty(0, np.int64)
+
+    n_valid = len(pages)
+    n_segments = len(table)
+    refs_per = np.bincount(ids, minlength=n_segments)
+    faults_per = np.bincount(ids[fault_steps], minlength=n_segments)
+    distinct = np.unique(pages)
+    distinct_per = np.bincount(table.page_owner(distinct)[0], minlength=n_segments) if len(distinct) \
+        else np.zeros(n_segments, np.int64)
+    per_segment = [
+        {"segment": name, "pages": int(table.n_pages[i]), "references": int(refs_per[i]),
+         "distinct_pages": int(distinct_per[i]), "faults": int(faults_per[i])}
+        for i, name in enumerate(table.names)
+    ]
+    return {
+        "references": len(translated["valid"]),
+        "segfaults": len(translated["valid"]) - n_valid,
+        "translated": n_valid,
+        "distinct_pages": len(distinct),
+        "algorithm": sim.algorithm,
+        "n_frames": n_frames,
+        "page_faults": faults,
+        "fault_rate": faults / n_valid if n_valid else 0.0,
+        "per_segment": per_segment,
+    }
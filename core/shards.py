@@ -0,0 +1,205 @@
+"""
+core/shards.py
+Approximate LRU miss-ratio curves by spatial sampling (SHARDS).
+
+A page is sampled when hash(page) mod P < T, so a fixed fraction R = T/P of
+the distinct pages is tracked and every reference to a sampled page is
+kept.  Stack depths measured among the sampled pages (the same Fenwick
+recency counter as core/stack_distance.py) are scaled by 1/R to estimate
+the true depth, giving the fault count for every frame size from one pass
+that only does per-page work for ~R of the references.
+
+  - fixed rate:  rate=R, memory grows with R * distinct pages
+  - fixed size:  max_pages=S, at most S sampled pages; when the set
+    overflows, the pages with the largest hashes are dropped, T is lowered
+    to match and the histogram so far is rescaled to the new rate
+
+Either way the histogram is corrected for sampling noise (SHARDS-adj):
+the sample should hold (references seen) x (rate in effect) references,
+and the difference goes to depth 1.
+
+Integer traces are hashed in NumPy chunks, so unsampled references never
+reach the Python loop; other page types fall back to a per-reference hash.
+"""
+
+import hashlib
+import heapq
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from core.stack_distance import _RecencyCounter
+
+# hash values are 24-bit: T ranges over 0..MODULUS
+HASH_BITS = 24
+MODULUS = 1 << HASH_BITS
+CHUNK = 1 << 20
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+
+
+def page_hash(page: Any) -> int:
+    """HASH_BITS-bit hash of one page; splitmix64 for ints (as hash_pages), blake2b of repr otherwise."""
+    if isinstance(page, (int, np.integer)):
+        z = (int(page) + _GOLDEN) & _MASK64
+        z = ((z ^ (z >> 30)) * _MIX1) & _MASK64
+        z = ((z ^ (z >> 27)) * _MIX2) & _MASK64
+        return (z ^ (z >> 31)) >> (64 - HASH_BITS)
+    digest = hashlib.blake2b(repr(page).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") >> (64 - HASH_BITS)
+
+
+def hash_pages(pages: np.ndarray) -> np.ndarray:
+    """page_hash over an integer array, vectorized (uint64 arithmetic wraps like the & _MASK64)."""
+    z = pages.astype(np.uint64) + np.uint64(_GOLDEN)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX2)
+    return (z ^ (z >> np.uint64(31))) >> np.uint64(64 - HASH_BITS)
+
+
+def _chunks(reference_string: Iterable[Any], size: int) -> Iterator[Any]:
+    if isinstance(reference_string, (Sequence, memoryview, np.ndarray)):
+        for start in range(0, len(reference_string), size):
+            yield reference_string[start:start + size]
+        return
+    it = iter(reference_string)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ShardsMRC:
+    """
+    Streaming SHARDS estimator: feed() references (any number of times),
+    then curve() gives estimated LRU faults for 0..max_frames frames.
+    """
+
+    def __init__(self, max_frames: int, rate: Optional[float] = None, max_pages: Optional[int] = None,
+                 chunk: int = CHUNK):
+        if rate is None:
+            rate = 1.0 if max_pages is not None else 0.01
+        if not 0.0 < rate <= 1.0:
+            raise ValueError(f"Sampling rate must be in (0, 1], got {rate}")
+        if max_pages is not None and int(max_pages) < 1:
+            raise ValueError(f"max_pages must be positive, got {max_pages}")
+        self.max_frames = int(max_frames)
+        self.max_pages = None if max_pages is None else int(max_pages)
+        self.chunk = max(1, int(chunk))
+        self.threshold = max(1, int(rate * MODULUS))
+        self.n_refs = 0
+        self.sampled_refs = 0
+        self.cold = 0.0
+        self.expected = 0.0                           # sum of chunk length x rate, rescaled with hist
+        self.hist = [0.0] * (self.max_frames + 2)    # index max_frames+1 = deeper
+        self._counter = _RecencyCounter()
+        self._heap: List = []                         # (-hash, page) of sampled pages, fixed size only
+
+    @property
+    def rate(self) -> float:
+        return self.threshold / MODULUS
+
+    # ---------------- Sampling ----------------
+    def feed(self, reference_string: Iterable[Any]) -> "ShardsMRC":
+        for chunk in _chunks(reference_string, self.chunk):
+            self.n_refs += len(chunk)
+            self.expected += len(chunk) * self.rate
+            arr = np.asarray(chunk)
+            if arr.ndim == 1 and arr.dtype.kind in "iub":
+                hashes = hash_pages(arr)
+                keep = hashes < self.threshold
+                self._sample(arr[keep].tolist(), hashes[keep].tolist())
+            else:
+                hashes = [page_hash(page) for page in chunk]
+                threshold = self.threshold
+                keep = [i for i, h in enumerate(hashes) if h < threshold]
+                self._sample([chunk[i] for i in keep], [hashes[i] for i in keep])
+        return self
+
+    def _sample(self, pages: List[Any], hashes: List[int]):
+        access = self._counter.access
+        hist = self.hist
+        deeper = self.max_frames + 1
+        bounded = self.max_pages is not None
+        threshold = self.threshold
+        scale = MODULUS / threshold
+        n = 0
+        for page, h in zip(pages, hashes):
+            if h >= threshold:
+                # T dropped after this chunk was filtered
+                continue
+            n += 1
+            depth = access(page)
+            if depth == 0:
+                self.cold += 1
+                if bounded:
+                    heapq.heappush(self._heap, (-h, page))
+                    if len(self._counter) > self.max_pages:
+                        self._shrink()
+                        threshold = self.threshold
+                        scale = MODULUS / threshold
+                continue
+            d = int(depth * scale + 0.5)
+            hist[d if d <= deeper else deeper] += 1
+        self.sampled_refs += n
+
+    def _shrink(self):
+        # drop the largest hash (and ties) and lower T to it: R_new = T_new / P
+        heap, remove = self._heap, self._counter.remove
+        new_threshold = -heap[0][0]
+        while heap and -heap[0][0] >= new_threshold:
+            remove(heapq.heappop(heap)[1])
+        factor = new_threshold / self.threshold
+        hist = self.hist
+        for d in range(len(hist)):
+            hist[d] *= factor
+        self.cold *= factor
+        self.expected *= factor
+        self.threshold = new_threshold
+
+    # ---------------- Results ----------------
+    def curve(self) -> List[int]:
+        """Estimated LRU faults for k = 0..max_frames frames (curve[0] = references seen)."""
+        n = self.n_refs
+        hist = list(self.hist)
+        total = sum(hist) + self.cold
+        if total:
+            # SHARDS-adj: put the shortfall (or excess) against the expected sample size at depth 1
+            hist[1] += self.expected - total
+            total = self.expected
+        if total <= 0:
+            # nothing sampled: no estimate, report every reference as a miss
+            return [n] * (self.max_frames + 1)
+        curve = [n] * (self.max_frames + 1)
+        misses = self.cold + hist[self.max_frames + 1]
+        for k in range(self.max_frames, 0, -1):
+            curve[k] = min(n, max(0, round(n * misses / total)))
+            misses += hist[k]
+        return curve
+
+    def stats(self) -> Dict[str, Any]:
+        return {"rate": self.rate, "max_pages": self.max_pages, "sampled_pages": len(self._counter),
+                "sampled_refs": self.sampled_refs, "total_refs": self.n_refs}
+
+
+def shards_fault_curve(reference_string: Iterable[Any], max_frames: int, rate: Optional[float] = None,
+                       max_pages: Optional[int] = None) -> List[int]:
+    """
+    Approximate lru_fault_curve: curve[k] = estimated LRU faults with k
+    frames.  Give a sampling rate, a cap on sampled pages, or both (the cap
+    then starts from that rate).  Defaults to rate=0.01.
+    """
+    return ShardsMRC(max_frames, rate, max_pages).feed(reference_string).curve()
+
+
+def mrc_error(exact: Sequence[int], approx: Sequence[int]) -> Dict[str, float]:
+    """Miss-ratio error of approx against exact over k = 1..max_frames (both curves from one trace)."""
+    n = exact[0]
+    diffs = [abs(a - e) / n for e, a in zip(exact[1:], approx[1:])] if n else []
+    return {"mean_abs_error": sum(diffs) / len(diffs) if diffs else 0.0,
+            "max_abs_error": max(diffs, default=0.0)}
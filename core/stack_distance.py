@@ -0,0 +1,231 @@
+"""
+core/stack_distance.py
+Single-pass (Mattson-style) stack-distance engines.
+
+Replacement policies with the stack (inclusion) property keep, for every frame
+count k, a resident set that is the top k entries of one priority stack.  One
+pass over the reference string therefore yields the fault count for every
+frame count at once instead of one replay per size.
+
+  - lru_fault_curve(refs, max_frames)   -> faults for 0..max_frames frames
+  - opt_fault_curve(refs, max_frames)   -> same for Optimal (priority stack)
+  - fault_curve(refs, algorithm, max_frames)
+"""
+
+from array import array
+from collections.abc import Sequence
+from typing import Any, Iterable, List
+
+from core.policies import get_policy
+
+# registry names of the policies with a single-pass engine here
+STACK_ALGORITHMS = ("LRU", "OPTIMAL")
+
+
+def has_stack_property(algorithm: str) -> bool:
+    try:
+        spec = get_policy(algorithm)
+    except ValueError:
+        return False
+    return spec.stack_property and spec.name in STACK_ALGORITHMS
+
+
+def next_use_indices(reference_string: Iterable[Any]) -> array:
+    """
+    nxt[i] = index of the next reference to reference_string[i], or len(refs)
+    if the page is never referenced again.  Built in one backward pass.
+    """
+    refs = reference_string if isinstance(reference_string, Sequence) else list(reference_string)
+    n = len(refs)
+    nxt = array('q', [n]) * n
+    seen = {}
+    for i in range(n - 1, -1, -1):
+        page = refs[i]
+        nxt[i] = seen.get(page, n)
+        seen[page] = i
+    return nxt
+
+
+class _RecencyCounter:
+    """
+    Counts the distinct pages touched since a page's previous reference.
+    Marks every page's last access time in a Fenwick tree; timestamps are
+    renumbered when the tree fills up, so memory stays O(distinct pages)
+    regardless of trace length.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._size = capacity
+        self._tree = [0] * (capacity + 1)
+        self._clock = 0
+        self._last = {}
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+    def _add(self, i: int, delta: int):
+        tree, size = self._tree, self._size
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, i: int) -> int:
+        tree = self._tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _compact(self):
+        # renumber live timestamps 1..m (keeping their order) and rebuild in O(m)
+        live = sorted(self._last.items(), key=lambda kv: kv[1])
+        m = len(live)
+        self._size = size = max(1024, 2 * m)
+        tree = [0] * (size + 1)
+        for t, (page, _) in enumerate(live, 1):
+            self._last[page] = t
+            tree[t] += 1
+            j = t + (t & -t)
+            if j <= size:
+                tree[j] += tree[t]
+        for t in range(m + 1, size + 1):
+            j = t + (t & -t)
+            if j <= size:
+                tree[j] += tree[t]
+        self._tree = tree
+        self._clock = m
+
+    def remove(self, page: Any):
+        """Forget page (it no longer counts toward other pages' depths)."""
+        last = self._last.pop(page, None)
+        if last is not None:
+            self._add(last, -1)
+
+    def access(self, page: Any) -> int:
+        """
+        Record a reference and return its LRU stack depth (1 = most recently
+        used page), or 0 if the page has never been seen (cold miss).
+        """
+        if self._clock >= self._size:
+            self._compact()
+        self._clock += 1
+        now = self._clock
+        last = self._last.get(page)
+        self._last[page] = now
+        if last is None:
+            self._add(now, 1)
+            return 0
+        depth = len(self._last) - self._prefix(last) + 1
+        self._add(last, -1)
+        self._add(now, 1)
+        return depth
+
+
+def _curve_from_depths(hist: List[int], cold: int, max_frames: int) -> List[int]:
+    """hist[d] = references found at stack depth d (index max_frames+1 = deeper)."""
+    curve = [0] * (max_frames + 1)
+    misses = cold + hist[max_frames + 1]
+    for k in range(max_frames, -1, -1):
+        curve[k] = misses
+        misses += hist[k]
+    return curve
+
+
+def lru_fault_curve(reference_string: Iterable[Any], max_frames: int) -> List[int]:
+    """
+    LRU fault counts for every frame count in one pass.
+    Returns curve where curve[k] = faults with k frames (k = 0..max_frames).
+    """
+    max_frames = int(max_frames)
+    hist = [0] * (max_frames + 2)
+    cold = 0
+    access = _RecencyCounter().access
+    deeper = max_frames + 1
+    for page in reference_string:
+        depth = access(page)
+        if depth == 0:
+            cold += 1
+        elif depth > max_frames:
+            hist[deeper] += 1
+        else:
+            hist[depth] += 1
+    return _curve_from_depths(hist, cold, max_frames)
+
+
+def opt_fault_curve(reference_string: Iterable[Any], max_frames: int) -> List[int]:
+    """
+    Optimal (Belady) fault counts for every frame count in one pass, using
+    Mattson's priority stack ordered by next use.  The stack is truncated at
+    max_frames: entries below that depth never affect the top max_frames.
+    """
+    refs = reference_string if isinstance(reference_string, Sequence) else list(reference_string)
+    max_frames = int(max_frames)
+    if max_frames <= 0:
+        return [len(refs)]
+    nxt = next_use_indices(refs)
+    hist = [0] * (max_frames + 2)
+    cold = 0
+    deeper = max_frames + 1
+    stack: List[Any] = []
+    next_of = {}     # page in stack -> index of its next reference
+    seen = set()
+
+    for i, page in enumerate(refs):
+        try:
+            d = stack.index(page)
+        except ValueError:
+            d = -1
+        if d == 0:
+            hist[1] += 1
+            next_of[page] = nxt[i]
+            continue
+        if d > 0:
+            hist[d + 1] += 1
+        elif page in seen:
+            hist[deeper] += 1
+        else:
+            cold += 1
+            seen.add(page)
+        next_of[page] = nxt[i]
+        if not stack:
+            stack.append(page)
+            continue
+        # cascade: each level keeps whichever candidate is needed sooner
+        carry = stack[0]
+        stack[0] = page
+        end = d if d > 0 else len(stack)
+        for j in range(1, end):
+            other = stack[j]
+            if next_of[carry] < next_of[other]:
+                stack[j] = carry
+                carry = other
+        if d > 0:
+            stack[d] = carry
+        elif len(stack) < max_frames:
+            stack.append(carry)
+        else:
+            del next_of[carry]
+    return _curve_from_depths(hist, cold, max_frames)
+
+
+def fault_curve(reference_string: Iterable[Any], algorithm: str, max_frames: int) -> List[int]:
+    """
+    Dispatch to the stack-distance engine for a stack algorithm.  A
+    ReducedTrace (core/preprocess.py) is swept over its runs only: repeats
+    sit at depth 1, so they change curve[0] alone.
+    """
+    from core.preprocess import ReducedTrace
+
+    algo = get_policy(algorithm).name
+    if isinstance(reference_string, ReducedTrace):
+        if algo == "LRU":
+            return reference_string.lru_fault_curve(max_frames)
+        curve = fault_curve(reference_string.pages, algo, max_frames)
+        curve[0] = reference_string.n_refs
+        return curve
+    if algo == "LRU":
+        return lru_fault_curve(reference_string, max_frames)
+    if algo == "OPTIMAL":
+        return opt_fault_curve(reference_string, max_frames)
+    raise ValueError(f"Algorithm {algorithm} does not have the stack property")
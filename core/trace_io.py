@@ -0,0 +1,200 @@
+"""
+core/trace_io.py
+Streaming page-reference trace readers.
+
+  - TextTrace(path)    : integers separated by whitespace/commas, '#' comments
+  - CsvTrace(path)     : one column of a CSV file (by index or header name)
+  - BinaryTrace(buf)   : fixed-width binary format, zero-copy over a buffer
+  - BinaryTrace.open() : same, memory-mapped from a file
+  - open_trace(path)   : pick a reader from the file extension
+  - trace_from_bytes(data) : binary or text trace from an in-memory upload
+  - trace_from_stream(f)   : same from a binary stream (e.g. stdin), text streamed
+  - write_binary(path, refs, itemsize)
+
+Text and CSV traces re-read the file on every iteration, so they can be
+simulated repeatedly without ever being held in memory.  Binary traces are
+Sequences backed by a memoryview of the mapped file.
+
+Binary layout (little-endian):
+  0  4s  magic  b"VMTR"
+  4  B   version (1)
+  5  B   itemsize (4 or 8, signed integers)
+  6  2x  reserved
+  8  Q   number of references
+  16 ... references
+"""
+
+import csv
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Any, Iterable, Iterator, Optional, Union
+
+MAGIC = b"VMTR"
+VERSION = 1
+_HEADER = struct.Struct("<4sBB2xQ")
+HEADER_SIZE = _HEADER.size
+_FORMATS = {4: "i", 8: "q"}
+_CHUNK = 1 << 16
+
+
+def iter_text(lines: Iterable[str]) -> Iterator[int]:
+    """Parse references from lines of text (whitespace or comma separated)."""
+    for line in lines:
+        line = line.split("#", 1)[0]
+        for tok in line.replace(",", " ").split():
+            yield int(tok)
+
+
+class TextTrace:
+    """Re-iterable text trace; the file is streamed on every iteration."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __iter__(self) -> Iterator[int]:
+        with open(self.path) as f:
+            yield from iter_text(f)
+
+
+class CsvTrace:
+    """Re-iterable trace read from one CSV column (index or header name)."""
+
+    def __init__(self, path: str, column: Union[int, str] = 0, header: Optional[bool] = None):
+        self.path = path
+        self.column = column
+        # a named column implies a header row
+        self.header = isinstance(column, str) if header is None else header
+
+    def __iter__(self) -> Iterator[int]:
+        with open(self.path, newline="") as f:
+            reader = csv.reader(f)
+            col = self.column
+            if self.header:
+                names = next(reader, [])
+                if isinstance(col, str):
+                    col = names.index(col)
+            for row in reader:
+                if row and row[col].strip():
+                    yield int(row[col])
+
+
+class BinaryTrace(Sequence):
+    """
+    Fixed-width binary trace over any buffer (bytes, mmap, ...).  Indexing,
+    slicing and iteration go straight to a memoryview: nothing is copied.
+    """
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        if len(view) < HEADER_SIZE:
+            raise ValueError("Truncated trace: missing header")
+        magic, version, itemsize, count = _HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION or itemsize not in _FORMATS:
+            raise ValueError("Not a binary page trace (bad magic, version or item size)")
+        end = HEADER_SIZE + count * itemsize
+        if len(view) < end:
+            raise ValueError("Truncated trace: header promises more references than present")
+        self.itemsize = itemsize
+        self._mmap = None
+        data = view[HEADER_SIZE:end]
+        if sys.byteorder == "little":
+            self.refs = data.cast(_FORMATS[itemsize])
+        else:
+            # big-endian host: one byte-swapped copy
+            refs = array(_FORMATS[itemsize], data.tobytes())
+            refs.byteswap()
+            self.refs = refs
+
+    @classmethod
+    def open(cls, path: str) -> "BinaryTrace":
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        trace = cls(mm)
+        trace._mmap = mm
+        return trace
+
+    def close(self):
+        if isinstance(self.refs, memoryview):
+            self.refs.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    def __getitem__(self, i):
+        return self.refs[i]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.refs)
+
+
+def write_binary(path: str, reference_string: Iterable[int], itemsize: int = 4) -> int:
+    """Stream references into the binary format; returns the count written."""
+    if itemsize not in _FORMATS:
+        raise ValueError("itemsize must be 4 or 8")
+    fmt = _FORMATS[itemsize]
+    count = 0
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, itemsize, 0))
+        chunk = array(fmt)
+        for ref in reference_string:
+            chunk.append(ref)
+            if len(chunk) >= _CHUNK:
+                count += _write_chunk(f, chunk)
+                chunk = array(fmt)
+        count += _write_chunk(f, chunk)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, itemsize, count))
+    return count
+
+
+def _write_chunk(f, chunk: array) -> int:
+    if sys.byteorder != "little":
+        chunk.byteswap()
+    chunk.tofile(f)
+    return len(chunk)
+
+
+def open_trace(path: str, **kwargs) -> Any:
+    """Open a trace by extension: .bin/.vmt binary, .csv CSV, anything else text."""
+    lower = path.lower()
+    if lower.endswith((".bin", ".vmt")):
+        return BinaryTrace.open(path)
+    if lower.endswith(".csv"):
+        return CsvTrace(path, **kwargs)
+    return TextTrace(path)
+
+
+def trace_from_bytes(data: bytes) -> Iterable[int]:
+    """Binary trace (zero-copy) if data carries the magic, else a one-shot text stream."""
+    if data[:len(MAGIC)] == MAGIC:
+        return BinaryTrace(data)
+    return iter_text(data.decode().splitlines())
+
+
+def trace_from_stream(f) -> Iterable[int]:
+    """
+    Trace from a binary file object such as sys.stdin.buffer: a binary trace
+    is read whole, text is parsed line by line as it arrives (one-shot).
+    """
+    head = f.read(len(MAGIC))
+    if head == MAGIC:
+        return BinaryTrace(head + f.read())
+    return iter_text(_stream_lines(head, f))
+
+
+def _stream_lines(head: bytes, f) -> Iterator[str]:
+    yield from (head + f.readline()).decode().splitlines()
+    for line in f:
+        yield line.decode()
@@ -1,17 +1,88 @@
 """
 experiments/analysis_tools.py
 Simple helpers for loading results and plotting (used by experiment_runner or for reports).
+Summaries load from a summary CSV or a result store directory; per-step
+logs are read lazily from the store (see experiments/result_store.py).
+Trace statistics (reuse distances, working-set sizes) come from the
+preprocessed trace (core/preprocess.py).  pandas and matplotlib are
+imported by the functions that return DataFrames or draw plots.
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
+import os
+from typing import Any, Iterable, Iterator, List, Optional
 
+import numpy as np
 
-def load_summary(csv_path: str) -> pd.DataFrame:
-    return pd.read_csv(csv_path)
+from core.preprocess import reduce_trace
+from experiments.result_store import ResultStore
 
 
-def plot_faults_vs_frames(df: pd.DataFrame, out_path: str):
+def load_summary(path: Any) -> "pd.DataFrame":
+    """Summary table from a result store directory or a summary CSV (path or open file)."""
+    import pandas as pd
+
+    if isinstance(path, str) and os.path.isdir(path):
+        return pd.DataFrame(ResultStore(path).summary())
+    return pd.read_csv(path)
+
+
+def iter_log(store_dir: str, algorithm: Optional[str] = None, frames: Optional[int] = None,
+             columns: Optional[List[str]] = None) -> Iterator["pd.DataFrame"]:
+    """Stored per-step logs one batch at a time, with algorithm and frames columns added."""
+    import pandas as pd
+
+    for alg, nf, batch in ResultStore(store_dir).scan_log(algorithm, frames, columns):
+        df = pd.DataFrame(batch)
+        df.insert(0, "frames", nf)
+        df.insert(0, "algorithm", alg)
+        yield df
+
+
+def load_log(store_dir: str, algorithm: str, frames: int, columns: Optional[List[str]] = None) -> "pd.DataFrame":
+    import pandas as pd
+
+    return pd.DataFrame(ResultStore(store_dir).read_log(algorithm, frames, columns))
+
+
+def windowed_fault_rate(store_dir: str, algorithm: str, frames: int, window: int = 1000) -> np.ndarray:
+    """Fault rate per window of `window` steps, scanning only the fault column."""
+    counts = []
+    carry = np.empty(0, dtype=bool)
+    for _, _, batch in ResultStore(store_dir).scan_log(algorithm, frames, ["fault"]):
+        faults = np.concatenate([carry, batch["fault"]])
+        full = len(faults) // window * window
+        counts.append(faults[:full].reshape(-1, window).sum(axis=1))
+        carry = faults[full:]
+    if len(carry):
+        counts.append(np.array([carry.sum()]))
+        rates = np.concatenate(counts).astype(np.float64)
+        rates[:-1] /= window
+        rates[-1] /= len(carry)
+        return rates
+    return np.concatenate(counts) / window if counts else np.empty(0)
+
+
+def reuse_distance_histogram(refs: Iterable[Any]) -> "pd.Series":
+    """References per LRU reuse (stack) distance; distance 0 = first reference to a page."""
+    import pandas as pd
+
+    counts = reduce_trace(refs).reuse_distance_histogram()
+    series = pd.Series(counts, name="references")
+    series.index.name = "reuse_distance"
+    return series[series > 0]
+
+
+def working_set_curve(refs: Iterable[Any], windows: Iterable[int]) -> "pd.DataFrame":
+    """Mean working-set size for each window length (Denning's s(tau))."""
+    import pandas as pd
+
+    windows = list(windows)
+    return pd.DataFrame({"window": windows, "working_set_size": reduce_trace(refs).working_set_sizes(windows)})
+
+
+def plot_faults_vs_frames(df: "pd.DataFrame", out_path: Any):
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(8,5))
     for alg in df['algorithm'].unique():
         sub = df[df['algorithm'] == alg].sort_values('frames')
@@ -1,49 +1,261 @@
 """
 experiments/experiment_runner.py
 Run batch experiments that sweep frames and algorithms, save CSV summary and plots.
+Summaries and per-step logs also go to a columnar store (out_dir/store,
+see experiments/result_store.py) that analysis_tools reads lazily.
+
+Algorithms with the stack property (LRU, OPTIMAL) are swept with the
+single-pass engine in core/stack_distance.py: one pass over the trace gives
+the fault count for every frame size.  Other algorithms replay per size.
+For traces too long even for that, sampling_rate / sample_pages switch LRU
+to the approximate SHARDS curve (core/shards.py).
+
+run_batch_parallel fans the same grid out over a process pool, with the
+trace placed once in shared memory.  iter_batch yields the summary rows
+without writing anything.  matplotlib is only imported to plot.
 """
 
+import csv
 import os
-from core.paging_core import PagingSimulation
-import pandas as pd
-import matplotlib.pyplot as plt
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+from core.paging_core import PagingSimulation, make_summary
+from core.policies import get_policy
+from core.preprocess import reduce_trace
+from core.result_cache import cache_key, cached_run, default_cache, trace_digest
+from core.shards import ShardsMRC
+from core.stack_distance import has_stack_property, fault_curve
+from experiments.result_store import ResultStore
+
+STORE_DIR = "store"
+
+
+def run_batch(reference_string, frames_list, algos, out_dir="experiments/results", save_logs=False,
+              use_cache=True, cache=None, metrics=False, sampling_rate=None, sample_pages=None,
+              preprocess=False, plot=True):
+    """
+    save_logs=True also writes the per-step log of every (algorithm, frames)
+    cell to the columnar result store under out_dir/store (see
+    experiments/result_store.py); that needs a full replay per cell, so
+    stack algorithms only use the single-pass engine when logs are off.
+
+    With use_cache, fault curves and per-cell results are memoized in the
+    result cache (core/result_cache.py; default_cache() unless cache is
+    given), so repeating a sweep over the same trace replays nothing.  The
+    default cache stays in memory unless VMSIM_CACHE_DIR names a directory.
+
+    metrics=True replays every cell with PagingMetrics (core/metrics.py)
+    and adds its scalar metrics as summary columns.
+
+    sampling_rate (fraction of pages) and/or sample_pages (cap on sampled
+    pages, i.e. a memory budget) replace the exact LRU sweep with an
+    approximate SHARDS curve; those rows get a sample_rate column with the
+    rate actually used.
 
+    preprocess=True collapses runs of repeated references once up front
+    (core/preprocess.py); run-invariant algorithms then replay runs only.
 
-def run_batch(reference_string, frames_list, algos, out_dir="experiments/results"):
+    plot=False skips the faults-vs-frames plot (and the matplotlib import).
+    """
     os.makedirs(out_dir, exist_ok=True)
-    results = []
+    _reset_store(out_dir)
+    results = list(iter_batch(reference_string, frames_list, algos, use_cache, cache, metrics, sampling_rate,
+                              sample_pages, preprocess, log_dir=out_dir if save_logs else None))
+    return _write_summary(results, algos, out_dir, plot)
+
+
+def iter_batch(reference_string, frames_list, algos, use_cache=True, cache=None, metrics=False,
+               sampling_rate=None, sample_pages=None, preprocess=False, log_dir=None):
+    """
+    The summary rows of run_batch, yielded as each cell is done (algorithm
+    by algorithm), without writing anything unless log_dir is given (then
+    per-step logs go to log_dir as with run_batch(save_logs=True)).
+    """
+    save_logs = log_dir is not None
+    refs = reference_string
+    if iter(refs) is refs:
+        # one-shot iterator: every cell needs its own pass
+        refs = list(refs)
+    if preprocess:
+        refs = reduce_trace(refs)
+    if use_cache:
+        cache = default_cache() if cache is None else cache
+        digest = trace_digest(refs)
+    sampled = sampling_rate is not None or sample_pages is not None
     for alg in algos:
+        curve = None
+        rate = None
+        if has_stack_property(alg) and frames_list and not (save_logs or metrics):
+            top = max(frames_list)
+            if sampled and get_policy(alg).name == "LRU":
+                mode = f"shards/{sampling_rate}/{sample_pages}"
+                key = cache_key(digest, alg, top, mode) if use_cache else None
+                entry = cache.get(key) if use_cache else None
+                if entry is None:
+                    mrc = ShardsMRC(top, sampling_rate, sample_pages).feed(refs)
+                    entry = (mrc.curve(), mrc.rate)
+                    if use_cache:
+                        cache.put(key, entry)
+                curve, rate = entry
+            else:
+                key = cache_key(digest, alg, top, "curve") if use_cache else None
+                curve = cache.get(key) if use_cache else None
+                if curve is None:
+                    curve = fault_curve(refs, alg, top)
+                    if use_cache:
+                        cache.put(key, curve)
         for nf in frames_list:
-            sim = PagingSimulation(n_frames=nf, algorithm=alg, reference_string=reference_string)
-            sim.run_all()
-            s = sim.summary()
+            if curve is not None:
+                s = make_summary(curve[0], curve[nf])
+                if rate is not None:
+                    s["sample_rate"] = rate
+            else:
+                sim = PagingSimulation(n_frames=nf, algorithm=alg, reference_string=refs,
+                                       history="events" if save_logs else "none", metrics=metrics)
+                if use_cache:
+                    cached_run(sim, cache, digest)
+                else:
+                    sim.run_all()
+                s = sim.summary()
+                if save_logs:
+                    _save_log(sim, alg, log_dir)
             s.update({"algorithm": alg, "frames": nf})
-            results.append(s)
-            # save log
-            logdf = sim.get_log()
-            logdf.to_csv(os.path.join(out_dir, f"log_{alg}_f{nf}.csv"), index=False)
-    df = pd.DataFrame(results)
+            yield s
+
+
+def _reset_store(out_dir):
+    """Empty out_dir's store, so that after a batch it holds exactly that batch's cells."""
+    ResultStore(os.path.join(out_dir, STORE_DIR)).clear()
+
+
+def _save_log(sim, alg, out_dir):
+    try:
+        ResultStore(os.path.join(out_dir, STORE_DIR)).write_log(alg, sim.n_frames, sim.iter_log_columns())
+    except (TypeError, ValueError, OverflowError):
+        # non-integer pages have no typed columns: fall back to a CSV log
+        sim.get_log().to_csv(os.path.join(out_dir, f"log_{alg}_f{sim.n_frames}.csv"), index=False)
+
+
+def _write_summary(results, algos, out_dir, plot=True):
+    store = ResultStore(os.path.join(out_dir, STORE_DIR))
+    for row in results:
+        store.write_summary(row)
     summary_csv = os.path.join(out_dir, "summary_results.csv")
-    df.to_csv(summary_csv, index=False)
+    with open(summary_csv, "w", newline="") as f:
+        write_rows(f, results)
+    if plot:
+        plot_faults_vs_frames(results, algos, os.path.join(out_dir, "faults_vs_frames.png"))
+    return summary_csv
+
+
+def write_rows(f, rows):
+    """Summary rows as CSV, columns in order of first appearance (empty cell for missing / None)."""
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    writer = csv.DictWriter(f, columns)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def plot_faults_vs_frames(results, algos, out_path):
+    import matplotlib.pyplot as plt
 
-    # Plot faults vs frames
     plt.figure(figsize=(8,5))
     for alg in algos:
-        sub = df[df["algorithm"] == alg].sort_values("frames")
-        plt.plot(sub["frames"], sub["total_faults"], marker="o", label=alg)
+        sub = sorted((r for r in results if r["algorithm"] == alg), key=lambda r: r["frames"])
+        plt.plot([r["frames"] for r in sub], [r["total_faults"] for r in sub], marker="o", label=alg)
     plt.title("Total Page Faults vs Frames")
     plt.xlabel("Frames")
     plt.ylabel("Total Faults")
     plt.grid(True)
     plt.legend()
-    plt.savefig(os.path.join(out_dir, "faults_vs_frames.png"))
+    plt.savefig(out_path)
     plt.close()
 
-    return summary_csv
+
+# ---------------- Parallel runner ----------------
+def _run_task(shm_name, n_refs, alg, frames_list):
+    """Worker: one algorithm over frames_list (one pass if it has the stack property)."""
+    shm = SharedMemory(name=shm_name)
+    refs = shm.buf[:n_refs * 8].cast("q")
+    try:
+        rows = []
+        if has_stack_property(alg):
+            curve = fault_curve(refs, alg, max(frames_list))
+            for nf in frames_list:
+                rows.append(make_summary(n_refs, curve[nf]))
+        else:
+            for nf in frames_list:
+                sim = PagingSimulation(n_frames=nf, algorithm=alg, reference_string=refs, history="none")
+                sim.run_all()
+                rows.append(sim.summary())
+        for nf, row in zip(frames_list, rows):
+            row.update({"algorithm": alg, "frames": nf})
+        return rows
+    finally:
+        refs.release()
+        shm.close()
+
+
+def run_batch_parallel(reference_string, frames_list, algos, out_dir="experiments/results",
+                       max_workers=None, progress=None, cancel=None, plot=True):
+    """
+    Same summary as run_batch, computed on a ProcessPoolExecutor.
+    The (integer) trace is copied once into shared memory and every worker
+    maps it.  Stack algorithms are one task each; the rest are one task per
+    (algorithm, frames) cell.  As tasks finish their rows join the summary and
+    progress(done_tasks, total_tasks, rows) is called.  cancel is an optional
+    threading.Event: once set, queued cells are cancelled, running ones are
+    abandoned and None is returned without writing a summary.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    frames_list = list(frames_list)
+    tasks = []
+    for alg in algos if frames_list else ():
+        if has_stack_property(alg):
+            tasks.append((alg, frames_list))
+        else:
+            tasks.extend((alg, [nf]) for nf in frames_list)
+    _reset_store(out_dir)
+    if not tasks:
+        return _write_summary([], algos, out_dir, plot)
+
+    refs = array("q", reference_string)
+    n_refs = len(refs)
+    shm = SharedMemory(create=True, size=max(8, n_refs * 8))
+    results = []
+    try:
+        shm.buf[:n_refs * 8] = memoryview(refs).cast("B")
+        del refs
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+        pending = set()
+        try:
+            pending = {pool.submit(_run_task, shm.name, n_refs, alg, fl) for alg, fl in tasks}
+            done = 0
+            while pending and not (cancel is not None and cancel.is_set()):
+                finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    rows = fut.result()
+                    results.extend(rows)
+                    done += 1
+                    if progress is not None:
+                        progress(done, len(tasks), rows)
+        finally:
+            # on cancel (or error) do not wait for the cells still running
+            pool.shutdown(wait=not pending, cancel_futures=True)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    if cancel is not None and cancel.is_set():
+        return None
+    order = {alg: i for i, alg in enumerate(algos)}
+    results.sort(key=lambda r: (order[r["algorithm"]], r["frames"]))
+    return _write_summary(results, algos, out_dir, plot)
 
 
 if __name__ == "__main__":
     # demo run
     refs = [7,0,1,2,0,3,0,4,2,3,0,3]
-    csv = run_batch(reference_string=refs, frames_list=[2,3,4,5], algos=["LRU","OPTIMAL"])
+    csv = run_batch(reference_string=refs, frames_list=[2,3,4,5], algos=["LRU","OPTIMAL"], save_logs=True)
     print("Saved summary to:", csv)
@@ -0,0 +1,141 @@
+"""
+experiments/result_store.py
+Columnar result store for batch experiments: typed NumPy columns in .npz
+files, partitioned by algorithm and frame count.
+
+    <root>/algorithm=<ALG>/frames=<k>/summary.npz
+    <root>/algorithm=<ALG>/frames=<k>/log-00000.npz, log-00001.npz, ...
+
+summary.npz holds one 0-d array per scalar column of the summary row
+(make_summary() plus any metrics / sample_rate columns; None is NaN).
+Each log part holds one batch of PagingSimulation.iter_log_columns()
+(step, page, fault, F0..Fn; -1 = empty frame).  Reads are lazy: partitions
+are found from directory names, parts are opened one at a time and only the
+requested columns are decompressed.
+"""
+
+import os
+import shutil
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+SUMMARY_FILE = "summary.npz"
+SUMMARY_COLUMNS = ("algorithm", "frames", "total_accesses", "total_faults", "total_hits", "fault_rate")
+_SUMMARY_DTYPES = (str, np.int64, np.int64, np.int64, np.int64, np.float64)
+
+
+def _summary_column(values: List[Any]) -> np.ndarray:
+    """One extra summary column; rows that lack it get NaN (numbers) or None."""
+    if all(v is not None for v in values):
+        return np.array(values)
+    if all(v is None or isinstance(v, (int, float, np.number)) for v in values):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    return np.array(values, dtype=object)
+
+
+class ResultStore:
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    # ---------------- Layout ----------------
+    def partition_dir(self, algorithm: str, frames: int) -> str:
+        return os.path.join(self.root, f"algorithm={quote(algorithm, safe='')}", f"frames={int(frames)}")
+
+    def partitions(self, algorithm: Optional[str] = None, frames: Optional[int] = None) -> List[Tuple[str, int]]:
+        """(algorithm, frames) pairs present in the store, optionally filtered."""
+        found = []
+        for alg_dir in sorted(os.listdir(self.root)):
+            if not alg_dir.startswith("algorithm="):
+                continue
+            alg = unquote(alg_dir[len("algorithm="):])
+            if algorithm is not None and alg != algorithm:
+                continue
+            for fr_dir in os.listdir(os.path.join(self.root, alg_dir)):
+                if fr_dir.startswith("frames="):
+                    nf = int(fr_dir[len("frames="):])
+                    if frames is None or nf == frames:
+                        found.append((alg, nf))
+        return sorted(found)
+
+    def _log_parts(self, algorithm: str, frames: int) -> List[str]:
+        path = self.partition_dir(algorithm, frames)
+        if not os.path.isdir(path):
+            return []
+        return [os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.startswith("log-") and name.endswith(".npz")]
+
+    # ---------------- Writing ----------------
+    def clear(self):
+        """Remove every partition (summaries and logs), e.g. before a new batch."""
+        for name in os.listdir(self.root):
+            if name.startswith("algorithm="):
+                shutil.rmtree(os.path.join(self.root, name))
+
+    def write_summary(self, row: Dict[str, Any]):
+        """One summary row (algorithm, frames and scalar columns) into its partition."""
+        path = self.partition_dir(row["algorithm"], row["frames"])
+        os.makedirs(path, exist_ok=True)
+        columns = {}
+        for name, value in row.items():
+            if name in ("algorithm", "frames"):
+                continue
+            if value is None:
+                columns[name] = np.float64(np.nan)
+            elif isinstance(value, (bool, int, float, str, np.generic)):
+                columns[name] = np.asarray(value)
+        np.savez(os.path.join(path, SUMMARY_FILE), **columns)
+
+    def write_log(self, algorithm: str, frames: int, batches: Iterable[Dict[str, np.ndarray]]) -> int:
+        """Write column batches as log-NNNNN.npz parts (replacing any old log); returns rows written."""
+        path = self.partition_dir(algorithm, frames)
+        os.makedirs(path, exist_ok=True)
+        for old in self._log_parts(algorithm, frames):
+            os.remove(old)
+        rows = 0
+        for part, columns in enumerate(batches):
+            np.savez_compressed(os.path.join(path, f"log-{part:05d}.npz"), **columns)
+            rows += len(columns["step"])
+        return rows
+
+    def write_run(self, sim, batch_rows: int = 1 << 16) -> Dict[str, Any]:
+        """Summary and (unless history='none') per-step log of a finished PagingSimulation."""
+        row = dict(sim.summary(), algorithm=sim.algorithm, frames=sim.n_frames)
+        self.write_summary(row)
+        if sim.history_mode != "none":
+            self.write_log(sim.algorithm, sim.n_frames, sim.iter_log_columns(batch_rows))
+        return row
+
+    # ---------------- Reading ----------------
+    def summary(self, algorithm: Optional[str] = None, frames: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Summary rows of the matching partitions as typed columns (SUMMARY_COLUMNS first)."""
+        rows = []
+        for alg, nf in self.partitions(algorithm, frames):
+            path = os.path.join(self.partition_dir(alg, nf), SUMMARY_FILE)
+            if os.path.exists(path):
+                with np.load(path) as z:
+                    rows.append(dict({name: z[name].item() for name in z.files}, algorithm=alg, frames=nf))
+        columns = {name: np.array([r[name] for r in rows], dtype=dtype)
+                   for name, dtype in zip(SUMMARY_COLUMNS, _SUMMARY_DTYPES)}
+        for name in dict.fromkeys(key for r in rows for key in r):
+            if name not in columns:
+                columns[name] = _summary_column([r.get(name) for r in rows])
+        return columns
+
+    def scan_log(self, algorithm: Optional[str] = None, frames: Optional[int] = None,
+                 columns: Optional[List[str]] = None) -> Iterator[Tuple[str, int, Dict[str, np.ndarray]]]:
+        """Yield (algorithm, frames, batch) for every log part of the matching partitions."""
+        for alg, nf in self.partitions(algorithm, frames):
+            for part in self._log_parts(alg, nf):
+                with np.load(part) as z:
+                    names = z.files if columns is None else columns
+                    yield alg, nf, {name: z[name] for name in names}
+
+    def read_log(self, algorithm: str, frames: int, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """Whole log of one partition (the requested columns only)."""
+        batches = [batch for _, _, batch in self.scan_log(algorithm, frames, columns)]
+        if not batches:
+            raise KeyError(f"No log stored for {algorithm} with {frames} frames")
+        return {name: np.concatenate([b[name] for b in batches]) for name in batches[0]}
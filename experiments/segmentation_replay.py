@@ -0,0 +1,214 @@
+"""
+experiments/segmentation_replay.py
+Replay bulk alloc/free traces against SegmentationMemory and compare the
+placement policies: throughput, per-operation latency percentiles and
+fragmentation over time.  With compaction strategies (core/compaction.py)
+it also weighs bytes moved against fragmentation and failed allocations.
+
+Trace file format: one operation per line, '#' starts a comment
+    A <name> <size>     allocate
+    F <name>            free
+
+Usage:
+    python -m experiments.segmentation_replay --generator lifetime --ops 1000000 --memory 10000000
+    python -m experiments.segmentation_replay --trace ops.txt --json results.json
+    python -m experiments.segmentation_replay --policy first --compaction none --compaction auto \
+        --compaction full --compact-threshold 0.8
+"""
+
+import argparse
+import heapq
+import json
+import math
+import random
+import time
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from core.compaction import STRATEGIES
+from core.segmentation_core import SegmentationMemory
+
+Op = Tuple[str, str, int]
+
+
+# ---------------- Trace files ----------------
+def read_ops(path: str) -> Iterator[Op]:
+    with open(path) as f:
+        yield from parse_ops(f)
+
+
+def parse_ops(lines: Iterable[str]) -> Iterator[Op]:
+    """Operations from lines of the trace format (e.g. an open file or sys.stdin)."""
+    for line in lines:
+        parts = line.split("#", 1)[0].split()
+        if not parts:
+            continue
+        if parts[0] == "A":
+            yield ("A", parts[1], int(parts[2]))
+        elif parts[0] == "F":
+            yield ("F", parts[1], 0)
+        else:
+            raise ValueError(f"Bad operation line: {line.strip()}")
+
+
+def write_ops(path: str, ops: Iterable[Op]) -> int:
+    count = 0
+    with open(path, "w") as f:
+        for kind, name, size in ops:
+            f.write(f"A {name} {size}\n" if kind == "A" else f"F {name}\n")
+            count += 1
+    return count
+
+
+# ---------------- Synthetic workloads ----------------
+def uniform_churn(n_ops: int, seed: int = 0, min_size: int = 16, max_size: int = 4096,
+                  free_prob: float = 0.45) -> Iterator[Op]:
+    """Uniform sizes; each step frees a random live segment with probability free_prob."""
+    rng = random.Random(seed)
+    live: List[str] = []
+    for i in range(n_ops):
+        if live and rng.random() < free_prob:
+            j = rng.randrange(len(live))
+            live[j], live[-1] = live[-1], live[j]
+            yield ("F", live.pop(), 0)
+        else:
+            name = f"s{i}"
+            live.append(name)
+            yield ("A", name, rng.randint(min_size, max_size))
+
+
+def lifetime_churn(n_ops: int, seed: int = 0, mean_lifetime: float = 1000.0,
+                   mean_size: float = 256.0, max_size: int = 1 << 16) -> Iterator[Op]:
+    """
+    Log-normal sizes and exponential lifetimes (in operations): many small
+    short-lived segments and a tail of large long-lived ones.
+    """
+    rng = random.Random(seed)
+    mu = math.log(mean_size) - 0.5
+    deaths: List[Tuple[int, str]] = []     # heap of (op index due, name)
+    for i in range(n_ops):
+        if deaths and deaths[0][0] <= i:
+            yield ("F", heapq.heappop(deaths)[1], 0)
+            continue
+        name = f"s{i}"
+        size = min(max_size, max(1, int(rng.lognormvariate(mu, 1.0))))
+        heapq.heappush(deaths, (i + 1 + int(rng.expovariate(1.0 / mean_lifetime)), name))
+        yield ("A", name, size)
+
+
+GENERATORS = {
+    "uniform": uniform_churn,
+    "lifetime": lifetime_churn,
+}
+
+
+# ---------------- Replay ----------------
+def _percentile(sorted_values, q: float) -> int:
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def replay(ops: Iterable[Op], total_size: int, policy: str = "first", sample_every: int = 1000,
+           compaction: Optional[str] = None, compact_threshold: Optional[float] = None) -> Dict:
+    """
+    Run ops against a fresh SegmentationMemory.  Every operation is timed
+    (including any compaction it triggers); fragmentation() is O(log n) on
+    the allocator's indexes and is sampled every sample_every operations.
+    """
+    mgr = SegmentationMemory(total_size, policy=policy, compaction=compaction,
+                             compact_threshold=compact_threshold)
+    allocate, free = mgr.allocate, mgr.free
+    clock = time.perf_counter_ns
+    latencies = array("q")
+    record = latencies.append
+    samples = []
+    allocs = frees = failed = 0
+    start = time.perf_counter()
+    for n, (kind, name, size) in enumerate(ops, 1):
+        if kind == "A":
+            t0 = clock()
+            seg = allocate(name, size)
+            record(clock() - t0)
+            allocs += 1
+            if seg is None:
+                failed += 1
+        else:
+            t0 = clock()
+            free(name)
+            record(clock() - t0)
+            frees += 1
+        if n % sample_every == 0:
+            frag = mgr.fragmentation()
+            samples.append({"op": n, "external_fragmentation": frag["external_fragmentation"],
+                            "holes": frag["holes"], "total_free": frag["total_free"],
+                            "bytes_moved": mgr.bytes_moved})
+    elapsed = time.perf_counter() - start
+    ordered = sorted(latencies)
+    n_ops = len(ordered)
+    return {
+        "policy": policy,
+        "compaction": compaction,
+        "compact_threshold": compact_threshold,
+        "ops": n_ops,
+        "allocs": allocs,
+        "frees": frees,
+        "failed_allocs": failed,
+        "seconds": elapsed,
+        "ops_per_sec": n_ops / elapsed if elapsed else 0.0,
+        "p50_ns": _percentile(ordered, 0.50),
+        "p99_ns": _percentile(ordered, 0.99),
+        "max_ns": ordered[-1] if ordered else 0,
+        "compactions": mgr.compactions,
+        "bytes_moved": mgr.bytes_moved,
+        "bytes_moved_per_op": mgr.bytes_moved / n_ops if n_ops else 0.0,
+        "final_fragmentation": mgr.fragmentation(),
+        "fragmentation_samples": samples,
+    }
+
+
+def compare_policies(ops: Iterable[Op], total_size: int, policies=SegmentationMemory.POLICIES,
+                     sample_every: int = 1000, compactions: Sequence[Optional[str]] = (None,),
+                     compact_threshold: Optional[float] = None) -> List[Dict]:
+    """
+    Replay the same operations under each policy and compaction strategy
+    (None = never compact); ops are materialized once.
+    """
+    ops = list(ops)
+    return [replay(ops, total_size, policy, sample_every, compaction, compact_threshold)
+            for policy in policies for compaction in compactions]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Segmentation allocator replay benchmark")
+    src = parser.add_mutually_exclusive_group()
+    src.add_argument("--trace", help="operation trace file (A name size / F name)")
+    src.add_argument("--generator", choices=sorted(GENERATORS), default="lifetime")
+    parser.add_argument("--ops", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory", type=int, default=1 << 24)
+    parser.add_argument("--policy", action="append", choices=SegmentationMemory.POLICIES)
+    parser.add_argument("--compaction", action="append", choices=("none",) + STRATEGIES,
+                        help="compact on allocation failure with this strategy (repeat to compare)")
+    parser.add_argument("--compact-threshold", type=float,
+                        help="also fully compact when external fragmentation exceeds this after a free")
+    parser.add_argument("--sample-every", type=int, default=1000)
+    parser.add_argument("--json", help="write full results (incl. fragmentation samples) here")
+    args = parser.parse_args(argv)
+
+    ops = read_ops(args.trace) if args.trace else GENERATORS[args.generator](args.ops, seed=args.seed)
+    compactions = [None if c == "none" else c for c in args.compaction or ["none"]]
+    results = compare_policies(ops, args.memory, args.policy or SegmentationMemory.POLICIES, args.sample_every,
+                               compactions, args.compact_threshold)
+    for r in results:
+        print(f"{r['policy']:>6} {r['compaction'] or '-':>5}: {r['ops_per_sec']:>12,.0f} ops/s  "
+              f"p50={r['p50_ns']}ns  p99={r['p99_ns']}ns  failed={r['failed_allocs']}  "
+              f"frag={r['final_fragmentation']['external_fragmentation']:.3f}  "
+              f"compactions={r['compactions']}  moved={r['bytes_moved']:,}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,12 @@ import sys, os
 # Add parent directory for imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from core.paging_core import PagingSimulation
+from core.compaction import STRATEGIES as COMPACTION_STRATEGIES
+from core.policies import available_policies, get_policy
 from core.segmentation_core import SegmentationSimulation
-from visualization.visualizer import plot_paging, plot_segmentation
+from core.trace_io import trace_from_bytes
+from service.client import run_paging
+from visualization.visualizer import TABLE_MAX_STEPS, plot_paging, plot_paging_heatmap, plot_segmentation
 
 # ==========================
 # 🌈 Streamlit Page Config
@@ -49,35 +52,62 @@ if option == "Paging Simulation":
     with st.container():
         st.markdown("<div class='result-card'>", unsafe_allow_html=True)
         pages_input = st.text_input("Enter page reference string (comma separated):", "1,2,3,4,2,1,5,1,2,3,4,5")
+        trace_file = st.file_uploader("...or upload a trace file (text or binary .bin):", type=["txt", "bin", "vmt"])
         frames = st.number_input("Enter number of frames:", 1, 10, 3)
 
-        # UPDATED DROPDOWN WITH 4 ALGORITHMS
+        # every policy registered in core/policies.py
         algo = st.selectbox(
             "Select Page Replacement Algorithm:",
-            ["LRU", "Optimal", "FIFO", "Second Chance"]
+            [spec.label for spec in available_policies()]
         )
+        st.caption(get_policy(algo).description)
+        collect_metrics = st.checkbox("Collect metrics (fault rate over time, eviction ages, clock scans)")
 
         st.markdown("</div>", unsafe_allow_html=True)
 
     if st.button("▶️ Run Paging Simulation"):
-        pages = [int(x.strip()) for x in pages_input.split(",")]
-        sim = PagingSimulation(reference_string=pages, n_frames=frames, algorithm=algo)
-
-        # UPDATED ALGORITHM PROCESSING
-        if algo == "LRU":
-            faults, history = sim.simulate_LRU()
-        elif algo == "Optimal":
-            faults, history = sim.simulate_Optimal()
-        elif algo == "FIFO":
-            faults, history = sim.simulate_FIFO()
-        else:  # Second Chance
-            faults, history = sim.simulate_SecondChance()
+        if trace_file is not None:
+            pages = trace_from_bytes(trace_file.getvalue())
+            if iter(pages) is pages:
+                pages = list(pages)
+        else:
+            pages = [int(x.strip()) for x in pages_input.split(",")]
+        # runs on the simulation service when one is up (python -m service.server), else here;
+        # kept across reruns so the zoom slider below can redraw the result
+        bar = st.progress(0.0, text="Queued...")
+        st.session_state["paging_run"] = (algo, run_paging(
+            pages, frames, algo, metrics=collect_metrics, metrics_window=max(10, len(pages) // 200),
+            on_progress=lambda e: bar.progress(e["progress"], text=f"{e['status']}: "
+                                               f"{e['partial'].get('page_faults', 0)} faults so far")))
+        bar.empty()
+
+    if "paging_run" in st.session_state:
+        run_algo, run = st.session_state["paging_run"]
+        history = run["history"]
 
         st.markdown("<div class='result-card'>", unsafe_allow_html=True)
         st.subheader("📊 Simulation Results")
-        st.write(f"**Total Page Faults:** {faults}")
-        fig = plot_paging(history, f"Paging Simulation ({algo})")
+        st.write(f"**Total Page Faults:** {run['summary']['total_faults']}")
+        st.caption("Ran on the simulation service" if run["remote"] else "Ran locally (no simulation service found)")
+        n_steps = len(history)
+        if n_steps <= TABLE_MAX_STEPS:
+            fig = plot_paging(history, f"Paging Simulation ({run_algo})")
+        else:
+            st.pyplot(plot_paging_heatmap(history, f"Overview ({run_algo})"))
+            start, stop = st.slider("Zoom to steps:", 0, n_steps, (0, min(n_steps, 200)))
+            fig = plot_paging_heatmap(history, f"Paging Simulation ({run_algo})", start, max(stop, start + 1))
         st.pyplot(fig)
+        if run["metrics"] is not None:
+            report = run["metrics"]
+            st.subheader("📈 Metrics")
+            st.json(run["summary"])
+            st.caption(f"Fault rate per window of {report['window']} steps")
+            st.line_chart(report["window_fault_rates"])
+            st.caption("Eviction age (steps resident before eviction)")
+            st.bar_chart(report["eviction_age_histogram"])
+            if report["scan_length_histogram"]:
+                st.caption("Pages skipped by the clock hand per fault")
+                st.bar_chart(report["scan_length_histogram"])
         st.markdown("</div>", unsafe_allow_html=True)
 
 
@@ -97,8 +127,9 @@ else:
         st.markdown("<div class='result-card'>", unsafe_allow_html=True)
         name = st.text_input("Segment Name")
         size = st.number_input("Segment Size", 1, total_memory)
+        policy = st.selectbox("Placement Policy", ["first", "best", "worst"])
         if st.button("🟢 Allocate Segment"):
-            st.success(st.session_state["segments"].allocate(name, size))
+            st.success(st.session_state["segments"].allocate(name, size, policy=policy))
         st.markdown("</div>", unsafe_allow_html=True)
 
     with col2:
@@ -108,11 +139,29 @@ else:
             st.warning(st.session_state["segments"].deallocate(name_del))
         st.markdown("</div>", unsafe_allow_html=True)
 
-    segs = st.session_state["segments"].segments
+    seg_sim = st.session_state["segments"]
+    st.markdown("<div class='result-card'>", unsafe_allow_html=True)
+    strategy = st.selectbox("Compaction Strategy", list(COMPACTION_STRATEGIES),
+                            help="auto picks the plan that moves the fewest bytes")
+    seg_sim.memory.compaction = strategy if st.checkbox("Compact automatically when an allocation fails") else None
+    if st.button("🧹 Compact Memory"):
+        before = [dict(seg) for seg in seg_sim.segments]
+        st.info(seg_sim.compact(strategy))
+        if seg_sim.memory.last_plan is not None:
+            st.session_state["compaction_view"] = (before, seg_sim.memory.last_plan)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    segs = seg_sim.segments
     if segs:
         st.markdown("<div class='result-card'>", unsafe_allow_html=True)
         st.subheader("🧩 Segmentation Memory Layout")
-        fig = plot_segmentation(segs, total_memory)
+        view = st.session_state.get("compaction_view")
+        if view is not None and view[1] is seg_sim.memory.last_plan:
+            before, plan = view
+            fig = plot_segmentation(segs, total_memory, before=before, relocation=plan["relocation"])
+            st.caption(f"Last compaction ({plan['strategy']}) moved {plan['bytes_moved']} bytes")
+        else:
+            fig = plot_segmentation(segs, total_memory)
         st.pyplot(fig)
         st.markdown("</div>", unsafe_allow_html=True)
 
@@ -1,19 +1,26 @@
 """
 run_demo.py
 Small CLI to run demo paging and segmentation scenarios.
+Usage: python run_demo.py [trace_file]   (text, .csv or binary .bin trace)
 """
 
+import sys
+
 from core.paging_core import PagingSimulation
+from core.result_cache import cached_run
 from core.segmentation_core import SegmentationMemory
+from core.trace_io import open_trace
 
-def demo_paging():
-    refs = [7,0,1,2,0,3,0,4,2,3,0,3]
+def demo_paging(refs=None):
+    if refs is None:
+        refs = [7,0,1,2,0,3,0,4,2,3,0,3]
     for alg in ("LRU","OPTIMAL"):
         sim = PagingSimulation(n_frames=3, algorithm=alg, reference_string=refs)
-        sim.run_all()
+        cached_run(sim)
         print(f"=== {alg} Summary ===")
         print(sim.summary())
-        print(sim.get_log().to_string(index=False))
+        if sim.total_accesses <= 100:
+            print(sim.get_log().to_string(index=False))
         print()
 
 def demo_segmentation():
@@ -28,5 +35,5 @@ def demo_segmentation():
     print("Fragmentation:", mgr.fragmentation())
 
 if __name__ == "__main__":
-    demo_paging()
+    demo_paging(open_trace(sys.argv[1]) if len(sys.argv) > 1 else None)
     demo_segmentation()
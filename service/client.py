@@ -0,0 +1,138 @@
+"""
+service/client.py
+Blocking client for service/server.py (stdlib http.client only).
+
+    client = ServiceClient()                       # VMSIM_SERVICE_URL or http://127.0.0.1:8765
+    job = client.submit({"kind": "paging", "trace": [1, 2, 3, 1], "n_frames": 2})
+    for event in client.events(job["id"]):
+        print(event["progress"], event["partial"])
+    result = client.result(job["id"])
+
+run_paging() is what the GUI uses: it goes through the service when one
+is running and falls back to a local cached run otherwise, returning the
+same shape either way.
+"""
+
+import http.client
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from service.server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class ServiceError(Exception):
+    """The service refused a request or a job failed."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def default_url() -> str:
+    return os.environ.get("VMSIM_SERVICE_URL", f"http://{DEFAULT_HOST}:{DEFAULT_PORT}")
+
+
+class ServiceClient:
+    def __init__(self, url: Optional[str] = None, timeout: float = 30.0):
+        parts = urlsplit(url or default_url())
+        self.host = parts.hostname or DEFAULT_HOST
+        self.port = parts.port or DEFAULT_PORT
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, payload: Any = None, stream: bool = False):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        body = None if payload is None else json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        conn.request(method, path, body=body, headers=headers)
+        sock = conn.sock        # getresponse() detaches it when the server closes after the reply
+        resp = conn.getresponse()
+        if stream and resp.status == 200:
+            # the server sends at least a keepalive line every stream_interval; a long
+            # queue or run must not trip the socket timeout meant for the request itself
+            sock.settimeout(None)
+            return conn, resp
+        try:
+            data = json.loads(resp.read() or b"null")
+        finally:
+            conn.close()
+        if resp.status >= 400:
+            raise ServiceError(data.get("error", resp.reason) if isinstance(data, dict) else resp.reason,
+                               resp.status)
+        return data
+
+    def available(self) -> bool:
+        try:
+            return self.health().get("status") == "ok"
+        except (OSError, ServiceError, ValueError):
+            return False
+
+    def health(self) -> Dict[str, Any]:
+        return self._request("GET", "/health")
+
+    def submit(self, spec: Dict[str, Any], retries: int = 0, backoff: float = 1.0) -> Dict[str, Any]:
+        """POST a job; when the queue is full (503) retry up to `retries` times."""
+        for attempt in range(retries + 1):
+            try:
+                return self._request("POST", "/jobs", spec)
+            except ServiceError as exc:
+                if exc.status != 503 or attempt == retries:
+                    raise
+            time.sleep(backoff)
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def events(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        """Status updates as the job progresses; the last one has the result (or error)."""
+        conn, resp = self._request("GET", f"/jobs/{job_id}/events", stream=True)
+        try:
+            for line in resp:
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            conn.close()
+
+    def result(self, job_id: str, on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Any:
+        """Wait for the job (following its event stream) and return its result."""
+        event = None
+        for event in self.events(job_id):
+            if on_progress is not None:
+                on_progress(event)
+        if event is None or event["status"] != "done":
+            raise ServiceError(f"Job {job_id} failed: {event and event['error']}")
+        return event["result"]
+
+
+def run_paging(trace, n_frames: int, algorithm: str, history: str = "events", metrics: bool = False,
+               metrics_window: int = 1000, client: Optional[ServiceClient] = None,
+               on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+               cache: Optional["ResultCache"] = None) -> Dict[str, Any]:
+    """
+    {"summary", "history" (EventHistory or None), "metrics" (to_dict() or None),
+    "remote"} for one paging run, through the service if it is up, else locally
+    through the result cache (cache, or default_cache() when None).
+    """
+    from core.history import EventHistory
+
+    client = client or ServiceClient()
+    if client.available():
+        spec = {"kind": "paging", "trace": list(trace), "n_frames": int(n_frames), "algorithm": algorithm,
+                "history": history, "metrics": metrics, "metrics_window": int(metrics_window)}
+        job = client.submit(spec, retries=10)
+        result = client.result(job["id"], on_progress)
+        events = result["history"]
+        return {"summary": result["summary"], "remote": True, "metrics": result["metrics"],
+                "history": EventHistory.from_dict(events) if events is not None else None}
+
+    from core.paging_core import PagingSimulation
+    from core.result_cache import cached_run
+
+    sim = PagingSimulation(reference_string=trace, n_frames=n_frames, algorithm=algorithm, history=history,
+                           metrics=metrics, metrics_window=metrics_window)
+    cached_run(sim, cache)
+    return {"summary": sim.summary(), "remote": False,
+            "metrics": sim.metrics.to_dict() if sim.metrics is not None else None,
+            "history": sim.history if history == "events" else None}
@@ -0,0 +1,171 @@
+"""
+service/jobs.py
+Job specs and the functions that run them inside the worker processes.
+
+A job spec is a JSON object:
+    {"kind": "paging", "trace": [pages], "n_frames": 3, "algorithm": "LRU",
+     "history": "none" | "events", "metrics": false, "metrics_window": 1000}
+    {"kind": "segmentation", "ops": [["A", name, size], ["F", name], ...],
+     "total_size": 1024, "policy": "first", "compaction": null,
+     "compact_threshold": null}
+
+normalize() validates a spec and fills in defaults; job_key() is the
+deduplication key (for paging the same key as core/result_cache.py).
+
+run_job() feeds the work in chunks of `chunk` references / operations and
+after each chunk puts (job id, processed, partial counts) on the progress
+queue the pool was started with (see init_worker), so the server can
+stream progress while the job runs.  Optimal needs the whole trace and
+reports only when done.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from core.compaction import STRATEGIES
+from core.history import HISTORY_MODES
+from core.paging_core import PagingSimulation
+from core.policies import get_policy
+from core.result_cache import cache_key, trace_digest
+from core.segmentation_core import SegmentationMemory
+
+KINDS = ("paging", "segmentation")
+CHUNK = 1 << 16
+
+_progress = None        # multiprocessing queue, set in each worker by init_worker
+
+
+def _positive_int(spec: Dict[str, Any], field: str, default: Optional[int] = None) -> int:
+    value = spec.get(field, default)
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        raise ValueError(f"{field} must be a positive integer, got {value!r}")
+    return value
+
+
+def normalize(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Validated copy of a job spec with defaults filled in; ValueError if malformed."""
+    if not isinstance(spec, dict):
+        raise ValueError("A job spec must be a JSON object")
+    kind = spec.get("kind")
+    if kind == "paging":
+        trace = spec.get("trace")
+        if not isinstance(trace, list) or not all(isinstance(p, (int, str)) for p in trace):
+            raise ValueError("trace must be a list of page numbers")
+        history = spec.get("history", "none")
+        if history not in HISTORY_MODES or history == "full":
+            raise ValueError(f"history must be 'none' or 'events', got {history!r}")
+        return {
+            "kind": kind,
+            "trace": trace,
+            "n_frames": _positive_int(spec, "n_frames", 3),
+            "algorithm": get_policy(str(spec.get("algorithm", "LRU"))).name,
+            "history": history,
+            "metrics": bool(spec.get("metrics", False)),
+            "metrics_window": _positive_int(spec, "metrics_window", 1000),
+            "chunk": _positive_int(spec, "chunk", CHUNK),
+        }
+    if kind == "segmentation":
+        ops = spec.get("ops")
+        if not isinstance(ops, list):
+            raise ValueError("ops must be a list of operations")
+        normalized = []
+        for op in ops:
+            if isinstance(op, list) and len(op) == 3 and op[0] == "A" and isinstance(op[2], int):
+                normalized.append(("A", str(op[1]), op[2]))
+            elif isinstance(op, list) and len(op) >= 2 and op[0] == "F":
+                normalized.append(("F", str(op[1]), 0))
+            else:
+                raise ValueError(f"Bad operation: {op!r} (expected ['A', name, size] or ['F', name])")
+        policy = spec.get("policy", "first")
+        if policy not in SegmentationMemory.POLICIES:
+            raise ValueError(f"Unknown placement policy: {policy}")
+        compaction = spec.get("compaction")
+        if compaction is not None and compaction not in STRATEGIES:
+            raise ValueError(f"Unknown compaction strategy: {compaction}")
+        threshold = spec.get("compact_threshold")
+        if threshold is not None and not isinstance(threshold, (int, float)):
+            raise ValueError(f"compact_threshold must be a number, got {threshold!r}")
+        return {
+            "kind": kind,
+            "ops": normalized,
+            "total_size": _positive_int(spec, "total_size"),
+            "policy": policy,
+            "compaction": compaction,
+            "compact_threshold": threshold,
+            "chunk": _positive_int(spec, "chunk", CHUNK),
+        }
+    raise ValueError(f"Unknown job kind: {kind!r} (expected one of {KINDS})")
+
+
+def job_key(spec: Dict[str, Any]) -> str:
+    """Deduplication key of a normalized spec (chunk size does not change results)."""
+    if spec["kind"] == "paging":
+        mode = spec["history"]
+        if spec["metrics"]:
+            mode += f"+metrics/{spec['metrics_window']}"
+        return cache_key(trace_digest(spec["trace"]), spec["algorithm"], spec["n_frames"], mode)
+    fields = {k: v for k, v in spec.items() if k != "chunk"}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+
+
+def job_size(spec: Dict[str, Any]) -> int:
+    """References or operations in the job (the denominator of its progress)."""
+    return len(spec["trace"] if spec["kind"] == "paging" else spec["ops"])
+
+
+# ---------------- Worker side ----------------
+def init_worker(progress_queue):
+    global _progress
+    _progress = progress_queue
+
+
+def _report(job_id: str, processed: int, partial: Dict[str, Any]):
+    if _progress is not None:
+        _progress.put((job_id, processed, partial))
+
+
+def run_job(job_id: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+    if spec["kind"] == "paging":
+        return _run_paging(job_id, spec)
+    return _run_segmentation(job_id, spec)
+
+
+def _run_paging(job_id: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+    trace, chunk = spec["trace"], spec["chunk"]
+    sim = PagingSimulation([], n_frames=spec["n_frames"], algorithm=spec["algorithm"], history=spec["history"],
+                           metrics=spec["metrics"], metrics_window=spec["metrics_window"])
+    if spec["algorithm"] == "OPTIMAL":
+        sim.reference_string = trace
+        sim.run_all()
+    else:
+        for start in range(0, len(trace), chunk):
+            sim.feed(trace[start:start + chunk])
+            _report(job_id, sim.total_accesses, {"page_faults": sim.page_faults})
+    return {
+        "summary": sim.summary(),
+        "frames": list(sim.frames),
+        "history": sim.history.to_dict() if spec["history"] == "events" else None,
+        "metrics": sim.metrics.to_dict() if sim.metrics is not None else None,
+    }
+
+
+def _segmentation_counts(mgr: SegmentationMemory, failed: int) -> Dict[str, Any]:
+    return {"failed_allocs": failed, "compactions": mgr.compactions, "bytes_moved": mgr.bytes_moved}
+
+
+def _run_segmentation(job_id: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+    mgr = SegmentationMemory(spec["total_size"], policy=spec["policy"], compaction=spec["compaction"],
+                             compact_threshold=spec["compact_threshold"])
+    ops, chunk = spec["ops"], spec["chunk"]
+    failed = 0
+    for start in range(0, len(ops), chunk):
+        for kind, name, size in ops[start:start + chunk]:
+            if kind == "A":
+                if mgr.allocate(name, size) is None:
+                    failed += 1
+            else:
+                mgr.free(name)
+        _report(job_id, min(start + chunk, len(ops)), _segmentation_counts(mgr, failed))
+    return dict(_segmentation_counts(mgr, failed), ops=len(ops), segments=mgr.get_segments(),
+                fragmentation=mgr.fragmentation())
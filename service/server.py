@@ -0,0 +1,331 @@
+"""
+service/server.py
+Local simulation service: HTTP/JSON over asyncio, jobs run on a process pool.
+
+    python -m service.server --port 8765 --workers 4 --max-queue 64
+
+Endpoints:
+    GET  /health             workers, queued and running jobs
+    POST /jobs               submit a job spec (see service/jobs.py)
+                             202 {"id", "key", "status", "deduplicated"};
+                             400 for a bad spec, 503 + Retry-After when full
+    GET  /jobs/<id>          status, progress, partial counts, result or error
+    GET  /jobs/<id>/events   NDJSON stream of status updates until the job ends
+                             (repeated every stream_interval seconds meanwhile)
+
+Jobs wait in a bounded queue (backpressure: submissions beyond max_queue
+are refused, not buffered) and `workers` dispatchers move them onto the
+pool, one each.  A job whose key (service/jobs.py job_key) matches a job
+still queued, running or recently done is not run again: the caller gets
+that job's id.  Workers report progress through a multiprocessing queue
+that a thread drains into the event loop.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from service.jobs import init_worker, job_key, job_size, normalize, run_job
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY = 256 << 20
+FINISHED = ("done", "failed")
+
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 413: "Payload Too Large", 503: "Service Unavailable"}
+
+
+class ServiceBusy(Exception):
+    """The job queue is full."""
+
+
+class SimulationServer:
+    """
+    Job table, bounded queue and process pool behind the HTTP front end.
+    Jobs are dicts; everything but the spec is reported by GET /jobs/<id>.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: Optional[int] = None,
+                 max_queue: int = 64, keep_finished: int = 256, stream_interval: float = 5.0):
+        self.host = host
+        self.port = port
+        self.workers = int(workers or os.cpu_count() or 1)
+        self.max_queue = int(max_queue)
+        self.keep_finished = int(keep_finished)
+        self.stream_interval = float(stream_interval)
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._by_key: Dict[str, str] = {}
+        self._finished: OrderedDict = OrderedDict()      # job id -> None, oldest first
+        self._changed: Dict[str, asyncio.Condition] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._ids = itertools.count(1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._progress = None
+        self._drainer: Optional[threading.Thread] = None
+        self._dispatchers = []
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ---------------- Lifecycle ----------------
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        ctx = multiprocessing.get_context()
+        self._progress = ctx.Queue()
+        self._pool = ProcessPoolExecutor(self.workers, mp_context=ctx, initializer=init_worker,
+                                         initargs=(self._progress,))
+        self._drainer = threading.Thread(target=self._drain, daemon=True)
+        self._drainer.start()
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+        if self._progress is not None:
+            self._progress.put(None)
+            self._drainer.join()
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"vmsim service on http://{self.host}:{self.port} ({self.workers} workers)")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    # ---------------- Jobs ----------------
+    def _job_queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.max_queue)
+        return self._queue
+
+    def submit(self, spec: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Queue a job (must run on the event loop).  Returns (job, deduplicated);
+        ValueError for a bad spec, ServiceBusy when the queue is full.
+        """
+        spec = normalize(spec)
+        key = job_key(spec)
+        existing = self.jobs.get(self._by_key.get(key, ""))
+        if existing is not None and existing["status"] != "failed":
+            existing["requests"] += 1
+            return existing, True
+        queue = self._job_queue()
+        if queue.full():
+            raise ServiceBusy(f"{queue.qsize()} jobs queued")
+        job_id = f"j{next(self._ids)}"
+        job = {"id": job_id, "key": key, "kind": spec["kind"], "status": "queued", "requests": 1,
+               "submitted": time.time(), "started": None, "finished": None,
+               "total": job_size(spec), "processed": 0, "progress": 0.0, "partial": {},
+               "result": None, "error": None, "spec": spec}
+        self.jobs[job_id] = job
+        self._by_key[key] = job_id
+        self._changed[job_id] = asyncio.Condition()
+        queue.put_nowait(job_id)
+        return job, False
+
+    async def _dispatch(self):
+        queue = self._job_queue()
+        while True:
+            job_id = await queue.get()
+            job = self.jobs[job_id]
+            job["status"] = "running"
+            job["started"] = time.time()
+            await self._notify(job_id)
+            try:
+                result = await self._loop.run_in_executor(self._pool, run_job, job_id, job["spec"])
+            except Exception as exc:       # includes a worker dying (BrokenProcessPool)
+                job.update(status="failed", error=f"{type(exc).__name__}: {exc}")
+            else:
+                job.update(status="done", result=result, processed=job["total"], progress=1.0)
+            job["finished"] = time.time()
+            job["spec"] = None
+            self._retire(job_id)
+            await self._notify(job_id)
+            queue.task_done()
+
+    def _retire(self, job_id: str):
+        """Keep the last keep_finished jobs for GET /jobs/<id> and deduplication."""
+        self._finished[job_id] = None
+        while len(self._finished) > self.keep_finished:
+            old_id, _ = self._finished.popitem(last=False)
+            old = self.jobs.pop(old_id)
+            self._changed.pop(old_id, None)
+            if self._by_key.get(old["key"]) == old_id:
+                del self._by_key[old["key"]]
+
+    def _drain(self):
+        # progress thread: worker messages -> event loop
+        while True:
+            message = self._progress.get()
+            if message is None:
+                return
+            self._loop.call_soon_threadsafe(self._on_progress, *message)
+
+    def _on_progress(self, job_id: str, processed: int, partial: Dict[str, Any]):
+        job = self.jobs.get(job_id)
+        if job is None or job["status"] != "running":
+            return
+        job.update(processed=processed, partial=partial,
+                   progress=processed / job["total"] if job["total"] else 1.0)
+        asyncio.ensure_future(self._notify(job_id))
+
+    async def _notify(self, job_id: str):
+        changed = self._changed.get(job_id)
+        if changed is not None:
+            async with changed:
+                changed.notify_all()
+
+    def status(self, job: Dict[str, Any], with_result: bool = True) -> Dict[str, Any]:
+        view = {k: v for k, v in job.items() if k not in ("spec", "result")}
+        if with_result:
+            view["result"] = job["result"]
+        return view
+
+    def health(self) -> Dict[str, Any]:
+        running = sum(1 for job in self.jobs.values() if job["status"] == "running")
+        return {"status": "ok", "workers": self.workers, "max_queue": self.max_queue,
+                "queued": self._job_queue().qsize(), "running": running}
+
+    # ---------------- HTTP ----------------
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await self._read_request(reader)
+            if request is None:
+                return
+            if isinstance(request, int):
+                await self._respond(writer, request, {"error": _REASONS[request]})
+                return
+            method, path, body = request
+            await self._route(writer, method, path.split("?", 1)[0].rstrip("/"), body)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, path, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            return 400
+        length = 0
+        while True:
+            header = await reader.readline()
+            if header in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = header.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                try:
+                    length = int(value.strip())
+                except ValueError:
+                    return 400
+        if length > MAX_BODY:
+            return 413
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path, body
+
+    async def _route(self, writer: asyncio.StreamWriter, method: str, path: str, body: bytes):
+        parts = path.strip("/").split("/")
+        if parts == ["health"] and method == "GET":
+            await self._respond(writer, 200, self.health())
+        elif parts == ["jobs"] and method == "POST":
+            try:
+                job, deduplicated = self.submit(json.loads(body or b"null"))
+            except ServiceBusy as exc:
+                await self._respond(writer, 503, {"error": str(exc)}, {"Retry-After": "1"})
+            except (ValueError, TypeError) as exc:       # json.JSONDecodeError is a ValueError
+                await self._respond(writer, 400, {"error": str(exc)})
+            else:
+                await self._respond(writer, 202, dict(self.status(job, with_result=False),
+                                                      deduplicated=deduplicated))
+        elif len(parts) in (2, 3) and parts[0] == "jobs" and method == "GET":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                await self._respond(writer, 404, {"error": f"No job {parts[1]}"})
+            elif len(parts) == 2:
+                await self._respond(writer, 200, self.status(job))
+            elif parts[2] == "events":
+                await self._stream(writer, job)
+            else:
+                await self._respond(writer, 404, {"error": f"No route {path}"})
+        elif parts[0] in ("health", "jobs"):
+            await self._respond(writer, 405, {"error": f"{method} not allowed on {path}"})
+        else:
+            await self._respond(writer, 404, {"error": f"No route {path}"})
+
+    async def _respond(self, writer: asyncio.StreamWriter, code: int, payload: Any,
+                       headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(payload).encode()
+        head = [f"HTTP/1.1 {code} {_REASONS[code]}", "Content-Type: application/json",
+                f"Content-Length: {len(data)}", "Connection: close"]
+        head += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + data)
+        await writer.drain()
+
+    async def _stream(self, writer: asyncio.StreamWriter, job: Dict[str, Any]):
+        """
+        One NDJSON line per change (chunked encoding); the last one carries the
+        result.  Without a change for stream_interval seconds (a queued job,
+        or Optimal, which reports only when done) the status is repeated as a
+        keepalive.
+        """
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        changed = self._changed[job["id"]]
+        last = None
+        while True:
+            async with changed:
+                finished = job["status"] in FINISHED
+                event = self.status(job, with_result=finished)
+                snapshot = (event["status"], event["processed"])
+                if snapshot == last:
+                    try:
+                        await asyncio.wait_for(changed.wait(), self.stream_interval)
+                        continue
+                    except asyncio.TimeoutError:
+                        pass
+            last = snapshot
+            line = json.dumps(event).encode() + b"\n"
+            writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            await writer.drain()
+            if finished:
+                break
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local paging / segmentation simulation service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--max-queue", type=int, default=64, help="queued jobs before submissions are refused")
+    args = parser.parse_args(argv)
+    server = SimulationServer(args.host, args.port, args.workers, args.max_queue)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+tests/test_address_translation.py
+pytest tests for the virtual-address front end (page numbers, page table, TLB).
+"""
+
+import numpy as np
+import pytest
+
+from core.address_translation import TLB, AddressSpace, effective_access_time, translate
+from core.paging_core import PagingSimulation
+
+
+def test_page_numbers_and_level_indices():
+    space = AddressSpace(page_size=4096, levels=(2, 3))
+    addrs = np.array([0, 4095, 4096, (0b10_101 << 12) + 7], dtype=np.uint64)
+    assert space.page_numbers(addrs).tolist() == [0, 0, 1, 0b10101]
+    idx = space.level_indices(space.page_numbers(addrs))
+    assert idx[:, 3].tolist() == [0b10, 0b101]
+    # VPNs 0, 1 share one leaf table; 0b10101 needs a second one
+    assert space.table_counts([0, 1, 0b10101]) == [1, 2]
+    with pytest.raises(ValueError):
+        AddressSpace(page_size=3000)
+
+
+def test_tlb_set_associative_lru():
+    tlb = TLB(entries=4, ways=2)          # 2 sets
+    for vpn in (0, 2, 0, 4, 2):           # all map to set 0; 2 is LRU when 4 arrives
+        tlb.access(vpn)
+    assert (tlb.hits, tlb.misses) == (1, 4)
+    tlb.invalidate(4)
+    assert not tlb.access(4)
+
+
+def test_translate_report():
+    rng = np.random.default_rng(3)
+    vpns = rng.integers(0, 40, 3000)
+    addrs = (vpns << 12) + rng.integers(0, 4096, 3000)
+    addrs = np.repeat(addrs, 3)                   # runs of the same page
+    report = translate(addrs, n_frames=16, algorithm="FIFO", tlb=TLB(entries=8, ways=2))
+    sim = PagingSimulation(reference_string=np.repeat(vpns, 3), n_frames=16, algorithm="FIFO")
+    sim.run_all()
+    assert report["page_faults"] == sim.total_faults
+    # a TLB hit implies a resident page: every fault is also a TLB miss
+    assert report["tlb_misses"] >= report["page_faults"]
+    assert report["tlb_hits"] + report["tlb_misses"] == len(addrs)
+    assert report["eat_ns"] == pytest.approx(effective_access_time(
+        report["tlb_hit_rate"], 4, report["fault_rate"]))
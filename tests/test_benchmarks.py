@@ -0,0 +1,49 @@
+"""
+tests/test_benchmarks.py
+pytest tests for the seeded synthetic trace generators.
+"""
+
+import pytest
+
+from benchmarks.traces import TRACES, make_trace
+
+# kind -> (generator arguments, number of distinct pages they allow)
+PARAMS = {
+    "uniform": ({"n_pages": 300}, 300),
+    "zipf": ({"n_pages": 300, "alpha": 1.2}, 300),
+    "loop": ({"loop_len": 300}, 300),
+    "phased": ({"n_pages": 3000, "ws_size": 64, "phase_len": 700}, 3000),
+    "seqmix": ({"n_pages": 3000, "hot_pages": 100}, 3000),
+}
+
+
+def test_every_kind_is_covered():
+    assert sorted(PARAMS) == sorted(TRACES)
+
+
+@pytest.mark.parametrize("kind", sorted(PARAMS))
+def test_traces_are_seeded(kind):
+    kwargs, n_pages = PARAMS[kind]
+    trace = make_trace(kind, 5000, seed=1, **kwargs)
+    assert trace.typecode == "q" and len(trace) == 5000
+    assert 0 <= min(trace) and max(trace) < n_pages
+    assert trace == make_trace(kind, 5000, seed=1, **kwargs)
+    if kind != "loop":
+        # the loop is the same for every seed
+        assert trace != make_trace(kind, 5000, seed=2, **kwargs)
+    assert make_trace(kind, 0, seed=1, **kwargs) == make_trace(kind, 0, seed=2, **kwargs)
+
+
+def test_trace_shapes():
+    assert list(make_trace("loop", 7, loop_len=3)) == [0, 1, 2, 0, 1, 2, 0]
+    phased = make_trace("phased", 2100, n_pages=3000, ws_size=64, phase_len=700)
+    for start in range(0, 2100, 700):
+        phase = phased[start:start + 700]
+        assert max(phase) - min(phase) < 64
+    zipf = make_trace("zipf", 20000, n_pages=300, alpha=1.2)
+    assert zipf.count(0) > zipf.count(1) > zipf.count(50)
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError):
+        make_trace("nope", 10)
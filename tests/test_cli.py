@@ -0,0 +1,67 @@
+"""
+tests/test_cli.py
+pytest tests for the headless vmsim command line.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from core.paging_core import PagingSimulation
+from vmsim.cli import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REFS = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3] * 20
+
+
+def _trace(tmp_path):
+    path = tmp_path / "trace.txt"
+    path.write_text("\n".join(map(str, REFS)))
+    return str(path)
+
+
+def _faults(algorithm, frames):
+    sim = PagingSimulation(REFS, n_frames=frames, algorithm=algorithm, history="none")
+    sim.run_all()
+    return sim.total_faults
+
+
+def test_simulate_and_sweep(tmp_path, capsys):
+    trace = _trace(tmp_path)
+    assert main(["simulate", trace, "-f", "3", "-a", "fifo"]) == 0
+    row = json.loads(capsys.readouterr().out)
+    assert row["algorithm"] == "FIFO" and row["total_faults"] == _faults("FIFO", 3)
+
+    log = tmp_path / "log.csv"
+    assert main(["simulate", trace, "-f", "3", "-a", "OPTIMAL", "--log", str(log)]) == 0
+    assert json.loads(capsys.readouterr().out)["total_faults"] == _faults("OPTIMAL", 3)
+    lines = log.read_text().splitlines()
+    assert lines[0] == "step,page,fault,F0,F1,F2" and len(lines) == len(REFS) + 1
+
+    assert main(["sweep", trace, "-f", "2", "4", "-a", "LRU", "-a", "CLOCK", "--no-cache"]) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["algorithm"], r["frames"]) for r in rows] == [("LRU", 2), ("LRU", 4), ("CLOCK", 2), ("CLOCK", 4)]
+    assert all(r["total_faults"] == _faults(r["algorithm"], r["frames"]) for r in rows)
+
+    assert main(["simulate", trace, "-a", "NOPE"]) == 2
+    assert "Unknown algorithm" in capsys.readouterr().err
+
+
+def test_segment_replay(tmp_path, capsys):
+    ops = tmp_path / "ops.txt"
+    ops.write_text("A a 400\nA b 200\nA c 400\nF a\nF c\nA d 600\n")
+    assert main(["segment-replay", str(ops), "--memory", "1000", "--policy", "first",
+                 "--compaction", "none", "--compaction", "full"]) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["compaction"], r["failed_allocs"]) for r in rows] == [(None, 1), ("full", 0)]
+    assert "fragmentation_samples" not in rows[0]
+
+
+def test_stdin_streaming_without_heavy_imports():
+    code = ("import sys; from vmsim.cli import main; rc = main(sys.argv[1:]); "
+            "assert 'pandas' not in sys.modules and 'matplotlib' not in sys.modules; sys.exit(rc)")
+    out = subprocess.run([sys.executable, "-c", code, "sweep", "-", "-f", "3", "--no-cache", "--format", "csv"],
+                         input=" ".join(map(str, REFS)), capture_output=True, text=True, cwd=ROOT, check=True)
+    header, row = out.stdout.splitlines()
+    assert dict(zip(header.split(","), row.split(",")))["total_faults"] == str(_faults("LRU", 3))
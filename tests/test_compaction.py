@@ -0,0 +1,90 @@
+"""
+tests/test_compaction.py
+pytest tests for compaction planning and SegmentationMemory.compact.
+"""
+
+import random
+
+import pytest
+
+from core.compaction import plan_compaction
+from core.segmentation_core import SegmentationMemory, SegmentationSimulation
+
+
+def _fragmented():
+    # [A 100][hole 50][B 20][hole 60][C 300][hole 70][D 100]
+    mgr = SegmentationMemory(total_size=700)
+    for name, size in (("A", 100), ("x", 50), ("B", 20), ("y", 60), ("C", 300), ("z", 70), ("D", 100)):
+        mgr.allocate(name, size)
+    for name in ("x", "y", "z"):
+        mgr.free(name)
+    return mgr
+
+
+def _largest_hole_after(mgr, plan):
+    starts = {name: seg['start'] for name, seg in mgr.segments.items()}
+    starts.update({name: new for name, (_, new) in plan['relocation'].items()})
+    cursor, largest = 0, 0
+    for start, size in sorted((starts[n], s['size']) for n, s in mgr.segments.items()):
+        assert start >= cursor
+        largest, cursor = max(largest, start - cursor), start + size
+    return max(largest, mgr.total_size - cursor)
+
+
+def test_strategies_plan_minimal_moves():
+    mgr = _fragmented()
+    # slide: moving B (20 bytes) merges the 50 and 60 holes
+    slide = mgr.plan_compaction("slide", need=110)
+    assert slide['bytes_moved'] == 20 and slide['relocation'] == {"B": (150, 100)}
+    # fill: B moves into another hole instead
+    fill = mgr.plan_compaction("fill", need=110)
+    assert fill['bytes_moved'] == 20
+    # full: A stays put; D moves up to the end
+    full = mgr.plan_compaction("full")
+    assert "A" not in full['relocation'] and full['hole']['size'] == mgr.free_memory
+    assert mgr.plan_compaction("auto", need=110)['bytes_moved'] == 20
+    for plan in (slide, fill, full):
+        assert _largest_hole_after(mgr, plan) >= (plan['need'] or mgr.free_memory)
+    assert mgr.plan_compaction("slide", need=10_000) is None
+
+
+def test_allocation_failure_triggers_compaction():
+    mgr = _fragmented()
+    assert mgr.allocate("E", 170) is None
+    mgr.compaction = "auto"
+    seg = mgr.allocate("E", 170)
+    assert seg is not None and mgr.compactions == 1
+    assert mgr.bytes_moved == mgr.last_plan['bytes_moved'] == 320
+    assert sum(h['size'] for h in mgr.holes()) == mgr.free_memory == 10
+
+    sim = SegmentationSimulation(1000, compaction="full")
+    for name, size in (("A", 300), ("B", 200), ("C", 300), ("D", 200)):
+        sim.allocate(name, size)
+    sim.deallocate("B")
+    sim.deallocate("D")
+    assert "Compacted first" in sim.allocate("E", 300)
+
+
+@pytest.mark.parametrize("strategy", ["auto", "full", "slide", "fill"])
+def test_churn_keeps_memory_consistent(strategy):
+    rng = random.Random(0)
+    mgr = SegmentationMemory(5000, compaction=strategy, compact_threshold=0.9)
+    live = []
+    for i in range(3000):
+        if live and rng.random() < 0.48:
+            mgr.free(live.pop(rng.randrange(len(live))))
+        elif mgr.allocate(f"s{i}", rng.randint(1, 300)):
+            live.append(f"s{i}")
+    cursor = 0
+    for seg in mgr.get_segments():
+        assert seg['start'] >= cursor and seg['end'] == seg['start'] + seg['size'] - 1
+        cursor = seg['end'] + 1
+    holes = mgr.holes()
+    assert sum(h['size'] for h in holes) == mgr.free_memory
+    assert all(a['end'] + 1 < b['start'] for a, b in zip(holes, holes[1:]))
+    assert mgr.compactions > 0
+
+
+def test_plan_compaction_rejects_unknown_strategy():
+    with pytest.raises(ValueError):
+        plan_compaction([], 100, 10, "defrag")
@@ -0,0 +1,58 @@
+"""
+tests/test_experiment_runner.py
+pytest tests for the parallel batch runner against the serial one.
+"""
+
+import os
+import random
+import threading
+
+from experiments.experiment_runner import run_batch, run_batch_parallel
+
+ALGOS = ["LRU", "FIFO", "SECOND CHANCE"]
+
+
+def _trace(n=3000, pages=40, seed=3):
+    rng = random.Random(seed)
+    return [rng.randrange(pages) for _ in range(n)]
+
+
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def test_parallel_summary_matches_serial(tmp_path):
+    refs = _trace()
+    frames = [2, 4, 8, 16]
+    serial = run_batch(refs, frames, ALGOS, out_dir=str(tmp_path / "serial"), use_cache=False, plot=False)
+    calls = []
+    parallel = run_batch_parallel(refs, frames, ALGOS, out_dir=str(tmp_path / "parallel"), max_workers=2,
+                                  progress=lambda done, total, rows: calls.append((done, total, len(rows))),
+                                  plot=False)
+    assert _read(parallel) == _read(serial)
+    # LRU is one task for every frame size, the others one task per cell
+    total = 1 + 2 * len(frames)
+    assert [done for done, _, _ in calls] == list(range(1, total + 1))
+    assert {t for _, t, _ in calls} == {total}
+    assert sum(n for _, _, n in calls) == len(ALGOS) * len(frames)
+
+
+def test_parallel_empty_grid(tmp_path):
+    path = run_batch_parallel([1, 2, 3], [], ["LRU", "FIFO"], out_dir=str(tmp_path), plot=False)
+    assert os.path.exists(path)
+
+
+def test_parallel_cancel_writes_no_summary(tmp_path):
+    cancel = threading.Event()
+    calls = []
+
+    def progress(done, total, rows):
+        calls.append(done)
+        cancel.set()
+
+    result = run_batch_parallel(_trace(20000), list(range(1, 41)), ["FIFO"], out_dir=str(tmp_path),
+                                max_workers=1, progress=progress, cancel=cancel, plot=False)
+    assert result is None
+    assert 1 <= len(calls) < 40
+    assert not os.path.exists(tmp_path / "summary_results.csv")
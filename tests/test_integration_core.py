@@ -17,3 +17,21 @@ def test_integration_sanity():
     mgr = SegmentationMemory(total_size=500)
     assert mgr.allocate("A", 100, policy="first")
     assert mgr.free("A")
+
+
+def test_segmented_paging_end_to_end():
+    import numpy as np
+    from core.segmented_paging import SegmentTable, simulate
+
+    # segments from the allocator, a million logical references with locality
+    mgr = SegmentationMemory(total_size=1 << 24)
+    for i in range(64):
+        assert mgr.allocate(f"seg{i}", 4096 * (i % 8 + 1))
+    table = SegmentTable.from_memory(mgr, page_size=4096)
+    rng = np.random.default_rng(0)
+    segs = np.repeat(rng.integers(0, 64, 10000), 100)
+    offsets = rng.integers(0, 4096 * 8, len(segs))
+    report = simulate(table, segs, offsets, n_frames=32, algorithm="LRU")
+    assert report["references"] == 1_000_000
+    assert report["translated"] + report["segfaults"] == 1_000_000
+    assert 0 < report["page_faults"] <= report["translated"]
@@ -0,0 +1,66 @@
+"""
+tests/test_multiprocess.py
+pytest tests for the multi-process engine (global vs local replacement, thrashing).
+"""
+
+import random
+
+import pytest
+
+from core.multiprocess import MultiProcessSimulation
+from core.paging_core import PagingSimulation
+
+
+def _traces(seed=1, n=8, pages=20):
+    rng = random.Random(seed)
+    return [[rng.randint(0, pages) for _ in range(rng.randint(0, 300))] for _ in range(n)]
+
+
+@pytest.mark.parametrize("policy,algorithm", [("clock", "SC"), ("fifo", "FIFO")])
+def test_local_scope_matches_single_process_runs(policy, algorithm):
+    traces = _traces()
+    quotas = [1, 2, 3, 4, 5, 6, 7, 8]
+    sim = MultiProcessSimulation(traces, 40, scope="local", policy=policy, quotas=quotas,
+                                 quantum=5, switch_on_fault=True)
+    report = sim.run()
+    for row in sim.per_process():
+        ref = PagingSimulation(traces[row["pid"]], quotas[row["pid"]], algorithm, history="none")
+        ref.run_all()
+        assert row["faults"] == ref.total_faults
+        assert row["resident_frames"] <= quotas[row["pid"]]
+    assert report["total_accesses"] == sum(len(t) for t in traces)
+
+
+@pytest.mark.parametrize("policy,algorithm", [("clock", "SC"), ("fifo", "FIFO")])
+def test_single_process_global_scope_matches(policy, algorithm):
+    trace = _traces(seed=2, n=1)[0]
+    report = MultiProcessSimulation([trace], 4, policy=policy, quantum=3).run()
+    ref = PagingSimulation(trace, 4, algorithm, history="none")
+    ref.run_all()
+    assert report["total_faults"] == ref.total_faults
+
+
+def test_thrashing_only_when_oversubscribed():
+    # 20 processes cycling over 10 pages each: 200 pages of working set
+    traces = [list(range(10)) * 30 for _ in range(20)]
+    ample = MultiProcessSimulation(traces, 200, window=1000, quantum=10).run()
+    assert ample["total_refaults"] == 0 and not ample["thrashing"]
+    tight = MultiProcessSimulation(traces, 100, window=1000, quantum=10).run()
+    assert tight["thrashing"] and tight["thrashing_processes"] == 20
+
+
+def test_local_scope_needs_a_frame_per_process():
+    with pytest.raises(ValueError):
+        MultiProcessSimulation([[1], [2], [3]], 2, scope="local")
+    with pytest.raises(ValueError):
+        MultiProcessSimulation([[1]], 2, policy="lru")
+
+
+def test_pages_must_fit_the_packed_key():
+    # 1 << 40 would alias pid 1's page 0, -1 the free-frame marker
+    with pytest.raises(ValueError):
+        MultiProcessSimulation([[1 << 40] * 3, [0] * 3], 4)
+    with pytest.raises(ValueError):
+        MultiProcessSimulation([[0, -1, 2]], 4)
+    report = MultiProcessSimulation([[(1 << 40) - 1] * 3, [0] * 3], 4).run()
+    assert report["total_faults"] == 2
@@ -3,6 +3,8 @@ tests/test_paging_core.py
 pytest unit tests for paging_core.
 """
 
+import pytest
+
 from core.paging_core import PagingSimulation
 
 def test_lru_basic():
@@ -21,3 +23,76 @@ def test_optimal_better_or_equal():
     lru.run_all()
     opt.run_all()
     assert opt.total_faults <= lru.total_faults
+
+def test_optimal_textbook_faults():
+    refs = [7,0,1,2,0,3,0,4,2,3,0,3,2,1,2,0,1,7,0,1]
+    sim = PagingSimulation(n_frames=3, algorithm="OPTIMAL", reference_string=refs)
+    faults, history = sim.run_all()
+    assert faults == 9
+    assert history[-1] == [7, 0, 1]
+
+def test_history_modes_agree():
+    refs = [1,2,3,4,1,2,5,1,2,3,4,5]
+    full = PagingSimulation(n_frames=3, algorithm="CLOCK", reference_string=refs)
+    events = PagingSimulation(n_frames=3, algorithm="CLOCK", reference_string=refs, history="events")
+    counters = PagingSimulation(n_frames=3, algorithm="CLOCK", reference_string=refs, history="none")
+    faults, history = full.run_all()
+    ev_faults, ev_history = events.run_all()
+    assert counters.run_all()[0] == ev_faults == faults
+    assert len(ev_history) == len(history)
+    assert list(ev_history) == history
+    assert ev_history[4] == history[4]
+    assert counters.history == []
+
+
+def test_feed_and_checkpoint_resume():
+    import pickle
+    refs = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5, 6, 2, 1, 7] * 20
+    for alg in ("LRU", "FIFO", "SECOND CHANCE", "ARC", "CLOCK-PRO"):
+        whole = PagingSimulation(n_frames=3, algorithm=alg, reference_string=refs, history="events")
+        whole.run_all()
+
+        online = PagingSimulation(n_frames=3, algorithm=alg, reference_string=[], history="events")
+        for i in range(0, len(refs), 7):
+            online.feed(refs[i:i + 7])
+        assert online.total_faults == whole.total_faults
+        assert list(online.history) == list(whole.history)
+
+        half = PagingSimulation(n_frames=3, algorithm=alg, reference_string=refs[:100])
+        half.run_all()
+        resumed = PagingSimulation.from_checkpoint(pickle.loads(pickle.dumps(half.checkpoint())))
+        faults = sum(resumed.step(p) for p in refs[100:])
+        assert resumed.total_faults == whole.total_faults == half.total_faults + faults
+        assert resumed.history == list(whole.history)[100:]
+
+
+def test_optimal_cannot_be_fed():
+    sim = PagingSimulation(n_frames=3, algorithm="OPTIMAL", reference_string=[1, 2, 3])
+    sim.run_all()
+    with pytest.raises(ValueError):
+        sim.feed([4])
+
+
+def test_metrics_hooks():
+    refs = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5] * 10
+    plain = PagingSimulation(n_frames=3, algorithm="SECOND CHANCE", reference_string=refs)
+    plain.run_all()
+    sim = PagingSimulation(n_frames=3, algorithm="SECOND CHANCE", reference_string=refs,
+                           metrics=True, metrics_window=12)
+    sim.run_all()
+    assert list(sim.history) == list(plain.history)
+    m = sim.metrics
+    assert len(m.fault_steps) == sim.total_faults
+    assert m.evictions == sim.total_faults - 3
+    assert sum(m.scan_lengths.values()) == m.evictions
+    rates = m.window_fault_rates()
+    assert len(rates) == 10
+    assert abs(sum(rates) * 12 - sim.total_faults) < 1e-9
+    summary = sim.summary()
+    assert summary["evictions"] == m.evictions and summary["ns_per_access"] > 0
+    assert "evictions" not in plain.summary()
+    # every bit is set when 4 arrives: the hand sweeps all three frames before evicting
+    full_sweep = PagingSimulation([1, 2, 3, 4], 3, "SECOND CHANCE", metrics=True)
+    full_sweep.run_all()
+    assert dict(full_sweep.metrics.scan_lengths) == {3: 1}
+    assert max(m.scan_lengths) <= 3 and m.mean_scan_length() > 0
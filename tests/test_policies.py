@@ -0,0 +1,51 @@
+"""
+tests/test_policies.py
+pytest tests for the replacement-policy registry and the pluggable policies.
+"""
+
+import random
+
+import pytest
+
+from core.paging_core import PagingSimulation
+from core.policies import available_policies, get_policy
+
+
+def _run(refs, nf, alg, history="full"):
+    sim = PagingSimulation(n_frames=nf, algorithm=alg, reference_string=refs, history=history)
+    faults, hist = sim.run_all()
+    return faults, list(hist)
+
+
+def test_registry_aliases():
+    assert get_policy("opt").name == "OPTIMAL"
+    assert get_policy("second_chance").name == "SECOND CHANCE"
+    assert get_policy("clock").name == "SECOND CHANCE"
+    assert get_policy("Clock-Pro").name == "CLOCK-PRO"
+    names = {spec.name for spec in available_policies()}
+    assert {"LRU", "OPTIMAL", "FIFO", "SECOND CHANCE", "ARC", "LFU", "2Q", "CLOCK-PRO"} <= names
+    with pytest.raises(ValueError):
+        get_policy("MRU-ish")
+
+
+@pytest.mark.parametrize("alg", ["ARC", "LFU", "2Q", "CLOCK-PRO"])
+def test_pluggable_policy_invariants(alg):
+    rng = random.Random(7)
+    refs = [rng.randint(0, 30) if rng.random() < 0.7 else rng.randint(0, 5) for _ in range(3000)]
+    nf = 6
+    faults, history = _run(refs, nf, alg)
+    opt_faults, _ = _run(refs, nf, "OPTIMAL", history="none")
+    assert faults >= opt_faults
+    counted = 0
+    prev = [None] * nf
+    for page, frames in zip(refs, history):
+        assert len(frames) == nf
+        assert page in frames
+        resident = [p for p in frames if p is not None]
+        assert len(resident) == len(set(resident))
+        if page not in prev:
+            counted += 1
+        prev = frames
+    assert counted == faults
+    # events-mode history reconstructs the same snapshots
+    assert _run(refs, nf, alg, history="events")[1] == history
@@ -0,0 +1,58 @@
+"""
+tests/test_preprocess.py
+pytest tests for trace preprocessing (run collapse, dense ids, trace statistics).
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from core.paging_core import PagingSimulation
+from core.policies import available_policies
+from core.preprocess import reduce_trace
+from core.stack_distance import fault_curve, lru_fault_curve
+
+
+def _bursty(seed=5, n=800, pages=20):
+    rng = random.Random(seed)
+    refs = []
+    for _ in range(n):
+        refs += [rng.randint(0, pages)] * rng.choice([1, 1, 2, 5])
+    return refs
+
+
+def test_reduce_trace_runs_and_dense_ids():
+    red = reduce_trace([7, 7, 3, 7, 7, 7, 9])
+    assert list(red.pages) == [7, 3, 7, 9]
+    assert red.weights.tolist() == [2, 1, 3, 1]
+    assert red.starts.tolist() == [0, 2, 3, 6]
+    assert [red.page_ids[d] for d in red.dense] == [7, 3, 7, 9]
+    assert list(red) == [7, 7, 3, 7, 7, 7, 9] and len(red) == 7
+    names = reduce_trace(iter(["a", "a", "b"]))
+    assert names.pages == ["a", "b"] and names.n_distinct == 2
+
+
+@pytest.mark.parametrize("history", ["full", "events", "none"])
+def test_simulation_on_reduced_trace_is_exact(history):
+    refs = _bursty()
+    for spec in available_policies():
+        plain = PagingSimulation(list(refs), 4, spec.name, history, metrics=True)
+        plain.run_all()
+        reduced = PagingSimulation(refs, 4, spec.name, history, metrics=True, preprocess=True)
+        reduced.run_all()
+        assert (reduced.page_faults, reduced.total_accesses, reduced.frames) == \
+               (plain.page_faults, plain.total_accesses, plain.frames)
+        assert list(reduced.history) == list(plain.history)
+        assert reduced.metrics.window_fault_rates() == plain.metrics.window_fault_rates()
+        assert reduced.metrics.mean_eviction_age() == plain.metrics.mean_eviction_age()
+
+
+def test_statistics_match_brute_force():
+    refs = _bursty(seed=6, n=300)
+    red = reduce_trace(np.array(refs))
+    assert red.lru_fault_curve(30) == lru_fault_curve(refs, 30)
+    assert fault_curve(red, "OPT", 10) == fault_curve(refs, "OPT", 10)
+    for tau in (1, 3, 25):
+        brute = np.mean([len(set(refs[max(0, t - tau + 1):t + 1])) for t in range(len(refs))])
+        assert red.working_set_sizes([tau])[0] == pytest.approx(brute)
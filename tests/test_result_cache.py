@@ -0,0 +1,55 @@
+"""
+tests/test_result_cache.py
+pytest tests for the content-addressed simulation result cache.
+"""
+
+from array import array
+
+from core import result_cache
+from core.paging_core import PagingSimulation
+from core.result_cache import ResultCache, cache_key, cached_run, default_cache, trace_digest
+
+
+def test_digest_depends_only_on_contents():
+    refs = [7, 0, 1, 2, 0, 3, 0, 4]
+    assert trace_digest(refs) == trace_digest(array('q', refs)) == trace_digest(iter(refs))
+    assert trace_digest(refs) != trace_digest(refs[::-1])
+    d = trace_digest(refs)
+    assert cache_key(d, "opt", 3) == cache_key(d, "Optimal", 3) != cache_key(d, "LRU", 3)
+
+
+def test_cached_run_restores_results(tmp_path):
+    refs = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5] * 50
+    cache = ResultCache(max_entries=1, disk_dir=str(tmp_path))
+    first = PagingSimulation(refs, n_frames=3, algorithm="FIFO", history="events")
+    faults, history = cached_run(first, cache)
+    expected = list(history)
+
+    # second lookup comes from disk: the memory tier only holds one entry
+    cached_run(PagingSimulation(refs, n_frames=4, algorithm="FIFO", history="events"), cache)
+    again = PagingSimulation(list(refs), n_frames=3, algorithm="FIFO", history="events")
+    assert cached_run(again, cache)[0] == faults
+    assert list(again.history) == expected
+    assert again.summary() == first.summary()
+    assert cache.hits == 1 and cache.misses == 2
+
+
+def test_disk_tier_size_cap(tmp_path):
+    cache = ResultCache(max_entries=1, disk_dir=str(tmp_path), max_disk_bytes=3000)
+    for i in range(10):
+        cache.put(f"k{i}", list(range(100)))
+    assert sum(p.stat().st_size for p in tmp_path.iterdir()) <= 3000
+    assert cache.get("k9") is not None
+
+
+def test_default_cache_writes_to_disk_only_when_asked(tmp_path, monkeypatch):
+    monkeypatch.delenv("VMSIM_CACHE_DIR", raising=False)
+    monkeypatch.setattr(result_cache, "_default_cache", None)
+    assert default_cache().disk_dir is None
+    cached_run(PagingSimulation([1, 2, 3, 1], n_frames=2, algorithm="LRU"))
+    assert default_cache().hits == 0 and default_cache().misses == 1
+
+    monkeypatch.setenv("VMSIM_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(result_cache, "_default_cache", None)
+    cached_run(PagingSimulation([1, 2, 3, 1], n_frames=2, algorithm="LRU"))
+    assert len(list((tmp_path / "cache").glob("*.pkl"))) == 1
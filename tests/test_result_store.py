@@ -0,0 +1,67 @@
+"""
+tests/test_result_store.py
+pytest tests for the columnar result store and the typed per-step log.
+"""
+
+import numpy as np
+
+from core.paging_core import PagingSimulation
+from experiments.analysis_tools import load_summary
+from experiments.experiment_runner import run_batch
+from experiments.result_store import ResultStore
+
+
+def test_log_columns_match_history():
+    refs = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2]
+    sim = PagingSimulation(n_frames=3, algorithm="FIFO", reference_string=refs, history="events")
+    sim.run_all()
+    cols = sim.log_columns()
+    assert cols["page"].dtype == np.int64 and cols["F0"].dtype == np.int64
+    assert int(cols["fault"].sum()) == sim.total_faults
+    snapshots = [[None if v == -1 else int(v) for v in row]
+                 for row in zip(*(cols[f"F{i}"] for i in range(3)))]
+    assert snapshots == list(sim.history)
+
+
+def test_store_round_trip(tmp_path):
+    refs = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5] * 30
+    store = ResultStore(str(tmp_path))
+    for alg in ("LRU", "SECOND CHANCE"):
+        for nf in (3, 4):
+            sim = PagingSimulation(n_frames=nf, algorithm=alg, reference_string=refs, history="events")
+            sim.run_all()
+            store.write_run(sim, batch_rows=50)
+    assert store.partitions(frames=4) == [("LRU", 4), ("SECOND CHANCE", 4)]
+    summary = store.summary(algorithm="LRU")
+    assert summary["frames"].tolist() == [3, 4]
+    log = store.read_log("SECOND CHANCE", 3, ["step", "fault"])
+    assert set(log) == {"step", "fault"}
+    assert log["step"].tolist() == list(range(len(refs)))
+    sim = PagingSimulation(n_frames=3, algorithm="SECOND CHANCE", reference_string=refs)
+    sim.run_all()
+    assert int(log["fault"].sum()) == sim.total_faults
+
+
+def _same_table(a, b):
+    a = a[sorted(a.columns)].sort_values(["algorithm", "frames"]).reset_index(drop=True)
+    b = b[sorted(b.columns)].sort_values(["algorithm", "frames"]).reset_index(drop=True)
+    assert list(a.columns) == list(b.columns)
+    assert np.allclose(a.drop(columns="algorithm").to_numpy(float), b.drop(columns="algorithm").to_numpy(float),
+                       equal_nan=True)
+    assert a["algorithm"].tolist() == b["algorithm"].tolist()
+
+
+def test_store_summary_matches_csv(tmp_path):
+    refs = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5] * 20
+    out = str(tmp_path)
+    csv_path = run_batch(refs, [2, 3, 4], ["LRU", "FIFO"], out_dir=out, use_cache=False, metrics=True, plot=False)
+    stored = load_summary(str(tmp_path / "store"))
+    assert {"evictions", "mean_scan_length", "seconds"} <= set(stored.columns)
+    _same_table(stored, load_summary(csv_path))
+
+    # a later batch into the same directory replaces the earlier one
+    csv_path = run_batch(refs, [2, 3], ["LRU"], out_dir=out, use_cache=False, sampling_rate=0.5, plot=False)
+    stored = load_summary(str(tmp_path / "store"))
+    assert sorted(stored["frames"]) == [2, 3] and "sample_rate" in stored.columns
+    assert "evictions" not in stored.columns
+    _same_table(stored, load_summary(csv_path))
@@ -3,6 +3,8 @@ tests/test_segmentation_core.py
 pytest tests for segmentation_core.
 """
 
+import random
+
 from core.segmentation_core import SegmentationMemory
 
 def test_allocate_and_free():
@@ -13,3 +15,36 @@ def test_allocate_and_free():
     mgr.free("P1.S1")
     frag = mgr.fragmentation()
     assert frag['total_free'] > 0
+
+def test_placement_policies_reuse_holes():
+    mgr = SegmentationMemory(total_size=1000)
+    for name, size in (("A", 100), ("B", 50), ("C", 300), ("D", 50), ("E", 400)):
+        assert mgr.allocate(name, size, policy="first")
+    mgr.free("A")          # hole [0..99]
+    mgr.free("C")          # hole [150..449]
+    assert mgr.allocate("F", 80, policy="best")['start'] == 0
+    assert mgr.allocate("G", 60, policy="worst")['start'] == 150
+    assert mgr.allocate("H", 10, policy="first")['start'] == 80
+    assert mgr.allocate("X", 2000) is None
+
+def test_free_coalesces_neighbours():
+    mgr = SegmentationMemory(total_size=600)
+    for name in ("A", "B", "C"):
+        mgr.allocate(name, 200)
+    mgr.free("A")
+    mgr.free("C")
+    mgr.free("B")
+    assert mgr.dump() == [{'name': None, 'start': 0, 'size': 600, 'end': 599}]
+    assert mgr.fragmentation()['holes'] == 1
+    assert mgr.free("B") is None
+
+def test_allocator_leaves_global_random_state_alone():
+    random.seed(11)
+    expected = [random.random() for _ in range(3)]
+    random.seed(11)
+    mgr = SegmentationMemory(total_size=1000)
+    for i in range(20):
+        mgr.allocate(f"S{i}", 10 + i)
+    for i in range(0, 20, 2):
+        mgr.free(f"S{i}")
+    assert [random.random() for _ in range(3)] == expected
@@ -0,0 +1,54 @@
+"""
+tests/test_segmentation_replay.py
+pytest tests for the segmentation replay benchmark (workloads, trace files, replay counts).
+"""
+
+from experiments.segmentation_replay import (compare_policies, lifetime_churn, parse_ops, read_ops, replay,
+                                             uniform_churn, write_ops)
+
+
+def _check_workload(ops):
+    live = set()
+    for kind, name, size in ops:
+        if kind == "A":
+            assert name not in live and size > 0
+            live.add(name)
+        else:
+            live.remove(name)
+
+
+def test_generators_are_seeded():
+    for generator in (uniform_churn, lifetime_churn):
+        ops = list(generator(3000, seed=4))
+        assert ops == list(generator(3000, seed=4)) and ops != list(generator(3000, seed=5))
+        assert len(ops) == 3000
+        _check_workload(ops)
+
+
+def test_trace_file_round_trip(tmp_path):
+    ops = list(uniform_churn(500, seed=1))
+    path = str(tmp_path / "ops.txt")
+    assert write_ops(path, ops) == len(ops)
+    assert list(read_ops(path)) == ops
+    assert list(parse_ops(["# header", "A x 12  # comment", "", "F x"])) == [("A", "x", 12), ("F", "x", 0)]
+
+
+def test_replay_counts_and_percentiles():
+    ops = list(lifetime_churn(5000, seed=1, mean_lifetime=200))
+    allocs = sum(kind == "A" for kind, _, _ in ops)
+    row = replay(ops, 1 << 24, "best", sample_every=500)
+    assert row["ops"] == len(ops) and row["allocs"] == allocs and row["frees"] == len(ops) - allocs
+    assert row["failed_allocs"] == 0 and row["compactions"] == 0 and row["bytes_moved"] == 0
+    assert 0 < row["p50_ns"] <= row["p99_ns"] <= row["max_ns"]
+    assert [s["op"] for s in row["fragmentation_samples"]] == list(range(500, 5001, 500))
+
+
+def test_compaction_recovers_failed_allocations():
+    ops = list(lifetime_churn(5000, seed=1, mean_lifetime=200))
+    rows = compare_policies(ops, 40000, policies=("worst",), sample_every=1000, compactions=(None, "full"))
+    plain, compacted = rows
+    assert (plain["compaction"], compacted["compaction"]) == (None, "full")
+    assert plain["failed_allocs"] > 0 and plain["compactions"] == 0
+    assert compacted["failed_allocs"] < plain["failed_allocs"]
+    assert compacted["compactions"] > 0 and compacted["bytes_moved"] > 0
+    assert compacted["bytes_moved_per_op"] == compacted["bytes_moved"] / len(ops)
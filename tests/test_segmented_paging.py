@@ -0,0 +1,53 @@
+"""
+tests/test_segmented_paging.py
+pytest tests for segmented paging (segment table translation + replacement).
+"""
+
+import numpy as np
+import pytest
+
+from core.paging_core import PagingSimulation
+from core.segmentation_core import SegmentationMemory
+from core.segmented_paging import SegmentationViolation, SegmentTable, simulate
+
+
+def _table(page_size=64):
+    mgr = SegmentationMemory(total_size=1000)
+    for name, size in (("code", 200), ("gap", 50), ("heap", 300), ("stack", 130)):
+        mgr.allocate(name, size)
+    mgr.free("gap")
+    return mgr, SegmentTable.from_memory(mgr, page_size=page_size)
+
+
+def test_translate_pairs_and_addresses():
+    mgr, table = _table()
+    assert table.names == ["code", "heap", "stack"]
+    assert table.n_pages.tolist() == [4, 5, 3] and table.page_base.tolist() == [0, 4, 9]
+    out = table.translate(["heap", "code", "stack", "heap", "nope"], [70, 199, 129, 300, 0])
+    assert out["valid"].tolist() == [True, True, True, False, False]
+    assert out["pages"].tolist() == [4 + 1, 3, 9 + 2]
+    assert out["segments"].tolist() == [1, 0, 2]
+    assert table.page_owner(out["pages"])[1].tolist() == [1, 3, 2]
+    # linear addresses: heap starts at 250, the freed hole 200..249 belongs to no segment
+    heap = mgr.segments["heap"]['start']
+    out = table.translate_addresses([heap + 70, 199, 210, 999])
+    assert out["valid"].tolist() == [True, True, False, False]
+    assert out["pages"].tolist() == [5, 3]
+    with pytest.raises(SegmentationViolation):
+        table.translate(["code"], [200], strict=True)
+
+
+def test_simulate_matches_paging_on_translated_stream():
+    mgr, table = _table()
+    rng = np.random.default_rng(1)
+    names = np.array(table.names)[rng.integers(0, 3, 20000)]
+    offsets = rng.integers(0, 320, 20000)
+    report = simulate(table, names, offsets, n_frames=5, algorithm="FIFO")
+    pages = table.translate(names, offsets)["pages"]
+    sim = PagingSimulation(reference_string=pages.tolist(), n_frames=5, algorithm="FIFO", history="none")
+    sim.run_all()
+    assert report["page_faults"] == sim.total_faults
+    assert report["segfaults"] + report["translated"] == 20000
+    assert sum(r["faults"] for r in report["per_segment"]) == report["page_faults"]
+    assert sum(r["references"] for r in report["per_segment"]) == report["translated"]
+    assert all(r["distinct_pages"] <= r["pages"] for r in report["per_segment"])
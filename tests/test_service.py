@@ -0,0 +1,120 @@
+"""
+tests/test_service.py
+pytest tests for the local simulation service (job queue, dedup, progress stream).
+"""
+
+import asyncio
+import random
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from core.history import EventHistory
+from core.paging_core import PagingSimulation
+from core.result_cache import ResultCache
+from service.client import ServiceClient, ServiceError, run_paging
+from service.server import ServiceBusy, SimulationServer
+
+
+@contextmanager
+def _serving(**options):
+    """A SimulationServer on its own event loop thread; yields a client for it."""
+    server = SimulationServer(port=0, **options)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def serve():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    started.wait(30)
+    try:
+        yield f"http://127.0.0.1:{server.port}"
+    finally:
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result(30)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(30)
+
+
+@pytest.fixture(scope="module")
+def client():
+    with _serving(workers=2, max_queue=8) as url:
+        yield ServiceClient(url)
+
+
+def test_paging_job_streams_progress(client):
+    trace = [i % 37 for i in range(5000)] * 4
+    job = client.submit({"kind": "paging", "trace": trace, "n_frames": 8, "algorithm": "FIFO", "chunk": 2000})
+    events = list(client.events(job["id"]))
+    assert events[-1]["status"] == "done"
+    running = [e for e in events if e["status"] == "running" and e["processed"]]
+    assert all(0 < e["partial"]["page_faults"] <= e["processed"] for e in running)
+    sim = PagingSimulation(reference_string=trace, n_frames=8, algorithm="FIFO", history="none")
+    sim.run_all()
+    assert events[-1]["result"]["summary"]["total_faults"] == sim.total_faults
+
+    # same spec (any chunk size) is not run again
+    again = client.submit({"kind": "paging", "trace": trace, "n_frames": 8, "algorithm": "fifo"})
+    assert again["deduplicated"] and again["id"] == job["id"]
+    assert client.status(job["id"])["requests"] == 2
+
+
+def test_run_paging_remote_matches_local(client, tmp_path):
+    trace = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3] * 10
+    remote = run_paging(trace, 3, "LRU", metrics=True, metrics_window=10, client=client)
+    cache = ResultCache(disk_dir=str(tmp_path))
+    local = run_paging(trace, 3, "LRU", metrics=True, metrics_window=10, client=ServiceClient("http://127.0.0.1:1"),
+                       cache=cache)
+    assert cache.misses == 1 and len(list(tmp_path.glob("*.pkl"))) == 1
+    assert remote["remote"] and not local["remote"]
+    assert isinstance(remote["history"], EventHistory)
+    assert list(remote["history"]) == list(local["history"])
+    assert remote["summary"]["total_faults"] == local["summary"]["total_faults"]
+    assert remote["metrics"]["window_fault_rates"] == local["metrics"]["window_fault_rates"]
+    optimal = run_paging(trace, 3, "OPTIMAL", history="none", client=client)
+    assert optimal["history"] is None and optimal["summary"]["total_faults"] < remote["summary"]["total_faults"]
+
+
+def test_segmentation_job_and_errors(client):
+    ops = [["A", "a", 400], ["A", "b", 200], ["A", "c", 400], ["F", "a"], ["F", "c"], ["A", "d", 600]]
+    spec = {"kind": "segmentation", "ops": ops, "total_size": 1000}
+    assert client.result(client.submit(spec)["id"])["failed_allocs"] == 1
+    result = client.result(client.submit(dict(spec, compaction="full"))["id"])
+    assert result["failed_allocs"] == 0 and result["compactions"] == 1
+    with pytest.raises(ServiceError) as err:
+        client.submit({"kind": "paging", "trace": [1], "algorithm": "NOPE"})
+    assert err.value.status == 400
+    with pytest.raises(ServiceError) as err:
+        client.status("j999")
+    assert err.value.status == 404
+
+
+def test_full_queue_refuses_jobs():
+    async def scenario():
+        server = SimulationServer(workers=1, max_queue=1)      # not started: nothing drains the queue
+        server.submit({"kind": "paging", "trace": [1, 2], "n_frames": 1})
+        assert server.submit({"kind": "paging", "trace": [1, 2], "n_frames": 1})[1]
+        with pytest.raises(ServiceBusy):
+            server.submit({"kind": "paging", "trace": [3], "n_frames": 1})
+
+    asyncio.run(scenario())
+
+
+def test_stream_keepalive_outlives_client_timeout():
+    # one worker busy with a long Optimal run (no progress until done), a second job queued
+    # behind it: neither stream may go quiet for longer than the client's read timeout
+    rng = random.Random(5)
+    long_trace = [rng.randrange(3000) for _ in range(400000)]
+    with _serving(workers=1, stream_interval=0.05) as url:
+        client = ServiceClient(url, timeout=0.3)
+        busy = client.submit({"kind": "paging", "trace": long_trace, "n_frames": 100, "algorithm": "OPTIMAL"})
+        queued = client.submit({"kind": "paging", "trace": [1, 2, 3, 1], "n_frames": 2})
+        events = list(client.events(queued["id"]))
+        assert sum(e["status"] == "queued" for e in events) > 1
+        assert events[-1]["status"] == "done" and events[-1]["result"]["summary"]["total_faults"] == 4
+        assert client.result(busy["id"])["summary"]["total_accesses"] == len(long_trace)
@@ -0,0 +1,50 @@
+"""
+tests/test_shards.py
+pytest tests for the sampled (SHARDS) LRU miss-ratio curves.
+"""
+
+import random
+
+import numpy as np
+
+from benchmarks.traces import make_trace
+from core.shards import ShardsMRC, hash_pages, mrc_error, page_hash, shards_fault_curve
+from core.stack_distance import lru_fault_curve
+
+
+def test_full_rate_is_exact():
+    rng = random.Random(3)
+    refs = [rng.randint(0, 40) for _ in range(2000)]
+    assert shards_fault_curve(refs, 50, rate=1.0) == lru_fault_curve(refs, 50)
+    # non-integer pages take the per-reference hash path
+    names = [f"p{page}" for page in refs]
+    assert shards_fault_curve(iter(names), 50, rate=1.0) == lru_fault_curve(refs, 50)
+
+
+def test_vectorized_hash_matches_scalar():
+    pages = np.array([0, 1, 7, 2 ** 40, -5], dtype=np.int64)
+    assert hash_pages(pages).tolist() == [page_hash(int(p)) for p in pages]
+
+
+def test_sampled_curves_are_close():
+    refs = make_trace("uniform", 50000)
+    exact = lru_fault_curve(refs, 1200)
+    fixed_rate = shards_fault_curve(refs, 1200, rate=0.1)
+    assert mrc_error(exact, fixed_rate)["mean_abs_error"] < 0.02
+    mrc = ShardsMRC(1200, max_pages=256).feed(refs)
+    assert mrc.stats()["sampled_pages"] <= 256 and mrc.rate < 1.0
+    assert mrc_error(exact, mrc.curve())["mean_abs_error"] < 0.03
+
+
+def test_fixed_size_is_adjusted_on_skewed_traces():
+    # without SHARDS-adj the hot pages' sampling noise skews the whole max_pages curve (MAE ~0.08 here)
+    refs = make_trace("zipf", 100000, n_pages=10000, alpha=1.2)
+    exact = lru_fault_curve(refs, 2000)
+    mrc = ShardsMRC(2000, max_pages=300).feed(refs)
+    assert mrc.rate < 0.1
+    assert mrc_error(exact, mrc.curve())["mean_abs_error"] < 0.02
+    # the adjustment tracks the rate in effect, so feeding in pieces gives the same curve
+    pieces = ShardsMRC(2000, max_pages=300)
+    for start in range(0, len(refs), 30000):
+        pieces.feed(refs[start:start + 30000])
+    assert mrc_error(exact, pieces.curve())["mean_abs_error"] < 0.02
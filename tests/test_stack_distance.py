@@ -0,0 +1,34 @@
+"""
+tests/test_stack_distance.py
+pytest tests for the single-pass stack-distance engines.
+"""
+
+import random
+
+from core.paging_core import PagingSimulation
+from core.stack_distance import lru_fault_curve, opt_fault_curve, has_stack_property
+
+
+def _faults(refs, nf, alg):
+    sim = PagingSimulation(n_frames=nf, algorithm=alg, reference_string=refs)
+    sim.run_all()
+    return sim.total_faults
+
+def test_lru_curve_matches_simulation():
+    rng = random.Random(1)
+    refs = [rng.randint(0, 20) for _ in range(3000)]
+    curve = lru_fault_curve(refs, 24)
+    assert curve[0] == len(refs)
+    for nf in range(1, 25):
+        assert curve[nf] == _faults(refs, nf, "LRU")
+
+def test_opt_curve_matches_simulation():
+    rng = random.Random(2)
+    refs = [rng.randint(0, 15) for _ in range(800)]
+    curve = opt_fault_curve(refs, 18)
+    for nf in range(1, 19):
+        assert curve[nf] == _faults(refs, nf, "OPTIMAL")
+
+def test_stack_property_names():
+    assert has_stack_property("lru") and has_stack_property("OPT")
+    assert not has_stack_property("FIFO")
@@ -0,0 +1,32 @@
+"""
+tests/test_trace_io.py
+pytest tests for the streaming trace readers.
+"""
+
+from core.paging_core import PagingSimulation
+from core.trace_io import BinaryTrace, CsvTrace, TextTrace, open_trace, write_binary
+
+REFS = [7,0,1,2,0,3,0,4,2,3,0,3]
+
+def test_text_and_csv_traces(tmp_path):
+    txt = tmp_path / "trace.txt"
+    txt.write_text("# demo\n7, 0 1\n2,0,3\n0 4 2 3 0 3\n")
+    assert list(TextTrace(str(txt))) == REFS
+    csv_path = tmp_path / "trace.csv"
+    csv_path.write_text("time,page\n" + "".join(f"{i},{p}\n" for i, p in enumerate(REFS)))
+    assert list(CsvTrace(str(csv_path), column="page")) == REFS
+
+def test_binary_round_trip(tmp_path):
+    path = str(tmp_path / "trace.bin")
+    assert write_binary(path, iter(REFS), itemsize=8) == len(REFS)
+    with open_trace(path) as trace:
+        assert isinstance(trace, BinaryTrace)
+        assert len(trace) == len(REFS) and list(trace) == REFS and trace[3] == 2
+
+def test_simulation_streams_trace(tmp_path):
+    txt = tmp_path / "trace.txt"
+    txt.write_text(" ".join(map(str, REFS)))
+    streamed = PagingSimulation(n_frames=3, algorithm="OPTIMAL", reference_string=TextTrace(str(txt)))
+    in_memory = PagingSimulation(n_frames=3, algorithm="OPTIMAL", reference_string=REFS)
+    assert streamed.run_all() == in_memory.run_all()
+    assert streamed.total_accesses == len(REFS)
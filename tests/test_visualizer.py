@@ -0,0 +1,56 @@
+"""
+tests/test_visualizer.py
+pytest tests for the heatmap data helpers: history="events" must draw what history="full" draws.
+"""
+
+import random
+
+import matplotlib
+import numpy as np
+import pytest
+
+matplotlib.use("Agg")
+
+from core.paging_core import PagingSimulation
+from visualization.visualizer import fault_events, history_matrix
+
+
+def _histories(algorithm, n=1500, frames=5, seed=7):
+    rng = random.Random(seed)
+    refs = [rng.randint(0, 12) for _ in range(n)]
+    runs = {}
+    for mode in ("full", "events"):
+        sim = PagingSimulation(refs, frames, algorithm, history=mode)
+        sim.run_all()
+        runs[mode] = sim
+    return runs["full"], runs["events"]
+
+
+@pytest.mark.parametrize("algorithm", ["FIFO", "LRU", "SECOND CHANCE", "OPTIMAL"])
+def test_history_matrix_matches_full_history(algorithm):
+    full, events = _histories(algorithm)
+    # whole run, one column per step; then a window sampled down to 50 columns
+    for start, stop, max_columns in ((0, None, 10000), (37, 913, 50)):
+        steps_full, matrix_full = history_matrix(full.history, start, stop, max_columns)
+        steps_ev, matrix_ev = history_matrix(events.history, start, stop, max_columns)
+        assert np.array_equal(steps_full, steps_ev)
+        assert np.array_equal(matrix_full, matrix_ev)
+    assert len(steps_ev) <= 50 and steps_ev[0] == 37 and steps_ev[-1] < 913
+    assert np.unique(np.diff(steps_ev)).size == 1
+    # the columns are the snapshots at the sampled steps
+    assert [[None if v == -1 else int(v) for v in col] for col in matrix_ev.T] == \
+        [full.history[s] for s in steps_ev.tolist()]
+
+
+@pytest.mark.parametrize("algorithm", ["FIFO", "LRU", "SECOND CHANCE"])
+def test_fault_events_match_full_history(algorithm):
+    full, events = _histories(algorithm)
+    steps, slots = fault_events(events.history)
+    assert len(steps) == events.total_faults
+    assert np.array_equal(steps, fault_events(full.history)[0])
+    assert np.array_equal(slots, fault_events(full.history)[1])
+    for start, stop in ((0, 1), (100, 400), (1499, None)):
+        window_ev = fault_events(events.history, start, stop)
+        window_full = fault_events(full.history, start, stop)
+        assert np.array_equal(window_ev[0], window_full[0]) and np.array_equal(window_ev[1], window_full[1])
+        assert all(start <= s < (stop or 1500) for s in window_ev[0].tolist())
@@ -1,19 +1,125 @@
 # visualization/visualizer.py
 
+import math
+
 import matplotlib.pyplot as plt
-from typing import List, Dict, Any
+import numpy as np
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+from core.history import EMPTY, EventHistory, frame_matrix, page_array
+
+# longer histories are drawn as a heatmap instead of a table
+TABLE_MAX_STEPS = 40
+# widest heatmap drawn at full resolution; longer windows are downsampled
+MAX_COLUMNS = 2000
+# page numbers are written into the cells up to this many steps (and 16 frames)
+LABEL_MAX_STEPS = 60
 
 
-def plot_paging(history: List[List[Any]], title: str = "Paging Simulation"):
+def _window(history: Sequence, start: int, stop: Optional[int]) -> Tuple[int, int]:
+    n_steps = len(history)
+    stop = n_steps if stop is None else max(0, min(stop, n_steps))
+    return max(0, min(start, stop)), stop
+
+
+def history_matrix(history: Sequence[List[Any]], start: int = 0, stop: Optional[int] = None,
+                   max_columns: int = MAX_COLUMNS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Frames of history[start:stop] as an int64 matrix (n_frames x columns,
+    EMPTY for empty slots).  Windows longer than max_columns are sampled
+    every ceil(len / max_columns) steps.  Returns (steps, matrix) where
+    steps[c] is the step shown in column c.
+    Only the sampled steps are rebuilt (see core/history.frame_matrix).
+    """
+    start, stop = _window(history, start, stop)
+    stride = max(1, math.ceil((stop - start) / max_columns))
+    steps = np.arange(start, stop, stride, dtype=np.int64)
+    return steps, frame_matrix(history, steps)
+
+
+def fault_events(history: Sequence[List[Any]], start: int = 0,
+                 stop: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """(steps, slots) of every page load in history[start:stop]."""
+    start, stop = _window(history, start, stop)
+    if isinstance(history, EventHistory):
+        ev_steps = np.frombuffer(history.steps, dtype=np.int64) if history.n_events() else np.empty(0, np.int64)
+        lo, hi = np.searchsorted(ev_steps, [start, stop])
+        loads = page_array(history.loaded.data)[lo:hi] != EMPTY
+        slots = np.frombuffer(history.slots, dtype=np.int64)[lo:hi] if hi > lo else np.empty(0, np.int64)
+        return ev_steps[lo:hi][loads], slots[loads]
+    steps: List[int] = []
+    slots: List[int] = []
+    prev = history[start - 1] if start > 0 else None
+    for step in range(start, stop):
+        row = history[step]
+        if row != prev:
+            for slot, page in enumerate(row):
+                if page is not None and (prev is None or page != prev[slot]):
+                    steps.append(step)
+                    slots.append(slot)
+        prev = row
+    return np.array(steps, dtype=np.int64), np.array(slots, dtype=np.int64)
+
+
+def plot_paging_heatmap(history: Sequence[List[Any]], title: str = "Paging Simulation", start: int = 0,
+                        stop: Optional[int] = None, max_columns: int = MAX_COLUMNS):
+    """
+    history[start:stop] as one image: x = step, y = frame slot, colour =
+    resident page (white = empty).  Page loads are marked with x when every
+    step has its own column; a strip below shows the fault rate per column.
+    """
+    start, stop = _window(history, start, stop)
+    steps, matrix = history_matrix(history, start, stop, max_columns)
+    n_frames = matrix.shape[0]
+    if not len(steps) or not n_frames:
+        fig, ax = plt.subplots()
+        ax.text(0.5, 0.5, "No data", ha="center")
+        return fig
+    stride = int(steps[1] - steps[0]) if len(steps) > 1 else 1
+    f_steps, f_slots = fault_events(history, start, stop)
+
+    fig, (ax, ax_rate) = plt.subplots(2, 1, sharex=True, figsize=(12, max(3.0, min(8.0, 2 + 0.3 * n_frames))),
+                                      gridspec_kw={"height_ratios": [4, 1]})
+    cmap = plt.get_cmap("viridis").copy()
+    cmap.set_bad("white")
+    ax.imshow(np.ma.masked_equal(matrix, EMPTY), aspect="auto", interpolation="nearest", cmap=cmap,
+              extent=(start - 0.5, start + len(steps) * stride - 0.5, n_frames - 0.5, -0.5))
+    if stride == 1:
+        ax.scatter(f_steps, f_slots, marker="x", color="red", s=12, linewidths=1)
+        if len(steps) <= LABEL_MAX_STEPS and n_frames <= 16:
+            for c, step in enumerate(steps):
+                for slot in range(n_frames):
+                    if matrix[slot, c] != EMPTY:
+                        ax.text(step, slot, str(history[int(step)][slot]), ha="center", va="center",
+                                fontsize=8, color="white")
+    ax.set_yticks(range(n_frames) if n_frames <= 32 else [])
+    ax.set_yticklabels([f"F{i}" for i in range(n_frames)] if n_frames <= 32 else [])
+    suffix = f" (every {stride} steps)" if stride > 1 else ""
+    ax.set_title(f"{title}{suffix}")
+
+    per_column = np.bincount((f_steps - start) // stride, minlength=len(steps))[:len(steps)]
+    ax_rate.step(steps, per_column / stride, where="post", color="tab:red")
+    ax_rate.set_ylim(0, 1.05)
+    ax_rate.set_ylabel("fault rate")
+    ax_rate.set_xlabel("step")
+    fig.tight_layout()
+    return fig
+
+
+def plot_paging(history: Sequence[List[Any]], title: str = "Paging Simulation"):
     """
     history: list of snapshots, each snapshot is list of length n_frames (page numbers or None)
-    We'll plot a table-like grid: rows = steps, columns = frames. Use text annotations.
+             (or the lazy EventHistory from PagingSimulation(history="events"))
+    Short histories are drawn as a table (rows = steps, columns = frames);
+    longer ones go to plot_paging_heatmap.
     """
     n_steps = len(history)
     if n_steps == 0:
         fig, ax = plt.subplots()
         ax.text(0.5, 0.5, "No data", ha="center")
         return fig
+    if n_steps > TABLE_MAX_STEPS:
+        return plot_paging_heatmap(history, title)
 
     n_frames = len(history[0])
 
@@ -35,12 +141,7 @@ def plot_paging(history: List[List[Any]], title: str = "Paging Simulation"):
     return fig
 
 
-def plot_segmentation(segments: List[Dict], total_memory: int):
-    """
-    segments: list of dicts with 'name','size','start','end'
-    Plot a horizontal bar showing segments and free space.
-    """
-    fig, ax = plt.subplots(figsize=(10, 2))
+def _draw_segments(ax, segments: List[Dict], total_memory: int, moved=()):
     # Sort segments by start
     segs_sorted = sorted(segments, key=lambda s: s['start'])
     # Build bars: use start positions and sizes; we'll color segments, free spaces will be gray
@@ -51,7 +152,8 @@ def plot_segmentation(segments: List[Dict], total_memory: int):
             free_size = seg['start'] - current
             ax.barh(0, free_size, left=current, color='lightgray', edgecolor='black')
             current += free_size
-        ax.barh(0, seg['size'], left=seg['start'], color='tab:blue', edgecolor='black')
+        color = 'tab:orange' if seg['name'] in moved else 'tab:blue'
+        ax.barh(0, seg['size'], left=seg['start'], color=color, edgecolor='black')
         ax.text(seg['start'] + seg['size']/2, 0, f"{seg['name']} ({seg['size']})", va='center', ha='center', color='white', fontsize=9)
         current = seg['end'] + 1
     # trailing free space
@@ -59,7 +161,31 @@ def plot_segmentation(segments: List[Dict], total_memory: int):
         ax.barh(0, total_memory - current, left=current, color='lightgray', edgecolor='black')
     ax.set_xlim(0, total_memory)
     ax.set_yticks([])
-    ax.set_xlabel("Memory Address")
-    ax.set_title("Segmentation Layout")
+
+
+def plot_segmentation(segments: List[Dict], total_memory: int, before: Optional[List[Dict]] = None,
+                      relocation: Optional[Dict[str, Tuple[int, int]]] = None):
+    """
+    segments: list of dicts with 'name','size','start','end'
+    Plot a horizontal bar showing segments and free space.
+    With before (the layout before a compaction) the two layouts are drawn
+    one above the other; segments in relocation (a compaction plan's
+    name -> (old, new) map) are highlighted in both.
+    """
+    moved = set(relocation or ())
+    if before is None:
+        fig, ax = plt.subplots(figsize=(10, 2))
+        _draw_segments(ax, segments, total_memory, moved)
+        ax.set_xlabel("Memory Address")
+        ax.set_title("Segmentation Layout")
+        plt.tight_layout()
+        return fig
+    fig, (ax_before, ax_after) = plt.subplots(2, 1, sharex=True, figsize=(10, 3.5))
+    _draw_segments(ax_before, before, total_memory, moved)
+    _draw_segments(ax_after, segments, total_memory, moved)
+    ax_before.set_title("Before compaction")
+    suffix = f" ({len(moved)} moved)" if moved else ""
+    ax_after.set_title(f"After compaction{suffix}")
+    ax_after.set_xlabel("Memory Address")
     plt.tight_layout()
     return fig
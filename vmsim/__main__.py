@@ -0,0 +1,10 @@
+"""
+vmsim/__main__.py
+python -m vmsim <command> ...  (see vmsim/cli.py)
+"""
+
+import sys
+
+from vmsim.cli import main
+
+sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+vmsim/cli.py
+Headless command line, for scripts and job schedulers:
+
+    python -m vmsim simulate trace.bin -f 64 -a LRU
+    cat trace.txt | python -m vmsim sweep - --max-frames 128 -a LRU -a FIFO --format csv
+    python -m vmsim segment-replay ops.txt --policy best --compaction auto
+    python -m vmsim sweep trace.bin -f 8 16 32 | python -m vmsim plot faults - -o faults.png
+
+Traces, operation files and summaries are read from a path or '-'
+(stdin); results are written to stdout as JSON lines (or CSV), one per
+row as soon as it is done.  Only the command's own modules are imported:
+a simulation loads the core engine (plus NumPy where the engine uses it),
+and pandas / matplotlib load only for `plot`.
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def _open_trace(path: str) -> Iterable[int]:
+    if path == "-":
+        from core.trace_io import trace_from_stream
+
+        return trace_from_stream(sys.stdin.buffer)
+    from core.trace_io import open_trace
+
+    return open_trace(path)
+
+
+def _emit(row: Dict[str, Any], out=None):
+    out = out or sys.stdout
+    out.write(json.dumps(row) + "\n")
+    out.flush()
+
+
+# ---------------- simulate ----------------
+def _write_log(sim, path: str):
+    """Per-step log (step, page, fault, F0..Fn) as CSV, one batch of steps at a time."""
+    import numpy as np
+
+    f = sys.stdout if path == "-" else open(path, "w", newline="")
+    try:
+        f.write(",".join(["step", "page", "fault"] + [f"F{i}" for i in range(sim.n_frames)]) + "\n")
+        for columns in sim.iter_log_columns():
+            np.savetxt(f, np.column_stack(list(columns.values())).astype(np.int64), fmt="%d", delimiter=",")
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+def cmd_simulate(args) -> int:
+    from core.paging_core import PagingSimulation
+    from core.policies import get_policy
+
+    name = get_policy(args.algorithm).name
+    trace = _open_trace(args.trace)
+    history = "events" if args.log else "none"
+    if name == "OPTIMAL" or args.preprocess:
+        # needs the whole trace up front
+        if iter(trace) is trace:
+            trace = list(trace)
+        sim = PagingSimulation(trace, n_frames=args.frames, algorithm=name, history=history,
+                               metrics=args.metrics, preprocess=args.preprocess)
+        sim.run_all()
+    else:
+        # streamed: a text trace on stdin is simulated as it is read
+        sim = PagingSimulation([], n_frames=args.frames, algorithm=name, history=history, metrics=args.metrics)
+        sim.feed(trace)
+    row = dict(sim.summary(), algorithm=name, frames=args.frames)
+    if args.log:
+        _write_log(sim, args.log)
+    _emit(row, sys.stderr if args.log == "-" else None)
+    return 0
+
+
+# ---------------- sweep ----------------
+def cmd_sweep(args) -> int:
+    from experiments.experiment_runner import _reset_store, _write_summary, iter_batch, write_rows
+
+    frames = args.frames or list(range(1, args.max_frames + 1))
+    algos = args.algorithm or ["LRU"]
+    rows = []
+    for row in iter_batch(_open_trace(args.trace), frames, algos, use_cache=not args.no_cache,
+                          metrics=args.metrics, sampling_rate=args.sampling_rate,
+                          sample_pages=args.sample_pages, preprocess=args.preprocess):
+        rows.append(row)
+        if args.format == "jsonl":
+            _emit(row)
+    if args.format == "csv":
+        write_rows(sys.stdout, rows)
+    if args.out:
+        import os
+
+        os.makedirs(args.out, exist_ok=True)
+        _reset_store(args.out)
+        _write_summary(rows, algos, args.out, plot=args.plot)
+    return 0
+
+
+# ---------------- segment-replay ----------------
+def cmd_segment_replay(args) -> int:
+    from experiments.segmentation_replay import GENERATORS, parse_ops, read_ops, replay
+
+    if args.trace == "-":
+        ops = parse_ops(sys.stdin)
+    elif args.trace:
+        ops = read_ops(args.trace)
+    else:
+        ops = GENERATORS[args.generator](args.ops, seed=args.seed)
+    ops = list(ops)
+    compactions = [None if c == "none" else c for c in args.compaction or ["none"]]
+    for policy in args.policy or ["first", "best", "worst"]:
+        for compaction in compactions:
+            row = replay(ops, args.memory, policy, args.sample_every, compaction, args.compact_threshold)
+            if not args.samples:
+                del row["fragmentation_samples"]
+            _emit(row)
+    return 0
+
+
+# ---------------- plot ----------------
+def _save(fig, path: str):
+    fig.savefig(sys.stdout.buffer if path == "-" else path, format="png" if path == "-" else None)
+
+
+def cmd_plot(args) -> int:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    if args.kind == "faults":
+        import io
+        import os
+
+        import pandas as pd
+        from experiments.analysis_tools import load_summary, plot_faults_vs_frames
+
+        if args.input != "-" and os.path.isdir(args.input):
+            df = load_summary(args.input)
+        else:
+            with (sys.stdin if args.input == "-" else open(args.input)) as f:
+                text = f.read()
+            # JSON lines (sweep's default) or CSV
+            df = pd.read_json(io.StringIO(text), lines=True) if text.lstrip().startswith("{") \
+                else load_summary(io.StringIO(text))
+        plot_faults_vs_frames(df, sys.stdout.buffer if args.output == "-" else args.output)
+        return 0
+
+    from core.paging_core import PagingSimulation
+    from visualization.visualizer import plot_paging_heatmap
+
+    trace = _open_trace(args.input)
+    if iter(trace) is trace:
+        trace = list(trace)
+    sim = PagingSimulation(trace, n_frames=args.frames, algorithm=args.algorithm, history="events")
+    _, history = sim.run_all()
+    _save(plot_paging_heatmap(history, f"Paging Simulation ({args.algorithm})", args.start, args.stop), args.output)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="vmsim", description="Virtual memory simulator (headless)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("simulate", help="one algorithm and frame count; prints a JSON summary line")
+    p.add_argument("trace", help="trace file (text, .csv or binary .bin) or - for stdin")
+    p.add_argument("-f", "--frames", type=int, default=3)
+    p.add_argument("-a", "--algorithm", default="LRU")
+    p.add_argument("--metrics", action="store_true", help="add PagingMetrics columns to the summary")
+    p.add_argument("--preprocess", action="store_true", help="collapse repeated references first")
+    p.add_argument("--log", metavar="PATH", help="also write the per-step log as CSV (- = stdout, "
+                                                 "the summary then goes to stderr)")
+    p.set_defaults(func=cmd_simulate)
+
+    p = sub.add_parser("sweep", help="summary row per (algorithm, frames) cell")
+    p.add_argument("trace", help="trace file or - for stdin")
+    frames = p.add_mutually_exclusive_group(required=True)
+    frames.add_argument("-f", "--frames", type=int, nargs="+")
+    frames.add_argument("--max-frames", type=int, help="frames 1..N")
+    p.add_argument("-a", "--algorithm", action="append", help="repeat for several (default LRU)")
+    p.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    p.add_argument("--metrics", action="store_true")
+    p.add_argument("--preprocess", action="store_true")
+    p.add_argument("--sampling-rate", type=float, help="approximate LRU with SHARDS at this rate")
+    p.add_argument("--sample-pages", type=int, help="SHARDS with at most this many sampled pages")
+    p.add_argument("--no-cache", action="store_true", help="bypass the result cache")
+    p.add_argument("--out", help="also write the summary CSV and result store to this directory")
+    p.add_argument("--plot", action="store_true", help="with --out: also plot faults vs frames")
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser("segment-replay", help="replay alloc/free traces against the segmentation allocator")
+    p.add_argument("trace", nargs="?", help="operation trace (A name size / F name) or - for stdin")
+    p.add_argument("--generator", choices=("lifetime", "uniform"), default="lifetime")
+    p.add_argument("--ops", type=int, default=100000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--memory", type=int, default=1 << 24)
+    p.add_argument("--policy", action="append", choices=("first", "best", "worst"))
+    p.add_argument("--compaction", action="append", choices=("none", "auto", "full", "slide", "fill"))
+    p.add_argument("--compact-threshold", type=float)
+    p.add_argument("--sample-every", type=int, default=1000)
+    p.add_argument("--samples", action="store_true", help="include the fragmentation samples")
+    p.set_defaults(func=cmd_segment_replay)
+
+    p = sub.add_parser("plot", help="render a PNG (needs matplotlib)")
+    p.add_argument("kind", choices=("faults", "paging"),
+                   help="faults: faults vs frames from a sweep summary; paging: frame heatmap of a trace")
+    p.add_argument("input", help="summary (CSV, JSON lines or store directory) or trace; - for stdin")
+    p.add_argument("-o", "--output", required=True, help="PNG path, - for stdout")
+    p.add_argument("-f", "--frames", type=int, default=3, help="paging: frames")
+    p.add_argument("-a", "--algorithm", default="LRU", help="paging: algorithm")
+    p.add_argument("--start", type=int, default=0, help="paging: first step shown")
+    p.add_argument("--stop", type=int, help="paging: step after the last one shown")
+    p.set_defaults(func=cmd_plot)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # reader went away (e.g. `| head`): stop quietly
+        sys.stderr.close()
+        return 1
+    except (ValueError, OSError) as exc:
+        print(f"vmsim: {exc}", file=sys.stderr)
+        return 2